@@ -0,0 +1,52 @@
+"""
+벤치마크 스크립트 공통 설정
+
+- 프로젝트 루트를 import 경로에 추가하고 Django를 초기화합니다.
+- benchmark_database(): 설정된 DB 서버에 임시 테스트 DB(test_<NAME>)를 만들고, 끝나면 삭제합니다.
+  운영/개발 DB의 데이터는 건드리지 않습니다.
+"""
+import contextlib
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quickeats.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+
+@contextlib.contextmanager
+def benchmark_database(keepdb=False):
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    old_name = connection.settings_dict['NAME']
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        # 다른 스레드(스레드 풀 등)가 열어 둔 연결이 남아 있으면 DROP DATABASE가 실패하므로 정리
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity"
+                " WHERE datname = current_database() AND pid <> pg_backend_pid()"
+            )
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def timed(fn, repeat=20):
+    """fn을 repeat번 실행하여 (중앙값, 최소값) 초를 반환"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), min(samples)
@@ -0,0 +1,122 @@
+"""
+식당/라이더 대시보드 진행중 주문 벤치마크 (orders/api/v2/dashboards.py)
+
+임시 DB에 주문 N건(대부분 종료 주문, 최근 --active 건만 진행중)을 만들고 VACUUM ANALYZE 후
+한 식당 / 한 라이더의 진행중 주문 조회를 EXPLAIN (ANALYZE, BUFFERS)로 측정합니다.
+- partial : 진행중 주문만 담은 부분 인덱스 (order_rest_active_idx / order_rider_active_idx, status INCLUDE)
+- full    : 부분 인덱스를 지운 상태. 기존 (restaurant|rider, created_at, id) 인덱스 + 힙에서 status 확인
+각 조회의 실행 계획 노드, 계획/실행 시간, 읽은 버퍼 수와 API 응답 시간(중앙값)을 출력합니다.
+
+실행: python benchmarks/bench_active_orders.py [--orders 10000000] [--active 20000]
+"""
+import argparse
+import json
+
+from _setup import benchmark_database, timed
+
+RESTAURANT_STATUSES = ['pending_acceptance', 'preparing', 'ready_for_pickup']
+RIDER_STATUSES = ['ready_for_pickup', 'in_transit']
+
+
+def seed(connection, count, active, restaurants, riders):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO orders_restaurant (name, address) SELECT 'bench', 'bench' FROM generate_series(1, %s)",
+            [restaurants],
+        )
+        cursor.execute("INSERT INTO orders_rider (name, is_available) SELECT 'bench', true FROM generate_series(1, %s)",
+                       [riders])
+        cursor.execute("SELECT min(id) FROM orders_restaurant")
+        first_restaurant = cursor.fetchone()[0]
+        cursor.execute("SELECT min(id) FROM orders_rider")
+        first_rider = cursor.fetchone()[0]
+        # i가 작을수록 최근 주문. 최근 active 건은 진행중 상태, 나머지는 종료 상태
+        cursor.execute(
+            """
+            INSERT INTO orders_order (restaurant_id, rider_id, restaurant_name, status, created_at, version)
+            SELECT %s + i %% %s, %s + i %% %s, 'bench',
+                   CASE WHEN i <= %s
+                        THEN (ARRAY['pending_acceptance','preparing','ready_for_pickup','in_transit'])[1 + i %% 4]
+                        ELSE (ARRAY['delivered','delivered','delivered','cancelled','rejected'])[1 + i %% 5]
+                   END,
+                   now() - i * interval '1 second', 1
+              FROM generate_series(1, %s) AS i
+            """,
+            [first_restaurant, restaurants, first_rider, riders, active, count],
+        )
+        # index-only scan은 visibility map이 채워져 있어야 힙을 건너뜀
+        cursor.execute("VACUUM ANALYZE orders_order")
+    return first_restaurant, first_rider
+
+
+def explain(connection, sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    plan = plan[0] if isinstance(plan, list) else json.loads(plan)[0]
+    top = node = plan['Plan']
+    while node.get('Plans') and 'Index' not in node['Node Type']:
+        node = node['Plans'][0]
+    buffers = top.get('Shared Hit Blocks', 0) + top.get('Shared Read Blocks', 0)
+    return (f"{node['Node Type']} on {node.get('Index Name', '-')}",
+            plan['Planning Time'], plan['Execution Time'], buffers)
+
+
+def index_size(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_relation_size(%s::regclass)", [name])
+        return cursor.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=10_000_000)
+    parser.add_argument('--active', type=int, default=20_000, help="진행중 주문 수")
+    parser.add_argument('--restaurants', type=int, default=1_000)
+    parser.add_argument('--riders', type=int, default=2_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    from rest_framework.test import APIClient
+
+    with benchmark_database() as connection:
+        print(f"seeding {args.orders:,} orders ({args.active:,} active) ...")
+        restaurant, rider = seed(connection, args.orders, args.active, args.restaurants, args.riders)
+        for name in ('order_rest_active_idx', 'order_rider_active_idx', 'order_rest_created_id_idx'):
+            print(f"  {name}: {index_size(connection, name) / 1024 / 1024:,.1f} MiB")
+
+        queries = [
+            ('restaurant list', "SELECT * FROM orders_order WHERE restaurant_id = %s AND status = ANY(%s)"
+                                " ORDER BY created_at DESC, id DESC LIMIT 51", [restaurant, RESTAURANT_STATUSES]),
+            ('restaurant count', "SELECT status, count(*) FROM orders_order WHERE restaurant_id = %s"
+                                 " AND status = ANY(%s) GROUP BY status", [restaurant, RESTAURANT_STATUSES]),
+            ('rider list', "SELECT * FROM orders_order WHERE rider_id = %s AND status = ANY(%s)"
+                           " ORDER BY created_at DESC, id DESC LIMIT 51", [rider, RIDER_STATUSES]),
+            ('rider count', "SELECT status, count(*) FROM orders_order WHERE rider_id = %s"
+                            " AND status = ANY(%s) GROUP BY status", [rider, RIDER_STATUSES]),
+        ]
+        client = APIClient()
+        urls = [
+            f'/api/v2/restaurants/{restaurant}/active-orders/',
+            f'/api/v2/restaurants/{restaurant}/active-orders/?count=true',
+            f'/api/v2/riders/{rider}/active-orders/',
+            f'/api/v2/riders/{rider}/active-orders/?count=true',
+        ]
+
+        for mode in ('partial', 'full'):
+            if mode == 'full':
+                with connection.cursor() as cursor:
+                    cursor.execute("DROP INDEX order_rest_active_idx, order_rider_active_idx")
+            print(f"\n[{mode}]")
+            print(f"{'query':>16} | {'plan':<56} | {'plan ms':>7} | {'exec ms':>7} | {'buffers':>7} | {'API ms':>6}")
+            for (label, sql, params), url in zip(queries, urls):
+                for _ in range(3):  # 캐시 워밍업
+                    explain(connection, sql, params)
+                node, planning, execution, buffers = explain(connection, sql, params)
+                api_median, _ = timed(lambda: client.get(url), args.repeat)
+                print(f"{label:>16} | {node:<56} | {planning:>7.3f} | {execution:>7.3f} | {buffers:>7,}"
+                      f" | {api_median * 1000:>6.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+V2 동기 뷰(WSGI) vs 비동기 뷰(ASGI) 부하 비교 (orders/api/v2/async_views.py)
+
+서버를 별도 프로세스로 띄우고 asyncio 클라이언트가 동시 연결 --concurrency(기본 1000)개로 요청을 보냅니다.
+- wsgi : Django WSGIServer + 고정 크기 스레드 풀(--threads, gunicorn gthread 워커와 같은 구조)
+- asgi : quickeats.asgi.application + 최소 asyncio HTTP/1.1 서버 (ORDER_V2_ASYNC_VIEWS=1)
+         (uvicorn 등 ASGI 서버 없이 실행할 수 있도록 요청마다 연결을 닫는 단순한 구현)
+두 서버 모두 DB를 동시에 쓰는 요청 수는 같습니다 (스레드 수 = ORDER_V2_ASYNC_DB_CONCURRENCY).
+
+시나리오
+- retrieve : GET /api/v2/orders/{id}/
+- list     : GET /api/v2/orders/?page_size=20
+- payment  : POST /api/v2/orders/{id}/payment/ (X-Simulated-Latency 헤더로 결제 연동 대기 0.5초, 요청마다 다른 주문)
+요청마다 새 연결(Connection: close)을 사용하며, 처리량(req/s), 지연 p50/p99, 오류 수,
+실행 중 관측한 최대 DB 연결 수를 출력합니다.
+
+실행: python benchmarks/bench_async_views.py [--requests 2000] [--concurrency 1000] [--threads 32]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _setup
+
+SCENARIOS = ('retrieve', 'list', 'payment')
+
+
+# ---------------------------------------------------------------------------
+# 서버 (자식 프로세스)
+# ---------------------------------------------------------------------------
+def serve_wsgi(port, threads):
+    import logging
+
+    from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer
+    from django.core.wsgi import get_wsgi_application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    class PooledWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+        request_queue_size = 4096
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self.process_request_thread, request, client_address)
+
+    server = PooledWSGIServer(('127.0.0.1', port), QuietHandler)
+    server.set_app(get_wsgi_application())
+    logging.getLogger('django.request').setLevel(logging.ERROR)  # 412 등 4xx 경고 생략 (setup 이후에 설정)
+    server.serve_forever()
+
+
+def serve_asgi(port):
+    from quickeats.asgi import application
+
+    async def handle(reader, writer):
+        try:
+            head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')[:-2]
+            method, target, _ = head[0].split(' ')
+            path, _, query = target.partition('?')
+            headers = [
+                (name.strip().lower().encode('latin-1'), value.strip().encode('latin-1'))
+                for name, _, value in (line.partition(':') for line in head[1:])
+            ]
+            length = int(dict(headers).get(b'content-length', b'0'))
+            body = await reader.readexactly(length) if length else b''
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+                'root_path': '', 'headers': headers, 'client': writer.get_extra_info('peername'),
+                'server': ('127.0.0.1', port),
+            }
+            pending = [{'type': 'http.request', 'body': body, 'more_body': False}]
+            finished = asyncio.Event()
+
+            async def receive():
+                if pending:
+                    return pending.pop()
+                await finished.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    lines = [f"HTTP/1.1 {message['status']} -"]
+                    lines += [f"{name.decode('latin-1')}: {value.decode('latin-1')}" for name, value in message['headers']]
+                    writer.write(('\r\n'.join(lines) + '\r\nConnection: close\r\n\r\n').encode('latin-1'))
+                elif message['type'] == 'http.response.body':
+                    writer.write(message.get('body', b''))
+                    if not message.get('more_body'):
+                        finished.set()
+
+            await application(scope, receive, send)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, '127.0.0.1', port, backlog=4096)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+# ---------------------------------------------------------------------------
+# 부하 생성 (부모 프로세스)
+# ---------------------------------------------------------------------------
+async def run_load(port, requests, concurrency, make_request):
+    latencies, failures, statuses = [], 0, {}
+    indexes = iter(range(requests))
+
+    async def one(raw):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            writer.write(raw)
+            data = await reader.read()
+        finally:
+            writer.close()
+        return int(data[9:12])
+
+    async def worker():
+        nonlocal failures
+        for i in indexes:
+            started = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(one(make_request(i)), 120)
+            except (OSError, asyncio.TimeoutError, ValueError):
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, failures, statuses
+
+
+def request_bytes(method, path, headers=()):
+    lines = [f"{method} {path} HTTP/1.1", "Host: 127.0.0.1", "Connection: close", *headers]
+    if method == 'POST':
+        lines.append("Content-Length: 0")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode()
+
+
+class ConnectionSampler(threading.Thread):
+    """실행 중 테스트 DB의 연결 수를 주기적으로 읽어 최댓값 기록"""
+
+    def __init__(self, database):
+        super().__init__(daemon=True)
+        self.database = database
+        self.peak = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        from django.db import connection
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.wait(0.05):
+                    cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE datname = %s", [self.database])
+                    self.peak = max(self.peak, cursor.fetchone()[0] - 1)  # 자신 제외
+        finally:
+            connection.close()
+
+
+def wait_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=32, help="WSGI 스레드 수 (= 비동기 뷰 DB 동시 사용 수)")
+    parser.add_argument('--orders', type=int, default=1000)
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument('--serve', choices=('wsgi', 'asgi'), help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve == 'wsgi':
+        return serve_wsgi(args.port, args.threads)
+    if args.serve == 'asgi':
+        return serve_asgi(args.port)
+
+    from orders.etags import get_strategy
+    from orders.models import Order, OrderEvent, OrderStatusTransition
+
+    strategy = get_strategy()
+    with _setup.benchmark_database() as connection:
+        database = connection.settings_dict['NAME']
+        Order.objects.bulk_create([Order(status=Order.Status.PREPARING) for _ in range(args.orders)], batch_size=5000)
+        readable = list(Order.objects.values_list('id', flat=True))
+        payable = [order.id for order in Order.objects.bulk_create(
+            [Order(status=Order.Status.PENDING_PAYMENT) for _ in range(args.requests)], batch_size=5000
+        )]
+        if_match = {pk: strategy.format(strategy.make(pk, 1)) for pk in payable}
+        requests = {
+            'retrieve': lambda i: request_bytes('GET', f'/api/v2/orders/{readable[i % len(readable)]}/'),
+            'list': lambda i: request_bytes('GET', '/api/v2/orders/?page_size=20'),
+            'payment': lambda i: request_bytes(
+                'POST', f'/api/v2/orders/{payable[i]}/payment/',
+                [f'If-Match: {if_match[payable[i]]}', 'X-Simulated-Latency: payment=fixed:0.5']),
+        }
+
+        print(f"requests={args.requests:,} concurrency={args.concurrency:,} threads={args.threads}\n")
+        print(f"{'server':>6} | {'scenario':>8} | {'req/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} |"
+              f" {'errors':>6} | {'statuses':>18} | {'max db conns':>12}")
+        for mode in ('wsgi', 'asgi'):
+            port = free_port()
+            env = dict(os.environ, DB_NAME=database, ORDER_V2_ASYNC_VIEWS='1' if mode == 'asgi' else '')
+            env['ORDER_V2_ASYNC_DB_CONCURRENCY'] = str(args.threads)
+            process = subprocess.Popen(
+                [sys.executable, __file__, '--serve', mode, '--port', str(port), '--threads', str(args.threads)],
+                env=env,
+            )
+            try:
+                wait_port(port, process)
+                Order.objects.filter(pk__in=payable).update(status=Order.Status.PENDING_PAYMENT, version=1)
+                OrderEvent.objects.all().delete()
+                OrderStatusTransition.objects.all().delete()
+                for scenario in args.scenarios:
+                    sampler = ConnectionSampler(database)
+                    sampler.start()
+                    elapsed, latencies, failures, statuses = asyncio.run(
+                        run_load(port, args.requests, args.concurrency, requests[scenario])
+                    )
+                    sampler.stopped.set()
+                    sampler.join()
+                    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+                    summary = ' '.join(f"{status}:{count}" for status, count in sorted(statuses.items()))
+                    print(f"{mode:>6} | {scenario:>8} | {len(latencies) / elapsed:>8,.0f} |"
+                          f" {quantiles[49] * 1000:>8.0f} | {quantiles[98] * 1000:>8.0f} | {failures:>6} |"
+                          f" {summary:>18} | {sampler.peak:>12}")
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+조건부 GET(If-None-Match) 측정: 1초 주기로 폴링하는 클라이언트 무리(fleet)
+
+폴러마다 주문 1건(상세)과 목록 첫 페이지를 1초에 한 번씩 조회한다고 가정하고,
+매 라운드(= 1초)마다 일부 주문의 상태가 바뀌는 상황에서
+- 항상 전체 본문을 받는 경우 (If-None-Match 없음)
+- 직전 ETag로 If-None-Match를 보내는 경우 (일치하면 304)
+의 응답 바이트와 DB 시간(쿼리 실행 시간 합계)을 초당 값으로 비교합니다.
+
+실행: python benchmarks/bench_conditional_get.py [--pollers 500] [--rounds 5] [--change-rate 0.05]
+"""
+import argparse
+import random
+import time
+
+from _setup import benchmark_database
+
+
+class QueryTimer:
+    """connection.execute_wrapper 로 쿼리 실행 시간을 누적"""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=10_000)
+    parser.add_argument('--pollers', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--change-rate', type=float, default=0.05, help='라운드마다 상태가 바뀌는 주문 비율')
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    from django.db.models import F
+    from rest_framework.test import APIClient
+    from orders.models import Order
+
+    with benchmark_database() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO orders_order (restaurant_name, status, created_at, version)
+                SELECT 'bench', 'preparing', now() - i * interval '1 second', 1
+                  FROM generate_series(1, %s) AS i
+                """,
+                [args.orders],
+            )
+            cursor.execute("ANALYZE orders_order")
+        ids = list(Order.objects.values_list('id', flat=True))
+        # 폴러가 보는 주문은 목록 첫 페이지에 있는 최신 주문들 (가장 자주 바뀌는 주문)
+        watched = ids[-args.pollers:]
+        list_url = f'/api/v2/orders/?page_size={args.page_size}'
+        rng = random.Random(0)
+        client = APIClient()
+
+        print(f"{args.pollers} pollers x {args.rounds} rounds, {args.change_rate:.0%} of watched orders change per round")
+        print(f"{'mode':>18} | {'KB/s':>10} | {'DB ms/s':>9} | {'304 ratio':>9}")
+        for conditional in (False, True):
+            etags = {}
+            sent = not_modified = requests = 0
+            timer = QueryTimer()
+            for _ in range(args.rounds):
+                changed = rng.sample(watched, int(len(watched) * args.change_rate))
+                Order.objects.filter(pk__in=changed).update(version=F('version') + 1)
+                with connection.execute_wrapper(timer):
+                    for pk in watched:
+                        for url in (f'/api/v2/orders/{pk}/', list_url):
+                            headers = {}
+                            if conditional and url in etags:
+                                headers['HTTP_IF_NONE_MATCH'] = etags[url]
+                            res = client.get(url, **headers)
+                            etags[url] = res.get('ETag', etags.get(url))
+                            sent += len(res.content)
+                            not_modified += res.status_code == 304
+                            requests += 1
+            label = 'If-None-Match' if conditional else 'full body'
+            print(f"{label:>18} | {sent / args.rounds / 1024:>10.1f} | "
+                  f"{timer.seconds / args.rounds * 1000:>9.1f} | {not_modified / requests:>9.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+라이더 자동 배차 벤치마크 (orders/dispatch.py)
+
+임시 DB에 라이더 --riders 명(서울 근처 무작위 위치, 모두 배차 가능)과 식당 --restaurants 곳,
+픽업 대기 주문 --orders 건을 만들고 --workers 개의 스레드가 동시에 배정합니다.
+- grid : 격자 인덱스에서 k-최근접 후보 -> 조건부 UPDATE로 확보 (RiderDispatcher.assign)
+- sql  : 비교용. 매 주문마다 배차 가능한 라이더 전체에서 거리 순 정렬 후 FOR UPDATE SKIP LOCKED LIMIT 1
+인덱스 적재 시간, 주문당 배정 지연(p50/p99), 처리량, 확보 충돌 수, 배정된 거리 평균을 출력합니다.
+
+실행: python benchmarks/bench_dispatch.py [--riders 50000] [--orders 5000] [--workers 8]
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import _setup  # noqa: F401
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from orders.dispatch import RiderDispatcher, distance_km
+from orders.models import Order, Rider
+
+LAT, LON, SPREAD = 37.5665, 126.9780, 0.15
+
+_SQL_NEAREST = """
+    SELECT id FROM orders_rider
+     WHERE is_available AND latitude IS NOT NULL
+     ORDER BY (latitude - %s) ^ 2 + ((longitude - %s) * cos(radians(%s))) ^ 2
+     LIMIT 1
+       FOR UPDATE SKIP LOCKED
+"""
+
+
+def seed(riders, restaurants, orders):
+    with connection.cursor() as cursor:
+        cursor.execute("TRUNCATE orders_order, orders_orderevent")
+        cursor.execute("DELETE FROM orders_rider")
+        cursor.execute(
+            "INSERT INTO orders_rider (name, latitude, longitude, is_available)"
+            " SELECT 'bench', %s + (random() * 2 - 1) * %s, %s + (random() * 2 - 1) * %s, true"
+            "   FROM generate_series(1, %s)",
+            [LAT, SPREAD, LON, SPREAD, riders],
+        )
+        cursor.execute(
+            "INSERT INTO orders_restaurant (name, address, latitude, longitude)"
+            " SELECT 'bench', 'bench', %s + (random() * 2 - 1) * %s, %s + (random() * 2 - 1) * %s"
+            "   FROM generate_series(1, %s)",
+            [LAT, SPREAD, LON, SPREAD, restaurants],
+        )
+        cursor.execute("SELECT min(id) FROM orders_restaurant")
+        first = cursor.fetchone()[0]
+        cursor.execute(
+            "INSERT INTO orders_order (restaurant_id, restaurant_name, status, created_at, version)"
+            " SELECT %s + i %% %s, 'bench', 'ready_for_pickup', now(), 1 FROM generate_series(1, %s) AS i",
+            [first, restaurants, orders],
+        )
+        cursor.execute("ANALYZE")
+    return list(Order.objects.order_by('id').values_list('id', flat=True))
+
+
+def sql_assign(order_pk):
+    with transaction.atomic():
+        order = (
+            Order.objects.select_for_update(of=('self',))
+            .filter(pk=order_pk, status=Order.Status.READY_FOR_PICKUP, rider__isnull=True, restaurant__isnull=False)
+            .values('restaurant__latitude', 'restaurant__longitude').first()
+        )
+        lat, lon = order['restaurant__latitude'], order['restaurant__longitude']
+        with connection.cursor() as cursor:
+            cursor.execute(_SQL_NEAREST, [lat, lon, lat])
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        Rider.objects.filter(pk=row[0]).update(is_available=False)
+        Order.objects.filter(pk=order_pk).update(rider_id=row[0], version=F('version') + 1)
+        return row[0]
+
+
+def run(assign, orders, workers):
+    latencies, lock = [], threading.Lock()
+    queue = iter(orders)
+
+    def worker():
+        try:
+            while True:
+                with lock:
+                    order_pk = next(queue, None)
+                if order_pk is None:
+                    return
+                started = time.perf_counter()
+                assign(order_pk)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def assigned_distance():
+    rows = Order.objects.filter(rider__isnull=False).values_list(
+        'restaurant__latitude', 'restaurant__longitude', 'rider__latitude', 'rider__longitude')
+    distances = [distance_km(*row) for row in rows]
+    return len(distances), statistics.mean(distances) if distances else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--riders', type=int, default=50_000)
+    parser.add_argument('--restaurants', type=int, default=500)
+    parser.add_argument('--orders', type=int, default=5_000)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    with _setup.benchmark_database():
+        print(f"riders={args.riders:,} restaurants={args.restaurants:,} ready orders={args.orders:,}"
+              f" workers={args.workers}\n")
+        print(f"{'mode':>5} | {'load ms':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'orders/s':>8} |"
+              f" {'assigned':>8} | {'conflicts':>9} | {'avg km':>6}")
+        for mode in ('grid', 'sql'):
+            orders = seed(args.riders, args.restaurants, args.orders)
+            dispatcher = RiderDispatcher()
+            started = time.perf_counter()
+            if mode == 'grid':
+                dispatcher.load()
+            load_ms = (time.perf_counter() - started) * 1000
+            elapsed, latencies = run(dispatcher.assign if mode == 'grid' else sql_assign, orders, args.workers)
+            count, km = assigned_distance()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(f"{mode:>5} | {load_ms:>8.0f} | {p50:>7.2f} | {p99:>7.2f} | {len(orders) / elapsed:>8,.0f} |"
+                  f" {count:>8,} | {dispatcher.conflicts:>9,} | {km:>6.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+ETag 전략 CPU 비용 비교 마이크로 벤치마크 (orders/etags.py)
+
+요청 하나에서 일어나는 ETag 작업을 그대로 흉내 냅니다.
+- If-Match 헤더 파싱 후 전이 엔진이 조건부 UPDATE에 넘길 비교값 계산 (perform_transition -> transitions._db_values)
+- 응답 ETag 헤더 생성 (갱신된 주문에 대해 계산)
+DB는 사용하지 않습니다 (DB 안에서 하는 비교는 포함하지 않음).
+
+실행: python benchmarks/bench_etag.py [--calls 100000]
+"""
+import argparse
+import timeit
+
+import _setup  # noqa: F401  (Django 초기화)
+
+from orders.etags import CachedETag, KeyedETag, MD5ETag, WeakETag, parse_etags
+from orders.models import Order
+from orders.transitions import _db_values
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=100_000)
+    args = parser.parse_args()
+
+    orders = [Order(id=i, version=i % 7 + 1) for i in range(1, 1001)]
+    strategies = (
+        ('md5', MD5ETag()),
+        ('weak id-version', WeakETag()),
+        ('keyed blake2b', KeyedETag()),
+        ('cached md5', CachedETag(MD5ETag())),
+    )
+
+    print(f"{'strategy':>16} | {'ns/request':>10} | {'calls':>9}")
+    for name, strategy in strategies:
+        headers = [strategy.format(strategy.for_order(order)) for order in orders]
+
+        def request_cycle():
+            for order, header in zip(orders, headers):
+                # 요청마다 새로 읽은 주문 인스턴스라고 가정 (인스턴스 캐시 초기화, 모든 전략에 동일하게 적용)
+                order.__dict__.pop(CachedETag.attname, None)
+                assert _db_values(strategy, order.id, parse_etags(header))
+                strategy.format(strategy.for_order(order))
+
+        loops = max(1, args.calls // len(orders))
+        elapsed = min(timeit.repeat(request_cycle, number=loops, repeat=5))
+        print(f"{name:>16} | {elapsed / (loops * len(orders)) * 1e9:>10.0f} | {loops * len(orders):>9,}")
+
+
+if __name__ == '__main__':
+    main()
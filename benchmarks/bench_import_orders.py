@@ -0,0 +1,119 @@
+"""
+주문 대량 적재 벤치마크 (orders/imports.py, manage.py import_orders)
+
+임시 DB에 식당 --restaurants 곳, 라이더 --riders 명을 만들고 주문 CSV 파일을 크기별(--sizes)로 생성한 뒤
+- v1       : POST /api/orders/ (V1) 를 한 건씩 (--v1-sample 건만 재서 초당 건수로 환산)
+- bulk_create : OrderImporter(method='bulk_create'), 묶음마다 다중 행 INSERT
+- copy     : OrderImporter(method='copy'), 묶음마다 COPY FROM STDIN
+로 적재합니다. 초당 행 수, FK 조회 쿼리 수와 tracemalloc 최대 메모리(추적 오버헤드 때문에 따로 한 번 더 적재)를 출력합니다.
+파일 크기가 커져도 최대 메모리가 묶음 크기에 맞춰 일정하면 스트리밍이 제대로 된 것입니다.
+
+실행: python benchmarks/bench_import_orders.py [--sizes 100000,1000000] [--chunk-size 5000]
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import _setup  # noqa: F401
+
+from django.db import connection, reset_queries
+from rest_framework.test import APIClient
+
+from orders.imports import OrderImporter, read_records
+from orders.models import Order
+
+STATUSES = Order.Status.values
+
+
+def seed(restaurants, riders):
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO orders_restaurant (name, address) SELECT '식당' || i, '서울시'"
+                       " FROM generate_series(1, %s) AS i", [restaurants])
+        cursor.execute("INSERT INTO orders_rider (name, is_available) SELECT '라이더' || i, true"
+                       " FROM generate_series(1, %s) AS i", [riders])
+
+
+def write_csv(path, rows, restaurants, riders):
+    rng = random.Random(1)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(('restaurant', 'rider', 'status'))
+        for _ in range(rows):
+            # 식당은 이름, 라이더는 절반만 배정 (이름)
+            rider = f"라이더{rng.randint(1, riders)}" if rng.random() < 0.5 else ''
+            writer.writerow((f"식당{rng.randint(1, restaurants)}", rider, rng.choice(STATUSES)))
+
+
+def run_importer(path, method, chunk_size):
+    importer = OrderImporter(chunk_size, method)
+    total = 0
+    started = time.perf_counter()
+    with open(path, newline='', encoding='utf-8') as f:
+        for report in importer.run(read_records(f, 'csv')):
+            reset_queries()  # import_orders 명령과 같게 (DEBUG 쿼리 로그 비움)
+            total += report.rows
+    elapsed = time.perf_counter() - started
+    truncate()
+    return total, elapsed, importer.restaurants.queries + importer.riders.queries
+
+
+def peak_memory(path, method, chunk_size):
+    tracemalloc.start()
+    run_importer(path, method, chunk_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def truncate():
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {Order._meta.db_table} CASCADE")
+
+
+def run_v1(sample):
+    client = APIClient()
+    started = time.perf_counter()
+    for _ in range(sample):
+        client.post('/api/orders/', {"restaurant_name": "식당1"}, format='json')
+    return sample, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='100000,1000000', help="쉼표로 구분한 파일 행 수")
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--restaurants', type=int, default=2000)
+    parser.add_argument('--riders', type=int, default=5000)
+    parser.add_argument('--v1-sample', type=int, default=500)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    with _setup.benchmark_database():
+        seed(args.restaurants, args.riders)
+        print(f"restaurants={args.restaurants:,} riders={args.riders:,} chunk_size={args.chunk_size:,}\n")
+
+        total, elapsed = run_v1(args.v1_sample)
+        print(f"v1 (one POST per order, {total:,} sampled): {total / elapsed:,.0f} rows/s\n")
+        Order.objects.all().delete()
+
+        print(f"{'rows':>10} | {'method':>11} | {'seconds':>8} | {'rows/s':>9} | {'FK queries':>10} | {'peak MiB':>8}")
+        for size in sizes:
+            fd, path = tempfile.mkstemp(suffix='.csv')
+            os.close(fd)
+            try:
+                write_csv(path, size, args.restaurants, args.riders)
+                for method in ('bulk_create', 'copy'):
+                    total, elapsed, queries = run_importer(path, method, args.chunk_size)
+                    peak = peak_memory(path, method, args.chunk_size)
+                    print(f"{total:>10,} | {method:>11} | {elapsed:>8.2f} | {total / elapsed:>9,.0f} |"
+                          f" {queries:>10} | {peak / 2 ** 20:>8.1f}")
+            finally:
+                os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
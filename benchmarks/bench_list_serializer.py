@@ -0,0 +1,66 @@
+"""
+V2 주문 목록 직렬화 벤치마크: DRF ModelSerializer vs 고속 경로(values_list + 컬럼 변환기)
+
+임시 DB에 주문 N건을 만들고, 한 페이지(기본 10,000행)를 읽어 JSON 바이트로 렌더링하기까지의
+처리량(rows/sec)을 비교합니다. 두 경로의 출력 바이트가 같은지도 함께 확인합니다.
+
+실행: python benchmarks/bench_list_serializer.py [--rows 10000] [--repeat 10]
+"""
+import argparse
+
+from _setup import benchmark_database, timed
+
+
+def seed(connection, count):
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO orders_restaurant (name, address) VALUES ('bench', 'bench') RETURNING id")
+        restaurant_id = cursor.fetchone()[0]
+        cursor.execute(
+            """
+            INSERT INTO orders_order (restaurant_id, restaurant_name, status, created_at, version)
+            SELECT %s, 'bench', (ARRAY['pending_payment','preparing','delivered','cancelled'])[1 + i %% 4],
+                   now() - i * interval '1.5 second', 1
+              FROM generate_series(1, %s) AS i
+            """,
+            [restaurant_id, count],
+        )
+        cursor.execute("ANALYZE orders_order")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    from rest_framework.renderers import JSONRenderer
+    from orders.api.v2.fastpath import FastListSerializer
+    from orders.api.v2.serializers import OrderV2Serializer
+    from orders.models import Order
+
+    renderer = JSONRenderer()
+    queryset = Order.objects.order_by('-created_at', '-id')[:args.rows]
+
+    def drf_path():
+        return renderer.render(OrderV2Serializer(list(queryset), many=True).data)
+
+    def fast_path():
+        fast = FastListSerializer(OrderV2Serializer)
+        return renderer.render(fast.to_representation(list(fast.select(queryset))))
+
+    with benchmark_database() as connection:
+        print(f"seeding {args.rows:,} orders ...")
+        seed(connection, args.rows)
+        assert drf_path() == fast_path(), "fast path output differs from DRF"
+
+        print(f"{'path':>12} | {'median (ms)':>12} | {'rows/sec':>12}")
+        results = {}
+        for name, fn in (('DRF', drf_path), ('fast path', fast_path)):
+            median, _ = timed(fn, args.repeat)
+            results[name] = median
+            print(f"{name:>12} | {median * 1000:>12.1f} | {args.rows / median:>12,.0f}")
+        print(f"speedup: x{results['DRF'] / results['fast path']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
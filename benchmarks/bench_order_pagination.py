@@ -0,0 +1,71 @@
+"""
+V2 주문 목록 페이지네이션 벤치마크: 키셋(커서) vs OFFSET
+
+임시 DB에 주문 N건을 만들고, 1 / 10 / 100 / 1000 번째 페이지 조회 시간을 비교합니다.
+- keyset : GET /api/v2/orders/?cursor=... (API 전체 경로, (created_at, id) 인덱스 사용)
+- offset : ORDER BY created_at DESC, id DESC OFFSET k LIMIT n (ORM 쿼리만)
+
+실행: python benchmarks/bench_order_pagination.py [--orders 1000000] [--page-size 50]
+"""
+import argparse
+import base64
+import json
+
+from _setup import benchmark_database, timed
+
+
+def seed(connection, count):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO orders_order (restaurant_name, status, created_at, version)
+            SELECT 'bench', (ARRAY['pending_payment','preparing','delivered','cancelled'])[1 + i %% 4],
+                   now() - i * interval '1 second', 1
+              FROM generate_series(1, %s) AS i
+            """,
+            [count],
+        )
+        cursor.execute("ANALYZE orders_order")
+
+
+def cursor_token(created_at, pk):
+    raw = json.dumps([created_at.isoformat(), pk], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from rest_framework.test import APIClient
+    from orders.models import Order
+
+    with benchmark_database() as connection:
+        print(f"seeding {args.orders:,} orders ...")
+        seed(connection, args.orders)
+        client = APIClient()
+        ordered = Order.objects.order_by('-created_at', '-id')
+
+        print(f"{'page':>6} | {'keyset API (ms)':>16} | {'OFFSET query (ms)':>18}")
+        for page in (1, 10, 100, 1000):
+            offset = (page - 1) * args.page_size
+            if offset >= args.orders:
+                break
+            url = f'/api/v2/orders/?page_size={args.page_size}'
+            if offset:
+                # 직전 페이지의 마지막 행을 커서로 사용 (준비 단계, 측정 제외)
+                last = ordered.values('created_at', 'id')[offset - 1]
+                url += f"&cursor={cursor_token(last['created_at'], last['id'])}"
+
+            keyset_median, _ = timed(lambda: client.get(url), args.repeat)
+            offset_median, _ = timed(
+                lambda: list(ordered[offset:offset + args.page_size]), args.repeat
+            )
+            print(f"{page:>6} | {keyset_median * 1000:>16.2f} | {offset_median * 1000:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+주문 이벤트 아웃박스 디스패처 처리량 벤치마크 (orders/outbox.py)
+
+--events 개의 전이를 전이 엔진으로 적용해 아웃박스를 채운 뒤,
+싱크(in-process 콜백 / 로그 파일 / 로컬 HTTP 스텁) x 워커 수 조합마다 밀린 이벤트를 모두 보내고
+배치당 소요 시간, 전체 처리량(ev/s), 최대 지연(lag)을 출력합니다.
+조합마다 dispatched_at을 비워 같은 이벤트를 다시 보냅니다. 그래서 lag(이벤트 기록 후 경과 시간)는
+앞선 조합의 실행 시간만큼 계속 늘어나며, 조합 간 비교에는 ms/batch와 ev/s를 봅니다.
+
+실행: python benchmarks/bench_outbox.py [--events 20000] [--batch-size 500] [--workers 1 2 4]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import _setup
+
+from django.db import transaction
+
+from orders.models import Order, OrderEvent
+from orders.outbox import CallbackSink, HttpSink, LogFileSink, OutboxDispatcher
+from orders.state_machine import TRANSITIONS
+from orders.transitions import transition_orders
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive (HttpSink의 Session 재사용)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def fill_outbox(count):
+    orders = Order.objects.bulk_create(
+        [Order(status=Order.Status.PENDING_ACCEPTANCE) for _ in range(count)], batch_size=5000
+    )
+    acceptance = TRANSITIONS['acceptance']
+    started = time.perf_counter()
+    for i in range(0, count, 1000):
+        with transaction.atomic():
+            transition_orders([(order.id, ['*'], acceptance) for order in orders[i:i + 1000]])
+    return time.perf_counter() - started
+
+
+def run(dispatcher):
+    OrderEvent.objects.update(dispatched_at=None)
+    reports = []
+    lock = threading.Lock()
+
+    def on_batch(report):
+        with lock:
+            reports.append(report)
+
+    started = time.perf_counter()
+    dispatcher.run(once=True, on_batch=on_batch)
+    elapsed = time.perf_counter() - started
+    assert not dispatcher.errors, dispatcher.errors
+    return elapsed, reports
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=20_000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with _setup.benchmark_database(), tempfile.TemporaryDirectory() as tmp:
+        elapsed = fill_outbox(args.events)
+        print(f"{args.events:,} transitions (+ outbox insert) in {elapsed:.2f}s"
+              f" ({args.events / elapsed:,.0f} transitions/s)\n")
+
+        sinks = (
+            ('callback', lambda: CallbackSink(lambda events: None)),
+            ('log file', lambda: LogFileSink(os.path.join(tmp, 'events.jsonl'))),
+            ('http stub', lambda: HttpSink(f'http://127.0.0.1:{server.server_port}/events')),
+        )
+        print(f"{'sink':>10} | {'workers':>7} | {'batches':>7} | {'ms/batch':>8} | {'ev/s':>9} | {'max lag s':>9}")
+        for name, make_sink in sinks:
+            for workers in args.workers:
+                dispatcher = OutboxDispatcher([make_sink()], batch_size=args.batch_size, workers=workers)
+                elapsed, reports = run(dispatcher)
+                dispatcher.close()
+                sent = sum(report.size for report in reports)
+                assert sent == args.events, (sent, args.events)
+                batch_ms = statistics.median(report.seconds for report in reports) * 1000
+                print(f"{name:>10} | {workers:>7} | {len(reports):>7,} | {batch_ms:>8.1f} |"
+                      f" {sent / elapsed:>9,.0f} | {max(report.lag for report in reports):>9.2f}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
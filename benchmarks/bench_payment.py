@@ -0,0 +1,143 @@
+"""
+2단계 결제 벤치마크 (orders/payments.py): 느린 가짜 게이트웨이에서 처리량과 행 잠금 유지 시간
+
+--workers 개의 스레드가 서로 다른 주문을 결제하고, 경합 스레드 하나가 결제 중인 주문 행을
+SELECT ... FOR UPDATE 로 잠그려 할 때 기다린 시간을 잽니다 (관리자 액션, 일괄 전이 등 같은 행을 쓰는 요청).
+- locked    : 행을 잠근 트랜잭션 안에서 게이트웨이를 호출한 뒤 저장 (잠금 = 게이트웨이 지연)
+- two-phase : POST /api/v2/orders/{id}/payment/ (예약 커밋 -> 트랜잭션 밖에서 호출 -> 조건부 UPDATE로 확정)
+게이트웨이 지연은 FakeGateway + 'payment' 지연 프로필(fixed:<--latency ms>)로 넣습니다.
+lock hold 는 잠금을 잡는 트랜잭션 하나의 시간(two-phase는 예약/확정 전이 각각)입니다.
+
+실행: python benchmarks/bench_payment.py [--payments 400] [--workers 8] [--latency 50 200]
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from unittest import mock
+
+import _setup
+
+from django.db import connection, transaction
+from django.db.models import F
+from rest_framework.test import APIClient
+
+from orders.api.v2.views import OrderV2ViewSet
+from orders.etags import get_strategy
+from orders.latency import LatencyInjector
+from orders.models import Order
+
+
+def pay_locked(client, latency, pk, etag, holds):
+    # 기존 방식: 주문을 잠근 채로 외부 연동을 기다림
+    # (지연 주입기는 트랜잭션 안의 호출을 거부하므로 게이트웨이 지연을 직접 재현)
+    started = time.perf_counter()
+    with transaction.atomic():
+        Order.objects.select_for_update().get(pk=pk)
+        time.sleep(latency)
+        Order.objects.filter(pk=pk).update(status=Order.Status.PENDING_ACCEPTANCE, version=F('version') + 1)
+    holds.append(time.perf_counter() - started)
+    return 200
+
+
+def pay_two_phase(client, latency, pk, etag, holds):
+    return client.post(f'/api/v2/orders/{pk}/payment/', {'amount': 20000}, format='json',
+                       HTTP_IF_MATCH=etag).status_code
+
+
+def run(mode, payments, workers, latency, holds):
+    strategy = get_strategy()
+    orders = Order.objects.bulk_create([Order(status=Order.Status.PENDING_PAYMENT) for _ in range(payments)])
+    queue = iter(orders)
+    queue_lock = threading.Lock()
+    in_flight = set()
+    statuses, waits = {}, []
+    done = threading.Event()
+    pay = pay_locked if mode == 'locked' else pay_two_phase
+
+    def worker():
+        client = APIClient()
+        try:
+            while True:
+                with queue_lock:
+                    order = next(queue, None)
+                if order is None:
+                    return
+                in_flight.add(order.pk)
+                status = pay(client, latency, order.pk, strategy.format(strategy.make(order.pk, 1)), holds)
+                in_flight.discard(order.pk)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            connection.close()
+
+    def contender():
+        # 결제 중인 주문 행을 잠그는 다른 쓰기 요청
+        try:
+            while not done.is_set():
+                pending = list(in_flight)
+                if not pending:
+                    time.sleep(0.001)
+                    continue
+                started = time.perf_counter()
+                with transaction.atomic():
+                    list(Order.objects.select_for_update().filter(pk=random.choice(pending)).values_list('id'))
+                waits.append(time.perf_counter() - started)
+                time.sleep(0.005)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    watcher = threading.Thread(target=contender)
+    started = time.perf_counter()
+    watcher.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    watcher.join()
+    return elapsed, statuses, waits
+
+
+def quantile(samples, q):
+    return statistics.quantiles(samples, n=100)[q - 1] * 1000 if len(samples) > 1 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--payments', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=int, nargs='+', default=[50, 200], help="게이트웨이 지연(ms)")
+    args = parser.parse_args()
+
+    # 전이 트랜잭션(예약/확정) 시간을 잼
+    commit_transition = OrderV2ViewSet.commit_transition
+    holds = []
+
+    def timed_commit(self, *a, **kw):
+        started = time.perf_counter()
+        try:
+            return commit_transition(self, *a, **kw)
+        finally:
+            holds.append(time.perf_counter() - started)
+
+    with _setup.benchmark_database(), mock.patch.object(OrderV2ViewSet, 'commit_transition', timed_commit):
+        print(f"payments={args.payments} workers={args.workers}\n")
+        print(f"{'mode':>9} | {'gateway':>7} | {'pay/s':>7} | {'hold p50':>8} | {'hold p99':>8} |"
+              f" {'wait p50':>8} | {'wait p99':>8} | statuses")
+        for latency in args.latency:
+            injector = LatencyInjector({'payment': f'fixed:{latency / 1000}'})  # FakeGateway 지연
+            for mode in ('locked', 'two-phase'):
+                holds.clear()
+                with mock.patch('orders.latency._injector', injector):
+                    elapsed, statuses, waits = run(mode, args.payments, args.workers, latency / 1000, holds)
+                summary = ' '.join(f"{status}:{count}" for status, count in sorted(statuses.items()))
+                print(f"{mode:>9} | {latency:>5}ms | {args.payments / elapsed:>7,.0f} |"
+                      f" {quantile(holds, 50):>6.2f}ms | {quantile(holds, 99):>6.2f}ms |"
+                      f" {quantile(waits, 50):>6.2f}ms | {quantile(waits, 99):>6.2f}ms | {summary}")
+
+
+if __name__ == '__main__':
+    main()
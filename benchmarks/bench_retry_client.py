@@ -0,0 +1,149 @@
+"""
+412 재시도 클라이언트 경합 벤치마크 (order_client.py)
+
+WSGI 서버(bench_async_views.py의 스레드 풀 서버)를 띄우고 --clients 개의 스레드가 각자 맡은 주문을
+접수 -> 조리 완료 -> 픽업 -> 배달 완료까지 진행합니다. 그동안 --writers 개의 스레드가 같은 주문들의 version을
+계속 올려(다른 필드 수정 같은 쓰기) 행위 요청이 412를 받게 만듭니다.
+- manual : black_BOX_test_v2.0.py 방식. 요청마다 새 연결, 행위 전에 GET으로 ETag를 받고 412면 다시 GET 후 재시도
+- client : OrderClient. Session 하나로 연결 재사용, 412 응답의 ETag로 GET 없이 jitter 백오프 재시도
+두 방식 모두 행위 하나당 최대 재시도 횟수는 같습니다 (--retries).
+완료한 전이 수/초, HTTP 요청 수, 412 응답 수, 재시도 한도를 넘겨 실패한 전이 수를 출력합니다.
+
+실행: python benchmarks/bench_retry_client.py [--orders 200] [--clients 8] [--writers 2]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import _setup
+import requests
+
+from django.db import connection
+from django.db.models import F
+
+from bench_async_views import free_port, wait_port
+from order_client import OrderClient
+from orders.models import Order
+
+LIFECYCLE = ('acceptance', 'preparation_complete', 'pickup', 'delivery')
+
+
+class Counter:
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def add(self, name, n=1):
+        with self.lock:
+            self.values[name] = self.values.get(name, 0) + n
+
+
+def manual_act(base_url, order_id, action, retries, counter):
+    # 매번 GET으로 ETag를 받고 POST, 412면 다시 GET부터 (요청마다 새 연결)
+    url = f'{base_url}/api/v2/orders/{order_id}/'
+    for _ in range(retries + 1):
+        etag = requests.get(url).headers['ETag']
+        response = requests.post(f"{url}{action.replace('_', '-')}/", headers={'If-Match': etag})
+        counter.add('requests', 2)
+        if response.status_code != 412:
+            return response.status_code
+        counter.add('412')
+    return 412
+
+
+def client_act(client, order_id, action, counter):
+    result = client.act(order_id, action)
+    counter.add('requests', result.attempts)
+    counter.add('412', result.attempts - 1 + (result.status_code == 412))
+    return result.status_code
+
+
+def run(mode, base_url, orders, clients, writers, retries):
+    counter = Counter()
+    queue = iter(orders)
+    queue_lock = threading.Lock()
+    done = threading.Event()
+
+    def worker():
+        client = OrderClient(base_url, max_retries=retries)
+        try:
+            while True:
+                with queue_lock:
+                    order_id = next(queue, None)
+                if order_id is None:
+                    return
+                for action in LIFECYCLE:
+                    if mode == 'manual':
+                        status = manual_act(base_url, order_id, action, retries, counter)
+                    else:
+                        status = client_act(client, order_id, action, counter)
+                    if status != 200:
+                        counter.add('failed')
+                        break
+                    counter.add('transitions')
+        finally:
+            client.close()
+
+    def writer():
+        # 같은 주문들에 다른 쓰기가 계속 들어오는 상황 (version만 올림)
+        try:
+            while not done.is_set():
+                Order.objects.filter(pk=random.choice(orders)).update(version=F('version') + 1)
+                time.sleep(0.002)
+        finally:
+            connection.close()
+
+    noise = [threading.Thread(target=writer) for _ in range(writers)]
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for t in noise:
+        t.start()
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    for t in noise:
+        t.join()
+    return elapsed, counter.values
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--retries', type=int, default=5)
+    parser.add_argument('--threads', type=int, default=32, help="WSGI 서버 스레드 수")
+    args = parser.parse_args()
+
+    with _setup.benchmark_database() as conn:
+        port = free_port()
+        env = dict(os.environ, DB_NAME=conn.settings_dict['NAME'], ORDER_V2_ASYNC_VIEWS='')
+        server = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_async_views.py')
+        process = subprocess.Popen(
+            [sys.executable, server, '--serve', 'wsgi', '--port', str(port), '--threads', str(args.threads)], env=env,
+        )
+        try:
+            wait_port(port, process)
+            base_url = f'http://127.0.0.1:{port}'
+            print(f"orders={args.orders} clients={args.clients} writers={args.writers} retries={args.retries}\n")
+            print(f"{'mode':>6} | {'transitions/s':>13} | {'requests':>8} | {'412':>6} | {'failed':>6}")
+            for mode in ('manual', 'client'):
+                orders = [o.id for o in Order.objects.bulk_create(
+                    [Order(status=Order.Status.PENDING_ACCEPTANCE) for _ in range(args.orders)])]
+                elapsed, values = run(mode, base_url, orders, args.clients, args.writers, args.retries)
+                print(f"{mode:>6} | {values.get('transitions', 0) / elapsed:>13,.0f} |"
+                      f" {values.get('requests', 0):>8,} | {values.get('412', 0):>6,} | {values.get('failed', 0):>6,}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+라이더 위치 수집 벤치마크 (orders/locations.py, POST /api/v2/riders/locations/)
+
+임시 DB에 라이더 --riders 명을 만들고 --seconds 동안 무작위 라이더의 위치 핑을 --batch 개씩 최대한 빨리 넣습니다.
+- direct   : 핑마다 UPDATE 한 문장 (병합 전, 핑 하나 = 쓰기 하나)
+- buffered : LocationBuffer.add() -> 라이더당 마지막 핑만 남기고 --flush-interval 초마다 UPDATE 한 문장
+- endpoint : buffered와 같지만 API(POST /api/v2/riders/locations/, 요청 검증 포함)를 거침
+받은 핑 수/초, DB 문장 수/초, 기록한 행 수/초, 병합으로 버린 핑 비율을 출력합니다.
+
+실행: python benchmarks/bench_rider_locations.py [--riders 20000] [--batch 200] [--seconds 5]
+"""
+import argparse
+import random
+import time
+from unittest import mock
+
+import _setup  # noqa: F401
+
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.locations import LocationBuffer, LocationPing
+from orders.models import Rider
+
+LAT, LON = 37.5665, 126.9780
+
+
+def seed(riders):
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO orders_rider (name, is_available) SELECT 'bench', true FROM generate_series(1, %s)",
+                       [riders])
+        cursor.execute("ANALYZE orders_rider")
+    return list(Rider.objects.values_list('id', flat=True))
+
+
+def make_pings(rng, rider_ids, size):
+    now = timezone.now()
+    return [
+        LocationPing(rng.choice(rider_ids), LAT + rng.uniform(-0.1, 0.1), LON + rng.uniform(-0.1, 0.1), now)
+        for _ in range(size)
+    ]
+
+
+def run_direct(rider_ids, args):
+    rng = random.Random(1)
+    received = statements = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < args.seconds:
+        for ping in make_pings(rng, rider_ids, args.batch):
+            Rider.objects.filter(pk=ping.rider_id).update(
+                latitude=ping.latitude, longitude=ping.longitude, location_updated_at=ping.at)
+            statements += 1
+        received += args.batch
+    elapsed = time.perf_counter() - started
+    return elapsed, {'received': received, 'statements': statements, 'written': statements, 'coalesced': 0}
+
+
+def run_buffered(rider_ids, args, via_api=False):
+    rng = random.Random(1)
+    buffer = LocationBuffer(flush_interval=args.flush_interval, max_pending=len(rider_ids) + 1)
+    client = APIClient()
+    url = '/api/v2/riders/locations/'
+    started = time.perf_counter()
+    with mock.patch('orders.locations._buffer', buffer):
+        while time.perf_counter() - started < args.seconds:
+            pings = make_pings(rng, rider_ids, args.batch)
+            if via_api:
+                payload = {"pings": [
+                    {"rider_id": p.rider_id, "latitude": p.latitude, "longitude": p.longitude} for p in pings
+                ]}
+                client.post(url, payload, format='json')
+            else:
+                buffer.add(pings)
+        buffer.stop()  # 남은 핑 기록 + 플러시 스레드 종료
+    elapsed = time.perf_counter() - started
+    return elapsed, buffer.stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--riders', type=int, default=20_000)
+    parser.add_argument('--batch', type=int, default=200, help="요청(add) 하나에 담는 핑 수")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--flush-interval', type=float, default=1.0)
+    args = parser.parse_args()
+
+    with _setup.benchmark_database():
+        rider_ids = seed(args.riders)
+        print(f"riders={args.riders:,} batch={args.batch} flush_interval={args.flush_interval}s"
+              f" seconds={args.seconds}\n")
+        print(f"{'mode':>8} | {'pings/s':>9} | {'statements/s':>12} | {'rows/s':>8} | {'coalesced':>9}")
+        for mode in ('direct', 'buffered', 'endpoint'):
+            if mode == 'direct':
+                elapsed, stats = run_direct(rider_ids, args)
+            else:
+                elapsed, stats = run_buffered(rider_ids, args, via_api=mode == 'endpoint')
+            coalesced = stats['coalesced'] / stats['received'] if stats['received'] else 0.0
+            print(f"{mode:>8} | {stats['received'] / elapsed:>9,.0f} | {stats['statements'] / elapsed:>12,.1f} |"
+                  f" {stats['written'] / elapsed:>8,.0f} | {coalesced:>9.0%}")
+
+
+if __name__ == '__main__':
+    main()
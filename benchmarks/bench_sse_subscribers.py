@@ -0,0 +1,140 @@
+"""
+SSE 구독자 부하 테스트: 한 프로세스에서 유휴 구독자 N개 유지 (orders/events.py 허브)
+
+소켓 서버 없이 quickeats.asgi.application 에 ASGI 연결 N개를 직접 붙입니다.
+(미들웨어, URL 라우팅, 비동기 뷰, StreamingHttpResponse 까지 실제 요청 경로 그대로)
+- 연결 수립 : N개 연결이 모두 첫 이벤트(현재 상태)를 받을 때까지 걸린 시간
+- 메모리    : 구독자 1개당 RSS 증가량
+- fan-out   : 감시 중인 모든 주문에 이벤트를 1개씩 발행 -> 모든 구독자가 받을 때까지 걸린 시간
+- 정리      : 모든 연결을 끊은 뒤 허브에 남은 구독자 수 (0이어야 함)
+
+실행: python benchmarks/bench_sse_subscribers.py [--subscribers 10000] [--orders 1000]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from _setup import benchmark_database
+
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+class Deliveries:
+    """모든 연결이 받은 이벤트 수 합계. target에 도달하면 reached가 set 됨"""
+
+    def __init__(self):
+        self.total = 0
+        self.target = None
+        self.reached = asyncio.Event()
+
+    def add(self, count):
+        self.total += count
+        if self.target is not None and self.total >= self.target:
+            self.reached.set()
+
+    async def wait_for_total(self, target, tasks):
+        self.target = target
+        self.reached.clear()
+        if self.total >= target:
+            return
+        # 요청 처리 태스크가 먼저 끝나면(오류) 바로 예외를 올림
+        waiting = asyncio.ensure_future(self.reached.wait())
+        done, _ = await asyncio.wait([waiting, *tasks], return_when=asyncio.FIRST_COMPLETED)
+        if waiting not in done:
+            waiting.cancel()
+            for task in done:
+                task.result()
+            raise RuntimeError("a connection closed before receiving its events")
+
+
+class Connection:
+    """ASGI HTTP 연결 하나 (receive/send 를 흉내 냄)"""
+
+    def __init__(self, path, deliveries):
+        self.scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+            'root_path': '', 'headers': [(b'host', b'testserver')], 'server': ('testserver', 80),
+            'client': ('127.0.0.1', 1234),
+        }
+        self.deliveries = deliveries
+        self.status = None
+        self.disconnected = asyncio.Event()
+        self.sent_request = False
+
+    async def receive(self):
+        if not self.sent_request:
+            self.sent_request = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+            if self.status != 200:
+                raise RuntimeError(f"{self.scope['path']} -> HTTP {self.status}")
+        elif message['type'] == 'http.response.body':
+            self.deliveries.add(message.get('body', b'').count(b'\nevent: status\n'))
+
+
+async def run(args, order_ids):
+    from quickeats.asgi import application
+    from orders.events import StatusEvent, get_hub
+
+    hub = get_hub()
+    deliveries = Deliveries()
+    connections = [
+        Connection(f'/api/v2/orders/{order_ids[i % len(order_ids)]}/events/', deliveries)
+        for i in range(args.subscribers)
+    ]
+    before = rss_mb()
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(application(c.scope, c.receive, c.send)) for c in connections]
+    await deliveries.wait_for_total(args.subscribers, tasks)
+    elapsed = time.perf_counter() - started
+    after = rss_mb()
+    print(f"connected   : {hub.subscriber_count:,} subscribers in {elapsed:.2f}s "
+          f"({args.subscribers / elapsed:,.0f} conn/s)")
+    print(f"memory      : +{after - before:.1f} MB RSS ({(after - before) * 1024 * 1024 / args.subscribers / 1024:.1f} KB/subscriber)")
+
+    for round_ in range(args.rounds):
+        version = 2 + round_
+        started = time.perf_counter()
+        for order_id in order_ids:
+            hub.publish(StatusEvent(order_id, 'preparing', version, f'"{order_id}-{version}"'))
+        await deliveries.wait_for_total(args.subscribers * version, tasks)
+        elapsed = time.perf_counter() - started
+        print(f"fan-out #{round_ + 1}  : {len(order_ids):,} events -> {args.subscribers:,} deliveries "
+              f"in {elapsed * 1000:.1f} ms ({args.subscribers / elapsed:,.0f} deliveries/s)")
+
+    for c in connections:
+        c.disconnected.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(f"cleanup     : {hub.subscriber_count} subscribers left, {hub.dropped} dropped as lagged")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--subscribers', type=int, default=10_000)
+    parser.add_argument('--orders', type=int, default=1_000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    from django.conf import settings
+    from orders.models import Order
+
+    settings.ORDER_EVENTS_HEARTBEAT = 3600.0  # 유휴 구독자: 측정 중 keep-alive 없음
+
+    with benchmark_database():
+        Order.objects.bulk_create(Order(status=Order.Status.PREPARING) for _ in range(args.orders))
+        order_ids = list(Order.objects.values_list('id', flat=True))
+        asyncio.run(run(args, order_ids))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+상태 전이 검증 CPU 비용 비교 벤치마크
+
+기존 OrderV2ViewSet의 행위별 if 분기 방식과
+orders.state_machine의 사전 컴파일된 비트마스크 조회 방식을 비교합니다.
+DB는 사용하지 않습니다.
+
+실행: python benchmarks/bench_state_machine.py
+"""
+import timeit
+
+import _setup  # noqa: F401  (Django 초기화)
+
+from orders.models import Order
+from orders.state_machine import TRANSITIONS, can_transition
+
+S = Order.Status
+
+
+def branching_check(action, status):
+    # 기존 views.py의 행위별 분기 로직을 그대로 옮긴 것 (결제는 2단계 전이: 예약 -> 확정/취소)
+    if action == 'payment':
+        if status != S.PENDING_PAYMENT:
+            return None
+        return S.PAYMENT_PROCESSING
+    elif action == 'payment_confirmation':
+        if status != S.PAYMENT_PROCESSING:
+            return None
+        return S.PENDING_ACCEPTANCE
+    elif action == 'payment_failure':
+        if status != S.PAYMENT_PROCESSING:
+            return None
+        return S.PENDING_PAYMENT
+    elif action == 'cancellation':
+        allowed_statuses = [S.PENDING_PAYMENT, S.PENDING_ACCEPTANCE]
+        if status not in allowed_statuses:
+            return None
+        return S.CANCELLED
+    elif action == 'acceptance':
+        if status != S.PENDING_ACCEPTANCE:
+            return None
+        return S.PREPARING
+    elif action == 'rejection':
+        if status != S.PENDING_ACCEPTANCE:
+            return None
+        return S.REJECTED
+    elif action == 'preparation_complete':
+        if status != S.PREPARING:
+            return None
+        return S.READY_FOR_PICKUP
+    elif action == 'pickup':
+        if status != S.READY_FOR_PICKUP:
+            return None
+        return S.IN_TRANSIT
+    elif action == 'delivery':
+        if status != S.IN_TRANSIT:
+            return None
+        return S.DELIVERED
+    return None
+
+
+def table_check(action, status):
+    if not can_transition(action, status):
+        return None
+    return TRANSITIONS[action].target
+
+
+def main(number=200_000):
+    # 모든 (행위, 상태) 조합을 순회 -> 성공/실패 케이스가 섞이도록
+    cases = [(a, s.value) for a in TRANSITIONS for s in S]
+
+    # 두 구현이 같은 결과를 내는지 먼저 확인
+    for action, status in cases:
+        expected = branching_check(action, status)
+        assert table_check(action, status) == (str(expected) if expected else None), (action, status)
+
+    def run(fn):
+        def loop():
+            for action, status in cases:
+                fn(action, status)
+        return loop
+
+    loops = max(1, number // len(cases))
+    calls = loops * len(cases)
+    for name, fn in (('if-branching', branching_check), ('precompiled table', table_check)):
+        elapsed = min(timeit.repeat(run(fn), number=loops, repeat=5))
+        print(f"{name:>18}: {elapsed / calls * 1e9:8.1f} ns/transition check ({calls:,} calls)")
+
+
+if __name__ == '__main__':
+    main()
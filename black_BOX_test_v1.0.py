@@ -3,17 +3,19 @@ import requests
 import time
 
 URL = "http://127.0.0.1:8000/api/orders/1/"
+# 읽기와 저장 사이에 3초 지연을 넣어 경쟁 구간을 재현 (DEBUG 서버에서만 허용되는 헤더, orders/latency.py)
+LATENCY = {'X-Simulated-Latency': 'v1_update=fixed:3'}
 
 def customer_cancel():
     print("[고객] '취소해주세요!' 요청 보냄")
     # 고객은 'cancelled'로 상태 변경 요청
-    res = requests.put(URL, json={'status': 'cancelled'})
+    res = requests.put(URL, json={'status': 'cancelled'}, headers=LATENCY)
     print(f"[고객] 응답 받음: {res.json()['status']}")
 
 def restaurant_accept():
     print(" [사장님] '주문 접수!' 요청 보냄")
     # 사장님은 'preparing'(조리중)으로 상태 변경 요청
-    res = requests.put(URL, json={'status': 'preparing'})
+    res = requests.put(URL, json={'status': 'preparing'}, headers=LATENCY)
     print(f" [사장님] 응답 받음: {res.json()['status']}")
 
 # --- 시나리오 시작 ---
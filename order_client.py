@@ -0,0 +1,95 @@
+"""
+QuickEats V2 주문 API 클라이언트
+
+주문 행위(payment, acceptance, ...)를 If-Match와 함께 보내고, 다른 요청이 먼저 주문을 바꿔 412를 받으면
+응답에 담긴 현재 ETag로 바로 다시 시도합니다 (재조회 GET 없음).
+- 재시도는 최대 max_retries 번, 재시도 사이에는 full jitter 지수 백오프(0 ~ min(max_backoff, backoff * 2^n))만큼 쉼
+  (같은 주문을 노리는 클라이언트들이 같은 박자로 다시 부딪히지 않도록)
+- 모든 요청이 requests.Session 하나를 써서 연결을 재사용합니다 (keep-alive 연결 풀).
+- 최근에 본 주문 ETag를 기억해 두어, 첫 시도에도 GET 없이 If-Match를 보냅니다.
+
+    client = OrderClient('http://127.0.0.1:8000')
+    result = client.act(order_id, 'acceptance')
+    result.ok, result.status_code, result.data, result.attempts
+
+400(허용되지 않는 상태), 404 등은 재시도하지 않고 그대로 돌려줍니다.
+"""
+import random
+import time
+import uuid
+from dataclasses import dataclass
+
+import requests
+
+
+@dataclass
+class ActionResult:
+    status_code: int
+    data: dict
+    etag: str = None
+    attempts: int = 1  # 보낸 행위 요청 수 (412 재시도 포함)
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 300
+
+
+class OrderClient:
+    # Idempotency-Key를 붙이는 행위 (서버가 멱등 처리하는 행위)
+    idempotent_actions = frozenset({'payment'})
+
+    def __init__(self, base_url='http://127.0.0.1:8000', max_retries=5, backoff=0.02, max_backoff=1.0,
+                 timeout=10.0, session=None):
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.etags = {}  # order_id -> 마지막으로 본 ETag
+
+    def order_url(self, order_id, path=''):
+        return f'{self.base_url}/api/v2/orders/{order_id}/{path}'
+
+    def get(self, order_id):
+        """주문 조회. (본문, ETag) 반환, 실패하면 requests.HTTPError"""
+        response = self.session.get(self.order_url(order_id), timeout=self.timeout)
+        response.raise_for_status()
+        self.etags[order_id] = response.headers.get('ETag')
+        return response.json(), self.etags[order_id]
+
+    def act(self, order_id, action, data=None, etag=None):
+        """
+        행위 요청. 412면 응답의 현재 ETag로 최대 max_retries 번 다시 보냅니다.
+        etag를 주지 않으면 마지막으로 본 ETag를, 그것도 없으면 GET으로 받은 ETag를 씁니다.
+        """
+        etag = etag or self.etags.get(order_id)
+        if etag is None:
+            _, etag = self.get(order_id)
+        headers = {}
+        if action in self.idempotent_actions:
+            # 재시도해도 같은 키 -> 이전 시도가 실제로는 성공했더라도 두 번 실행되지 않음
+            headers['Idempotency-Key'] = str(uuid.uuid4())
+        url = self.order_url(order_id, action.replace('_', '-') + '/')
+
+        attempt = 0
+        while True:
+            attempt += 1
+            response = self.session.post(url, json=data or {}, headers={**headers, 'If-Match': etag},
+                                         timeout=self.timeout)
+            body = response.json() if response.content else {}
+            etag = response.headers.get('ETag') or etag
+            if response.headers.get('ETag'):
+                self.etags[order_id] = etag
+            if response.status_code != 412 or attempt > self.max_retries:
+                return ActionResult(response.status_code, body, response.headers.get('ETag'), attempt)
+            time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))))
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,15 +1,44 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from .api.v2.views import commit_transitions
+from .etags import get_strategy
 from .models import Order, Restaurant, Rider
+from .state_machine import TRANSITIONS
+
+
+def _transition_admin_action(transition):
+    # 상태 머신 테이블의 전이 하나를 "선택한 주문에 적용" 관리자 액션으로 만듭니다.
+    def apply_transition(modeladmin, request, queryset):
+        # V2 행위와 같은 커밋 경로: 상태 검사/버전 증가/이벤트 아웃박스, during/after 훅(배차, 라이더 반납),
+        # 커밋 후 캐시 write-through와 SSE 발행 (If-Match는 '*')
+        pks = list(queryset.values_list('pk', flat=True))
+        results, _ = commit_transitions([(pk, ['*'], transition) for pk in pks], get_strategy())
+        total, updated = len(pks), sum(result.ok for result in results)
+        level = messages.SUCCESS if updated == total else messages.WARNING
+        modeladmin.message_user(
+            request, f"{transition.action}: {updated}건 전이, {total - updated}건 건너뜀 (허용되지 않는 상태)", level
+        )
+
+    apply_transition.__name__ = f"apply_{transition.action}"
+    return admin.action(
+        description=f"{transition.action} ({' / '.join(transition.sources)} → {transition.target})"
+    )(apply_transition)
+
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'status', 'restaurant', 'rider', 'created_at')
     list_filter = ('status',)
+    # 상태 변경은 상태 머신을 거치는 액션으로만 허용
+    readonly_fields = ('status', 'version')
+    # 2단계 전이의 시작(결제 예약)은 외부 연동 없이 적용할 수 없으므로 제외.
+    # 확정/취소 액션은 남겨 두어 연동 도중 멈춘 payment_processing 주문을 수동으로 정리할 수 있게 함
+    actions = [_transition_admin_action(t) for t in TRANSITIONS.values() if not t.two_phase]
 
 @admin.register(Restaurant)
 class RestaurantAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'address')
+    list_display = ('id', 'name', 'address', 'latitude', 'longitude')
 
 @admin.register(Rider)
 class RiderAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name')
\ No newline at end of file
+    list_display = ('id', 'name', 'is_available', 'latitude', 'longitude', 'location_updated_at')
+    list_filter = ('is_available',)
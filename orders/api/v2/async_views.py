@@ -0,0 +1,241 @@
+"""
+V2 주문 API 비동기(ASGI) 구현
+
+settings.ORDER_V2_ASYNC_VIEWS = True 이면 목록/상세/행위 URL을 같은 경로, 같은 이름 그대로 이 뷰가 처리합니다.
+(orders/api/v2/urls.py) 일괄 전이, 이력 조회 등 나머지 URL은 DRF ViewSet이 그대로 처리합니다.
+
+- 요청 해석, 직렬화, 응답 구성은 OrderV2ViewSet의 헬퍼를 그대로 쓰고 DB 조회만 비동기 ORM(async for, aget, ain_bulk)으로
+  바꿉니다. 응답 JSON 바이트는 동기 뷰와 같습니다. 렌더러 협상은 하지 않고 항상 JSON으로 응답합니다.
+- before 훅과 2단계 전이의 외부 연동(결제 게이트웨이)은 비동기 버전(Transition.abefore, aexternal)을 await 하므로
+  기다리는 동안 스레드와 DB 연결을 잡지 않습니다.
+- 전이는 조건부 UPDATE(+ 아웃박스/이력 기록)와 캐시 write-through가 한 트랜잭션이어야 하는데,
+  비동기 ORM은 트랜잭션(atomic)을 지원하지 않으므로 commit_transition()을 sync_to_async 한 번으로 실행합니다.
+  (비동기 ORM 메서드도 내부적으로 같은 방식으로 실행되므로 스레드 전환 횟수는 같습니다)
+- ASGI에서는 요청마다 별도 스레드와 DB 연결을 쓰므로, DB를 쓰는 구간의 동시 실행 수를
+  ORDER_V2_ASYNC_DB_CONCURRENCY로 제한하고 구간이 끝나면 연결을 닫습니다(db_slot).
+  제한이 없으면 동시 요청 수만큼 연결이 열려 max_connections를 넘습니다.
+WSGI에서도 동작하지만 요청마다 이벤트 루프를 만들어 느리므로 ASGI 배포에서만 켭니다.
+"""
+import asyncio
+import weakref
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.http import Http404, HttpResponse
+from django.urls import URLPattern
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from orders.api.v2.includes import aside_load
+from orders.api.v2.views import OrderV2ViewSet
+from orders.archive import aarchived_or_404
+from orders.cache import get_cache
+from orders.decorators import idempotent
+from orders.etags import parse_etags
+from orders.latency import request_latency
+from orders.state_machine import TRANSITIONS
+
+_semaphores = weakref.WeakKeyDictionary()  # 이벤트 루프 -> asyncio.Semaphore
+
+
+def _release_connection():
+    # 요청 스레드의 DB 연결을 바로 닫음. 요청이 끝날 때(request_finished)까지 기다리면
+    # 슬롯을 반납한 요청들이 연결을 계속 쥐고 있어 연결 수가 제한을 넘습니다. (트랜잭션 안/테스트에서는 유지)
+    if not connection.in_atomic_block:
+        connection.close()
+
+
+class db_slot:
+    """
+    async with db_slot(): DB를 동시에 쓰는 요청 수 제한 (settings.ORDER_V2_ASYNC_DB_CONCURRENCY, 이벤트 루프 단위)
+    구간이 끝나면 요청 스레드의 DB 연결을 닫으므로 열린 연결 수도 제한 이하로 유지됩니다.
+    """
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        self.semaphore = _semaphores.get(loop)
+        if self.semaphore is None:
+            limit = getattr(settings, 'ORDER_V2_ASYNC_DB_CONCURRENCY', 32)
+            self.semaphore = _semaphores[loop] = asyncio.Semaphore(limit)
+        await self.semaphore.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        try:
+            await sync_to_async(_release_connection)()
+        finally:
+            self.semaphore.release()
+
+
+async def aget_or_404(queryset, **filter_kwargs):
+    # rest_framework.generics.get_object_or_404의 비동기 버전
+    try:
+        return await queryset.aget(**filter_kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+    except (TypeError, ValueError, ValidationError):
+        raise Http404
+
+
+class AsyncOrderV2View:
+    viewset_class = OrderV2ViewSet
+    renderer = JSONRenderer()
+
+    def __init__(self, action, method, transition=None):
+        self.action = action  # list / retrieve / 행위 이름
+        self.method = method
+        self.transition = transition
+
+    def as_view(self):
+        async def view(request, *args, **kwargs):
+            return await self.dispatch(request, *args, **kwargs)
+
+        view.__name__ = f'async_order_{self.action}'
+        return csrf_exempt(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        action_map = {self.method: self.action}
+        if self.method == 'get':
+            action_map['head'] = self.action
+        viewset = self.viewset_class(action_map=action_map, args=args, kwargs=kwargs, format_kwarg=None)
+        viewset.request = viewset.initialize_request(request, *args, **kwargs)
+        try:
+            if request.method.lower() not in action_map:
+                raise exceptions.MethodNotAllowed(request.method)
+            handler = self.perform_transition if self.transition is not None else getattr(self, self.action)
+            response = await handler(viewset, viewset.request)
+        except Exception as exc:
+            # DRF와 같은 오류 응답 (Http404 -> {"detail": "Not found."} 등)
+            response = exception_handler(exc, viewset.get_exception_handler_context())
+            if response is None:
+                raise
+        return self.render(response)
+
+    def render(self, response):
+        """
+        DRF Response -> HttpResponse. 동기 뷰와 같은 JSONRenderer로 직렬화합니다.
+        (Response를 그대로 돌려주면 Django가 render()를 스레드로 넘겨 실행하므로 여기서 바이트로 만듦)
+        """
+        if not isinstance(response, Response):
+            return response  # 저장된 Idempotency-Key 응답 등 이미 렌더링된 응답
+        content = self.renderer.render(response.data) if response.data is not None else b''
+        rendered = HttpResponse(content, status=response.status_code, content_type=self.renderer.media_type)
+        for name, value in response.items():
+            if name.lower() != 'content-type':
+                rendered[name] = value
+        patch_vary_headers(rendered, ['Accept'])
+        return rendered
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    async def list(self, viewset, request):
+        queryset, includes, fields, include_fields = viewset.prepare_list(request)
+        paginator = viewset.paginator
+
+        async with db_slot():
+            if not includes and request.headers.get('If-None-Match'):
+                window = paginator.window_queryset(queryset, request).values_list('id', 'version')
+                response = viewset.list_not_modified(request, [row async for row in window])
+                if response is not None:
+                    return response
+
+            queryset, fast = viewset.select_list(queryset, includes, fields)
+            rows = paginator.paginate_rows([row async for row in paginator.window_queryset(queryset, request)])
+            included = await aside_load(rows, includes, include_fields) if includes else None
+        return viewset.list_response(request, rows, fast, fields, included)
+
+    async def retrieve(self, viewset, request):
+        cache = get_cache()
+        lookup = {viewset.lookup_field: viewset.kwargs[viewset.lookup_url_kwarg or viewset.lookup_field]}
+
+        snapshot = await cache.aget(*lookup.values())
+        if snapshot is not None:
+            return viewset.snapshot_response(request, *snapshot)
+
+        async with db_slot():
+            if request.headers.get('If-None-Match'):
+                try:
+                    current = await aget_or_404(viewset.get_queryset().values_list('id', 'version', named=True),
+                                                **lookup)
+                except Http404:
+                    current = await aarchived_or_404(*lookup.values())
+                response = viewset.detail_not_modified(request, current)
+                if response is not None:
+                    return response
+            try:
+                instance = await aget_or_404(viewset.get_queryset(), **lookup)
+            except Http404:
+                instance = await aarchived_or_404(*lookup.values())
+
+        data = None
+        if cache.enabled:
+            data = viewset.get_serializer(instance).data
+            await cache.afill(instance.pk, instance.version, data)
+        return viewset.detail_response(instance, data)
+
+    # ------------------------------------------------------------------
+    # 행위
+    # ------------------------------------------------------------------
+    async def perform_transition(self, viewset, request):
+        if self.transition.idempotent and request.headers.get('Idempotency-Key'):
+            # 키 선점/대기/응답 저장은 동기 저장소(orders/idempotency.py)가 처리 -> 스레드에서 실행하고
+            # 실제 전이만 이벤트 루프로 돌려보냄 (같은 요청 스레드라 DB 연결도 같음)
+            handler = idempotent(lambda view, req, **kwargs: async_to_sync(self.apply_transition)(view, req))
+            return await sync_to_async(handler)(viewset, request, **viewset.kwargs)
+        return await self.apply_transition(viewset, request)
+
+    async def apply_transition(self, viewset, request):
+        transition = self.transition
+        if_match = request.headers.get('If-Match')
+        if not if_match:
+            return viewset.if_match_required()
+
+        pk = viewset.get_transition_pk()
+        with request_latency(request):
+            if transition.abefore:
+                for hook in transition.abefore:
+                    await hook(pk)
+            else:
+                for hook in transition.before:
+                    await sync_to_async(hook)(pk)
+
+        async with db_slot():
+            result, snapshots = await sync_to_async(viewset.commit_transition)(pk, parse_etags(if_match), transition)
+        if transition.two_phase and result.ok:
+            # 예약 커밋 후 DB 슬롯을 반납한 채로 외부 연동을 기다림
+            with request_latency(request):
+                external = transition.aexternal or sync_to_async(transition.external, thread_sensitive=False)
+                outcome = await external(pk, request.data)
+            async with db_slot():
+                final, result, snapshots = await sync_to_async(viewset.finish_two_phase)(
+                    transition, result.order, outcome)
+            return viewset.two_phase_response(final, outcome, result, snapshots)
+        return viewset.transition_response(transition, result, snapshots)
+
+
+def use_async_views(patterns, basename):
+    """
+    DRF 라우터 URL 패턴 중 목록/상세/행위 URL의 뷰만 비동기 뷰로 바꿔 돌려줍니다.
+    정규식과 이름(reverse용)은 그대로이므로 클라이언트와 Idempotency-Key 요청 지문(route)도 바뀌지 않습니다.
+    """
+    views = {
+        f'{basename}-list': AsyncOrderV2View('list', 'get').as_view(),
+        f'{basename}-detail': AsyncOrderV2View('retrieve', 'get').as_view(),
+    }
+    for name, transition in TRANSITIONS.items():
+        if transition.internal:
+            continue
+        views[f"{basename}-{name.replace('_', '-')}"] = AsyncOrderV2View(name, 'post', transition).as_view()
+
+    return [
+        URLPattern(p.pattern, views[p.name], p.default_args, p.name)
+        if isinstance(p, URLPattern) and p.name in views else p
+        for p in patterns
+    ]
@@ -0,0 +1,39 @@
+"""
+V2 조건부 GET (If-None-Match -> 304 Not Modified)
+
+폴링 클라이언트가 매번 같은 본문을 다시 내려받지 않도록,
+ETag 계산에 필요한 값만 먼저 읽어서 클라이언트 ETag와 같으면 직렬화 없이 304를 돌려줍니다.
+- 단건 : (id, version) 만 조회
+- 목록 : 현재 페이지 창(window)의 (id, version) 만 조회 -> 컬렉션 ETag
+"""
+import hashlib
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from orders.etags import parse_etags
+
+
+def none_match(request, etag):
+    """If-None-Match가 현재 ETag 값과 일치하면 True (-> 304). 약한 비교라 W/ 태그도 일치로 봅니다."""
+    tags = parse_etags(request.headers.get('If-None-Match'))
+    return '*' in tags or etag in tags
+
+
+def not_modified(etag_header):
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    response['ETag'] = etag_header
+    return response
+
+
+def collection_etag(request, keys, has_next, has_previous):
+    """
+    목록 페이지 ETag.
+    keys는 페이지에 들어갈 주문의 (id, version) 목록입니다. 주문이 바뀌면 version이 올라가고,
+    주문이 추가/삭제되어 페이지 구성이 바뀌면 id 목록이 바뀌므로 본문이 바뀌는 경우 ETag도 바뀝니다.
+    쿼리 문자열(필터, 커서, 페이지 크기, fields)도 함께 넣어 다른 조회와 섞이지 않게 합니다.
+    """
+    digest = hashlib.md5(request.get_full_path().encode())
+    digest.update(f"|{int(has_next)}{int(has_previous)}|".encode())
+    digest.update(','.join(f"{pk}.{version}" for pk, version in keys).encode())
+    return digest.hexdigest()
@@ -0,0 +1,78 @@
+"""
+V2 식당/라이더 대시보드: 진행중 주문
+
+GET /api/v2/restaurants/{id}/active-orders/   기본: 접수 대기 / 조리중 / 픽업 대기
+GET /api/v2/riders/{id}/active-orders/        기본: 픽업 대기 / 배달중
+    ?status=preparing,ready_for_pickup  기본 상태 중 일부만
+    ?count=true                         주문 목록 없이 {"count": n, "by_status": {...}}
+
+목록은 V2 주문 목록과 같은 응답(키셋 커서, ?fields=, ?include=, 컬렉션 ETag)입니다.
+두 조회 모두 진행중 주문만 담은 부분 인덱스(order_rest_active_idx / order_rider_active_idx)를 탑니다.
+종료 주문이 수천만 건 쌓여도 인덱스는 진행중 주문 수만큼만 커지고,
+count 모드는 INCLUDE(status) 덕분에 힙을 읽지 않는 index-only scan 입니다. (benchmarks/bench_active_orders.py)
+"""
+from django.db.models import Count
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+
+from orders.models import Order, Restaurant, Rider
+from orders.api.v2.views import OrderV2ViewSet
+
+
+class ActiveOrdersViewSet(OrderV2ViewSet):
+    # 하위 클래스에서 지정: 주문의 FK 필드 / 소유자 모델 / 기본 상태(부분 인덱스 조건의 부분집합)
+    owner_field = None
+    owner_model = None
+    statuses = ()
+    # ?status= 는 아래 get_statuses()에서 처리 (?restaurant= 등 목록 필터는 쓰지 않음)
+    filter_backends = []
+
+    def get_statuses(self):
+        raw = self.request.query_params.get('status')
+        if not raw:
+            return [str(value) for value in self.statuses]
+        statuses = [value.strip() for value in raw.split(',') if value.strip()]
+        unknown = [value for value in statuses if value not in self.statuses]
+        if unknown:
+            raise ValidationError({'status': f"Must be one of {', '.join(self.statuses)}."})
+        return statuses
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # 소유자 존재 확인은 요청당 1회 (get_queryset()은 조건부 GET 창 / 목록 / count에서 여러 번 불림)
+        self.owner_pk = self.get_owner_pk()
+
+    def get_owner_pk(self):
+        pk = self.kwargs['owner_pk']
+        if not self.owner_model.objects.filter(pk=pk).exists():
+            raise NotFound(f"{self.owner_model.__name__} {pk} not found.")
+        return pk
+
+    def get_queryset(self):
+        # status IN (...) 가 부분 인덱스 조건(ACTIVE_ORDER_STATUSES)에 포함되므로 플래너가 부분 인덱스를 고를 수 있음
+        return Order.objects.filter(**{f'{self.owner_field}_id': self.owner_pk, 'status__in': self.get_statuses()})
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('count') in serializers.BooleanField.TRUE_VALUES:
+            return self.count_response()
+        return super().list(request, *args, **kwargs)
+
+    def count_response(self):
+        rows = self.get_queryset().order_by().values_list('status').annotate(n=Count('*'))
+        by_status = dict.fromkeys(self.get_statuses(), 0)
+        by_status.update(rows)
+        return Response({"count": sum(by_status.values()), "by_status": by_status})
+
+
+class RestaurantActiveOrdersViewSet(ActiveOrdersViewSet):
+    owner_field = 'restaurant'
+    owner_model = Restaurant
+    statuses = (Order.Status.PENDING_ACCEPTANCE, Order.Status.PREPARING, Order.Status.READY_FOR_PICKUP)
+
+
+class RiderActiveOrdersViewSet(ActiveOrdersViewSet):
+    owner_field = 'rider'
+    owner_model = Rider
+    statuses = (Order.Status.READY_FOR_PICKUP, Order.Status.IN_TRANSIT)
+
@@ -0,0 +1,122 @@
+"""
+V2 주문 목록 고속 직렬화 경로
+
+ModelSerializer는 행마다 모델 인스턴스를 만들고, 필드마다 get_attribute -> to_representation 을 호출합니다.
+목록처럼 같은 모양의 행을 대량으로 내보낼 때는 이 비용이 CPU 대부분을 차지하므로,
+- .values_list()로 필요한 컬럼만 튜플로 읽고 (모델 인스턴스 생성 없음)
+- Serializer 필드 정의에서 미리 컴파일한 "컬럼 단위" 변환 함수로 한 페이지를 한 번에 변환합니다.
+  (예: 날짜 컬럼은 시간대 조회/포맷 설정 확인을 페이지당 1회만 하고 같은 루프로 일괄 포맷)
+결과는 DRF Serializer와 같은 값/같은 키 순서라 JSON 바이트가 동일합니다. (orders/tests_fastpath.py 골든 테스트)
+"""
+import functools
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+def _identity(column, field):
+    # DB에서 이미 JSON 타입(int/str/None)으로 오는 컬럼은 변환하지 않음
+    return column
+
+
+def _datetimes(column, field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return _generic(column, field)
+    # 시간대는 페이지당 1회만 조회 (DRF는 값마다 enforce_timezone에서 조회)
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    formatted = []
+    append = formatted.append
+    for value in column:
+        if not value:
+            append(None)
+            continue
+        if tz is not None and value.tzinfo is not None and value.tzinfo is not tz:
+            value = value.astimezone(tz)
+        elif value.tzinfo is None or tz is None:
+            # naive 값 / naive 출력 설정은 드문 경우라 DRF 구현을 그대로 사용
+            append(field.to_representation(value))
+            continue
+        text = value.isoformat()
+        append(text[:-6] + 'Z' if text.endswith('+00:00') else text)
+    return formatted
+
+
+def _generic(column, field):
+    # 전용 변환기가 없는 필드는 DRF 필드의 to_representation을 그대로 호출 (None은 DRF처럼 None)
+    to_representation = field.to_representation
+    return [None if value is None else to_representation(value) for value in column]
+
+
+# DRF 필드 타입 -> 컬럼 변환 함수 (위에서부터 isinstance 매칭)
+CONVERTERS = (
+    (serializers.DateTimeField, _datetimes),
+    (serializers.PrimaryKeyRelatedField, _identity),
+    (serializers.ChoiceField, _identity),
+    (serializers.CharField, _identity),
+    (serializers.IntegerField, _identity),
+    (serializers.BooleanField, _identity),
+)
+
+
+def _converter_for(field):
+    for field_class, converter in CONVERTERS:
+        if isinstance(field, field_class):
+            return converter
+    return _generic
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(serializer_class, fields):
+    """Serializer 필드 정의 -> (출력 이름, values_list 컬럼, 변환 함수, DRF 필드) 목록 (클래스/필드셋당 1회)"""
+    model = serializer_class.Meta.model
+    plan = []
+    for name, field in serializer_class().fields.items():
+        if fields is not None and name not in fields:
+            continue
+        if field.write_only:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except Exception:
+            raise ImproperlyConfigured(
+                f"{serializer_class.__name__}.{name}: fast path only supports concrete model fields."
+            )
+        column = model_field.attname  # FK는 restaurant -> restaurant_id (JOIN 없음)
+        plan.append((name, column, _converter_for(field), field))
+    return tuple(plan)
+
+
+class FastListSerializer:
+    """
+    serializer_class(ModelSerializer)와 같은 출력을 values_list 튜플에서 만들어냅니다.
+
+        fast = FastListSerializer(OrderV2Serializer, fields)
+        rows = list(fast.select(queryset, extra=['created_at']))
+        data = fast.to_representation(rows)
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        self.plan = _compile(serializer_class, None if fields is None else tuple(fields))
+        self.columns = tuple(column for _, column, _, _ in self.plan)
+
+    def select(self, queryset, extra=()):
+        """
+        출력 컬럼 + extra 컬럼(커서, 사이드로딩 FK 등)을 named values_list로 읽는 QuerySet.
+        행은 namedtuple이라 row.created_at 처럼 속성으로도 읽을 수 있습니다.
+        """
+        columns = dict.fromkeys(self.columns)
+        columns.update(dict.fromkeys(extra))
+        return queryset.values_list(*columns, named=True)
+
+    def to_representation(self, rows):
+        if not rows:
+            return []
+        # 행 -> 열로 뒤집어 컬럼마다 변환 함수를 한 번씩 적용한 뒤 다시 행으로 묶음
+        columns = list(zip(*rows))
+        converted = [
+            convert(columns[i], field) for i, (_, _, convert, field) in enumerate(self.plan)
+        ]
+        names = [name for name, _, _, _ in self.plan]
+        return [dict(zip(names, values)) for values in zip(*converted)]
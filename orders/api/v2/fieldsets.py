@@ -0,0 +1,52 @@
+"""
+V2 희소 필드셋 (?fields=id,status,version / ?fields[restaurants]=name)
+
+요청한 필드만 직렬화할 뿐 아니라 .only()로 SQL SELECT 컬럼도 함께 줄입니다.
+페이지네이션 커서(created_at, id), ETag(version), 사이드로딩 FK처럼 서버가 내부적으로 필요한 컬럼은
+응답에 없어도 항상 함께 읽어서, 지연 로딩(행마다 추가 쿼리)이 생기지 않게 합니다.
+"""
+import re
+
+from rest_framework.exceptions import ValidationError
+
+_TYPED_PARAM = re.compile(r'^fields\[(?P<key>[^\]]+)\]$')
+
+
+def _split(param, raw, serializer_class):
+    names = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    allowed = serializer_class.Meta.fields
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValidationError({param: f"Unknown field: {', '.join(unknown)}. Available: {', '.join(allowed)}."})
+    return names
+
+
+def parse_fields(request, serializer_class, param='fields'):
+    """?fields= 값을 검증하여 필드 이름 목록으로 반환 (없으면 None = 전체 필드)"""
+    raw = request.query_params.get(param)
+    if raw is None:
+        return None
+    return _split(param, raw, serializer_class)
+
+
+def parse_typed_fields(request, side_loads):
+    """?fields[<included 키>]= 값들을 {included 키: 필드 목록}으로 반환"""
+    by_key = {side_load.key: side_load for side_load in side_loads}
+    result = {}
+    for param, raw in request.query_params.items():
+        match = _TYPED_PARAM.match(param)
+        if not match:
+            continue
+        key = match.group('key')
+        if key not in by_key:
+            raise ValidationError({param: f"'{key}' is not included. Use ?include= first."})
+        result[key] = _split(param, raw, by_key[key].serializer_class)
+    return result
+
+
+def only(queryset, fields, required=()):
+    """요청 필드 + 내부적으로 필요한 필드만 SELECT"""
+    if fields is None:
+        return queryset
+    names = ['id', *fields, *required]
+    return queryset.only(*dict.fromkeys(names))
@@ -0,0 +1,32 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from orders.models import Order
+
+
+class OrderFilterBackend(BaseFilterBackend):
+    """
+    ?status=<상태>&restaurant=<id>&rider=<id>
+    각 조합은 (필터 컬럼, created_at, id) 복합 인덱스를 타도록 Order.Meta.indexes에 정의되어 있습니다.
+    """
+    integer_params = ('restaurant', 'rider')
+
+    def filter_queryset(self, request, queryset, view):
+        if view.action != 'list':
+            return queryset
+
+        params = request.query_params
+        status_value = params.get('status')
+        if status_value:
+            if status_value not in Order.Status.values:
+                raise ValidationError({'status': f"Unknown status '{status_value}'."})
+            queryset = queryset.filter(status=status_value)
+
+        for name in self.integer_params:
+            value = params.get(name)
+            if value:
+                try:
+                    queryset = queryset.filter(**{f'{name}_id': int(value)})
+                except ValueError:
+                    raise ValidationError({name: 'Must be an integer id.'})
+        return queryset
@@ -0,0 +1,87 @@
+"""
+V2 사이드로딩(?include=) 레지스트리
+
+페이지에 있는 주문들의 FK id를 중복 없이 모은 뒤, 포함할 타입마다 한 번의 IN 쿼리로 가져와
+각 Serializer로 직렬화합니다. 쿼리 수는 페이지 크기와 무관하게 "1 + 포함 타입 수"로 고정됩니다.
+새 관계(예: 메뉴)는 SideLoad를 만들어 register()로 등록하면 됩니다.
+"""
+from rest_framework.exceptions import ValidationError
+
+from orders.models import Restaurant, Rider
+from orders.api.v2.serializers import RestaurantSerializer, RiderSerializer
+
+
+class SideLoad:
+    def __init__(self, name, key, fk_field, model, serializer_class):
+        self.name = name  # ?include= 값
+        self.key = key  # 응답의 included 안 키
+        self.fk_field = fk_field  # 주문의 FK 필드 (restaurant 등) -> 희소 필드셋에서도 항상 SELECT
+        self.fk_attname = f'{fk_field}_id'  # 주문 행에서 id를 읽을 속성
+        self.model = model
+        self.serializer_class = serializer_class
+
+    def collect_ids(self, rows):
+        # 페이지 내 등장 순서를 유지하면서 중복 제거
+        ids = {}
+        for row in rows:
+            value = row[self.fk_attname] if isinstance(row, dict) else getattr(row, self.fk_attname)
+            if value is not None:
+                ids.setdefault(value, None)
+        return list(ids)
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def load(self, rows, fields=None):
+        ids = self.collect_ids(rows)
+        if not ids:
+            return []  # 빈 페이지면 쿼리 없음
+        return self.serialize(ids, self.get_queryset_for(fields).in_bulk(ids), fields)
+
+    async def aload(self, rows, fields=None):
+        ids = self.collect_ids(rows)
+        if not ids:
+            return []
+        return self.serialize(ids, await self.get_queryset_for(fields).ain_bulk(ids), fields)
+
+    def get_queryset_for(self, fields):
+        queryset = self.get_queryset()
+        if fields is not None:
+            queryset = queryset.only('pk', *fields)
+        return queryset
+
+    def serialize(self, ids, objects, fields):
+        instances = [objects[pk] for pk in ids if pk in objects]
+        return self.serializer_class(instances, many=True, fields=fields).data
+
+
+REGISTRY = {}
+
+
+def register(side_load):
+    REGISTRY[side_load.name] = side_load
+    return side_load
+
+
+register(SideLoad('restaurant', 'restaurants', 'restaurant', Restaurant, RestaurantSerializer))
+register(SideLoad('rider', 'riders', 'rider', Rider, RiderSerializer))
+
+
+def parse_include(request):
+    """?include=restaurant,rider -> [SideLoad, ...] (알 수 없는 값이면 400)"""
+    names = [name.strip() for name in request.query_params.get('include', '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in REGISTRY]
+    if unknown:
+        raise ValidationError({'include': f"Unknown include: {', '.join(unknown)}. "
+                                          f"Available: {', '.join(REGISTRY)}."})
+    return [REGISTRY[name] for name in dict.fromkeys(names)]
+
+
+def side_load(rows, includes, fields_by_key=None):
+    fields_by_key = fields_by_key or {}
+    return {include.key: include.load(rows, fields_by_key.get(include.key)) for include in includes}
+
+
+async def aside_load(rows, includes, fields_by_key=None):
+    fields_by_key = fields_by_key or {}
+    return {include.key: await include.aload(rows, fields_by_key.get(include.key)) for include in includes}
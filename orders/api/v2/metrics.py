@@ -0,0 +1,29 @@
+"""
+V2 운영 지표 (관리자 전용)
+
+GET /api/v2/metrics/
+    -> {"pid": 1234,
+        "order_cache": {"hits": 10, "misses": 2, "hit_ratio": 0.83},
+        "latency": {"payment": {"count": 3, "total": 1.5, "max": 0.7}}}
+
+값은 요청을 처리한 워커 프로세스 하나의 누적치입니다 (워커별로 모으려면 pid로 구분).
+"""
+import os
+
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from orders.cache import get_cache
+from orders.latency import get_injector
+
+
+class MetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "pid": os.getpid(),
+            "order_cache": get_cache().stats(),
+            "latency": get_injector().stats(),  # 주입한 지연(초), orders/latency.py
+        })
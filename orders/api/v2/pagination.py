@@ -0,0 +1,127 @@
+"""
+V2 주문 목록용 키셋(커서) 페이지네이션
+
+OFFSET 대신 마지막으로 본 (created_at, id) 이후의 행만 읽습니다.
+(created_at, id) 복합 인덱스를 따라 바로 시작 위치로 이동하므로,
+몇 번째 페이지든 조회 비용이 페이지 크기에만 비례합니다. COUNT(*) 쿼리도 없습니다.
+"""
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class OrderKeysetPagination(BasePagination):
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    # 최신 주문부터 (created_at DESC, id DESC)
+    ordering = ('-created_at', '-id')
+    # 커서를 만들기 위해 항상 읽어야 하는 컬럼
+    cursor_fields = ('created_at', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_rows(list(self.window_queryset(queryset, request)))
+
+    def window_queryset(self, queryset, request):
+        """현재 커서 기준으로 page_size + 1 행을 읽는 QuerySet (평가하지 않음, 조건부 GET에서도 사용)"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        self.position, self.reverse = position, reverse
+
+        if position is None:
+            qs = queryset.order_by(*self.ordering)
+        else:
+            created_at, pk = position
+            if reverse:
+                # 이전 페이지: 기준점보다 "앞"(더 최신) 행을 오름차순으로 읽은 뒤 뒤집음
+                keyset = Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+                qs = queryset.filter(keyset).order_by('created_at', 'id')
+            else:
+                keyset = Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+                qs = queryset.filter(keyset).order_by(*self.ordering)
+
+        # 한 행을 더 읽어서 다음 페이지 존재 여부 판단 (COUNT 불필요)
+        return qs[:self.page_size + 1]
+
+    def paginate_rows(self, rows):
+        """window_queryset()으로 읽은 행 -> 현재 페이지 행 (다음/이전 링크 상태도 함께 계산)"""
+        position, reverse = self.position, self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # ------------------------------------------------------------------
+    # 커서 인코딩 (클라이언트에게는 불투명한 토큰)
+    # ------------------------------------------------------------------
+    def encode_cursor(self, row, reverse=False):
+        payload = [row_value(row, 'created_at').isoformat(), row_value(row, 'id')]
+        if reverse:
+            payload.append(1)
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        token = base64.urlsafe_b64encode(raw).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(raw)
+            created_at = parse_datetime(payload[0])
+            pk = int(payload[1])
+            reverse = len(payload) > 2 and bool(payload[2])
+        except (binascii.Error, ValueError, TypeError, IndexError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (created_at, pk), reverse
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+
+def row_value(row, name):
+    # 모델 인스턴스와 values() dict 모두 지원
+    return row[name] if isinstance(row, dict) else getattr(row, name)
@@ -0,0 +1,50 @@
+"""
+V2 라이더 위치 수집
+
+POST /api/v2/riders/locations/
+    {"pings": [{"rider_id": 1, "latitude": 37.56, "longitude": 126.97, "at": "2026-10-18T12:00:00+09:00"}, ...]}
+    -> 202 {"accepted": n}
+GET  /api/v2/riders/locations/?ids=1,2,3
+    -> {"results": [{"rider_id": 1, "latitude": ..., "longitude": ..., "at": ...}, ...]}
+
+여러 라이더의 핑을 한 요청으로 받아 메모리 버퍼에 병합하고, DB에는 주기적으로 한 문장씩 씁니다 (orders/locations.py).
+조회는 버퍼의 최신 위치 맵을 먼저 보므로 아직 플러시되지 않은 위치도 보입니다.
+없는 라이더 id의 핑은 플러시에서 조용히 무시됩니다 (핑마다 존재 확인 쿼리를 하지 않음).
+"""
+from django.db.models import BigIntegerField
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from orders.api.v2.serializers import RiderLocationBatchSerializer, RiderLocationPingSerializer
+from orders.locations import LocationPing, get_location_buffer
+
+
+class RiderLocationsView(APIView):
+    MAX_IDS = 500
+
+    def post(self, request):
+        serializer = RiderLocationBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        now = timezone.now()
+        pings = [
+            LocationPing(item['rider_id'], item['latitude'], item['longitude'], item.get('at') or now)
+            for item in serializer.validated_data['pings']
+        ]
+        accepted = get_location_buffer().add(pings)
+        return Response({"accepted": accepted}, status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request):
+        try:
+            ids = [int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        except ValueError:
+            raise ValidationError({'ids': 'Must be a comma separated list of integer ids.'})
+        if not ids or len(ids) > self.MAX_IDS:
+            raise ValidationError({'ids': f'Between 1 and {self.MAX_IDS} ids are required.'})
+        if not all(0 < pk <= BigIntegerField.MAX_BIGINT for pk in ids):
+            raise ValidationError({'ids': 'Ids must be positive 64-bit integers.'})
+        positions = get_location_buffer().positions(ids)
+        data = [RiderLocationPingSerializer(positions[pk]).data for pk in ids if pk in positions]
+        return Response({"results": data})
@@ -1,17 +1,31 @@
+from django.db.models import BigIntegerField
 from rest_framework import serializers
-from orders.models import Order, Restaurant, Rider
+from orders.history import action_for
+from orders.models import Order, OrderStatusTransition, Restaurant, Rider
+from orders.state_machine import TRANSITIONS
 
-class RestaurantSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    fields=[...] 인자로 출력 필드를 줄일 수 있는 Serializer (?fields= 희소 필드셋 용)
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class RestaurantSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Restaurant
         fields = ['id', 'name', 'address']
 
-class RiderSerializer(serializers.ModelSerializer):
+class RiderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Rider
         fields = ['id', 'name']
 
-class OrderV2Serializer(serializers.ModelSerializer):
+class OrderV2Serializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ['id', 'restaurant_name', 'status', 'created_at', 'version', 'restaurant', 'rider']
@@ -39,3 +53,43 @@ class OrderPickupSerializer(serializers.Serializer):
 
 class OrderDeliverySerializer(serializers.Serializer):
     pass
+
+class BatchTransitionItemSerializer(serializers.Serializer):
+    order_id = serializers.IntegerField(min_value=1)
+    action = serializers.ChoiceField(choices=[name for name, t in TRANSITIONS.items() if t.batchable])
+    if_match = serializers.CharField(max_length=200)
+
+class BatchTransitionSerializer(serializers.Serializer):
+    MAX_ITEMS = 500
+
+    transitions = BatchTransitionItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+    def validate_transitions(self, value):
+        order_ids = [item['order_id'] for item in value]
+        if len(order_ids) != len(set(order_ids)):
+            raise serializers.ValidationError("Each order_id may appear only once per batch.")
+        return value
+
+class RiderLocationPingSerializer(serializers.Serializer):
+    rider_id = serializers.IntegerField(min_value=1, max_value=BigIntegerField.MAX_BIGINT)  # BigAutoField 범위
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    at = serializers.DateTimeField(required=False)  # 앱에서 측정한 시각. 없거나 미래면 받은 시각
+
+class RiderLocationBatchSerializer(serializers.Serializer):
+    MAX_ITEMS = 1000
+
+    pings = RiderLocationPingSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+class OrderStatusTransitionSerializer(serializers.ModelSerializer):
+    # 이력 행의 smallint 코드 -> 상태 문자열, (출발, 도착) 쌍 -> 행위
+    action = serializers.SerializerMethodField()
+    from_status = serializers.CharField(read_only=True)
+    to_status = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = OrderStatusTransition
+        fields = ['version', 'action', 'from_status', 'to_status', 'created_at']
+
+    def get_action(self, obj):
+        return action_for(obj.from_status, obj.to_status)
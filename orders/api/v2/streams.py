@@ -0,0 +1,179 @@
+"""
+V2 주문 상태 스트림 (Server-Sent Events, ASGI 전용)
+
+GET /api/v2/orders/{id}/events/
+    id: <version>
+    event: status
+    data: {"id": 1, "status": "preparing", "version": 3, "etag": "\\"...\\""}
+
+- 연결 직후 현재 상태를 한 번 보내고, 이후 행위가 커밋될 때마다 이벤트를 보냅니다.
+- 재접속 시 Last-Event-ID(= 마지막으로 받은 version) 이후 이벤트를 이어서 보냅니다.
+- 이벤트가 없으면 heartbeat 주석(": keep-alive")을 보내 프록시가 유휴 연결을 끊지 않게 합니다.
+폴링 대신 사용하며, 연결마다 스레드를 점유하지 않도록 ASGI(quickeats/asgi.py의 EventStreamApplication)로 서비스합니다.
+"""
+import asyncio
+import json
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from orders.events import LAGGED, StatusEvent, get_hub
+from orders.models import Order
+from orders.api.v2.views import OrderV2ViewSet
+
+
+# 연결이 끊기면(LAGGED 포함) EventSource가 재접속까지 기다리는 시간
+RECONNECT_MS = 1000
+
+STREAM_HEADERS = (
+    ('Cache-Control', 'no-cache'),
+    ('X-Accel-Buffering', 'no'),  # nginx 버퍼링 끔
+)
+
+
+def format_event(event):
+    data = json.dumps(event.as_dict(), separators=(',', ':'), ensure_ascii=False)
+    return f"id: {event.version}\nevent: status\ndata: {data}\n\n"
+
+
+def parse_last_event_id(headers):
+    try:
+        return int(headers.get('Last-Event-ID', '') or headers.get('last-event-id', ''))
+    except ValueError:
+        return None
+
+
+async def stream_events(hub, subscription, current, last_version, heartbeat):
+    try:
+        sent = last_version or 0
+        # 놓친 이벤트 -> 없거나 이어지지 않으면 현재 상태
+        backlog = hub.replay(current.id, last_version) if last_version is not None else None
+        backlog = backlog or []
+        if current.version > sent and (not backlog or backlog[-1].version < current.version):
+            backlog.append(current)
+
+        yield f"retry: {RECONNECT_MS}\n\n"
+        for event in backlog:
+            if event.version > sent:
+                yield format_event(event)
+                sent = event.version
+
+        while True:
+            event = await subscription.get(heartbeat)
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            if event is LAGGED:
+                return  # 큐가 넘친 느린 구독자 -> 연결 종료, 클라이언트가 Last-Event-ID로 재접속
+            if event.version > sent:
+                yield format_event(event)
+                sent = event.version
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def load_order(pk):
+    return Order.objects.filter(pk=pk).only('id', 'status', 'version').first()
+
+
+async def open_stream(pk, load):
+    """
+    구독 후 현재 상태를 읽어 (subscription, 현재 상태 이벤트)를 반환. 주문이 없으면 None.
+    DB 조회 전에 먼저 구독 -> 조회와 구독 사이에 커밋된 이벤트도 큐에 들어옴 (중복은 version으로 거름)
+    """
+    hub = get_hub()
+    subscription = hub.subscribe(pk)
+    try:
+        order = await load(pk)
+    except BaseException:
+        hub.unsubscribe(subscription)
+        raise
+    if order is None:
+        hub.unsubscribe(subscription)
+        return None
+    return subscription, StatusEvent.for_order(order, OrderV2ViewSet.etag_strategy)
+
+
+def heartbeat_interval():
+    return getattr(settings, 'ORDER_EVENTS_HEARTBEAT', 15.0)
+
+
+@require_GET
+async def order_events(request, pk):
+    # Django 뷰 (runserver/테스트용). ASGI 운영 경로는 아래 EventStreamApplication이 먼저 처리합니다.
+    opened = await open_stream(pk, lambda pk: Order.objects.filter(pk=pk).only('id', 'status', 'version').afirst())
+    if opened is None:
+        raise Http404
+    subscription, current = opened
+    response = StreamingHttpResponse(
+        stream_events(get_hub(), subscription, current, parse_last_event_id(request.headers), heartbeat_interval()),
+        content_type='text/event-stream',
+    )
+    for name, value in STREAM_HEADERS:
+        response[name] = value
+    return response
+
+
+class EventStreamApplication:
+    """
+    quickeats/asgi.py에서 Django 앞에 두는 SSE 전용 ASGI 앱.
+
+    Django ASGI 핸들러를 거치면 스트림이 열려 있는 동안 요청마다 동기 실행용 스레드와 DB 연결이 하나씩 묶입니다.
+    (유휴 구독자 1만 개 = 스레드/DB 연결 1만 개) 이 앱은 현재 상태 조회만 공용 스레드 풀에서 하고,
+    이후에는 구독자마다 asyncio 태스크와 제한된 큐만 사용합니다. 다른 경로는 그대로 Django로 넘깁니다.
+    """
+
+    route = re.compile(r'^/api/v2/orders/(?P<pk>[0-9]+)/events/$')
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        match = self.route.match(scope.get('path', '')) if scope['type'] == 'http' else None
+        if match is None:
+            return await self.application(scope, receive, send)
+        if scope['method'] != 'GET':
+            return await self.respond(send, 405, b'{"detail":"Method not allowed."}')
+
+        opened = await open_stream(int(match['pk']), sync_to_async(load_order, thread_sensitive=False))
+        if opened is None:
+            return await self.respond(send, 404, b'{"detail":"Not found."}')
+        subscription, current = opened
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        events = stream_events(get_hub(), subscription, current, parse_last_event_id(headers), heartbeat_interval())
+
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/event-stream; charset=utf-8')]
+                       + [(name.lower().encode(), value.encode()) for name, value in STREAM_HEADERS],
+        })
+        streaming = asyncio.ensure_future(self.pump(events, send))
+        disconnect = asyncio.ensure_future(self.wait_disconnect(receive))
+        try:
+            await asyncio.wait([streaming, disconnect], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (streaming, disconnect):
+                task.cancel()
+            await asyncio.gather(streaming, disconnect, return_exceptions=True)
+            await events.aclose()  # 구독 해제
+
+    @staticmethod
+    async def pump(events, send):
+        async for chunk in events:
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    @staticmethod
+    async def wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    async def respond(send, status, body):
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': body})
@@ -1,10 +1,32 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import use_async_views
+from .dashboards import RestaurantActiveOrdersViewSet, RiderActiveOrdersViewSet
+from .metrics import MetricsView
+from .riders import RiderLocationsView
+from .streams import order_events
 from .views import OrderV2ViewSet
 
 router = DefaultRouter()
 router.register(r'orders', OrderV2ViewSet, basename='order-v2')
 
-urlpatterns = [
-    path('', include(router.urls)),
-]
+
+def build_urlpatterns(async_views=False):
+    router_urls = router.urls
+    if async_views:
+        # 목록/상세/행위를 비동기 뷰로 처리 (ASGI 배포용, orders/api/v2/async_views.py)
+        router_urls = use_async_views(router_urls, 'order-v2')
+    return [
+        path('metrics/', MetricsView.as_view(), name='v2-metrics'),
+        path('orders/<int:pk>/events/', order_events, name='order-v2-events'),
+        path('restaurants/<int:owner_pk>/active-orders/', RestaurantActiveOrdersViewSet.as_view({'get': 'list'}),
+             name='restaurant-v2-active-orders'),
+        path('riders/locations/', RiderLocationsView.as_view(), name='rider-v2-locations'),
+        path('riders/<int:owner_pk>/active-orders/', RiderActiveOrdersViewSet.as_view({'get': 'list'}),
+             name='rider-v2-active-orders'),
+        path('', include(router_urls)),
+    ]
+
+
+urlpatterns = build_urlpatterns(getattr(settings, 'ORDER_V2_ASYNC_VIEWS', False))
@@ -1,5 +1,10 @@
-from rest_framework import viewsets, status
+import codecs
+import csv
+
+from django.conf import settings
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from orders.models import Order
 from orders.api.v2.serializers import (
@@ -10,12 +15,72 @@ from orders.api.v2.serializers import (
     OrderPickupSerializer,
     OrderDeliverySerializer,
     OrderRejectionSerializer,
-    OrderPreparationCompleteSerializer
+    OrderPreparationCompleteSerializer,
+    OrderStatusTransitionSerializer,
+    BatchTransitionSerializer
 )
-import time
-import hashlib
+from django.core.exceptions import ValidationError
+from django.db import DataError, transaction
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
+from orders.api.v2.filters import OrderFilterBackend
+from orders.archive import archived_or_404, is_archived
+from orders.api.v2.conditional import collection_etag, none_match, not_modified
+from orders.api.v2.fastpath import FastListSerializer
+from orders.api.v2.fieldsets import parse_fields, parse_typed_fields, only
+from orders.api.v2.includes import parse_include, side_load
+from orders.api.v2.pagination import OrderKeysetPagination, row_value
+from orders.cache import get_cache
 from orders.decorators import idempotent
+from orders.etags import get_strategy, parse_etags
+from orders.events import StatusEvent, get_hub
+from orders.history import order_history, state_as_of
+from orders.imports import OrderImporter, RowError, read_records
+from orders.latency import request_latency
+from orders.state_machine import TRANSITIONS
+from orders.transitions import transition_orders, NOT_FOUND, PRECONDITION_FAILED, INVALID_STATE
+
+#=========="전이 커밋 공용 경로 (V2 행위/일괄 행위, 관리자 액션 orders/admin.py)"==========
+def commit_transitions(items, strategy):
+    """
+    items: [(주문 id, If-Match 태그 목록, Transition), ...] 를 한 트랜잭션으로 커밋합니다.
+    조건부 UPDATE(+ 아웃박스/이력) -> during 훅 -> 캐시 write-through/SSE 발행을 커밋 후로 등록 -> (커밋 후) after 훅.
+    (결과 목록, {pk: 직렬화 결과}) 반환
+    """
+    with transaction.atomic():
+        results = transition_orders(items, strategy)
+        succeeded = [(t, result) for (_, _, t), result in zip(items, results) if result.ok]
+        for t, result in succeeded:
+            for hook in t.during:
+                hook(result.order)
+        snapshots = write_through(results, strategy)
+
+    for t, result in succeeded:
+        for hook in t.after:
+            hook(result.order)
+    return results, snapshots
+
+
+def write_through(results, strategy):
+    """
+    전이 트랜잭션 안에서 호출: 성공한 주문의 새 스냅샷 캐시 기록(write-through)과 상태 이벤트 발행을
+    커밋 후로 등록한 뒤, {pk: 직렬화 결과}를 돌려줍니다 (응답에서 재사용). 롤백되면 캐시는 그대로입니다.
+    """
+    snapshots = [(r.order.pk, r.order.version, OrderV2Serializer(r.order).data) for r in results if r.ok]
+    get_cache().write_on_commit(snapshots)
+    publish([r.order for r in results if r.ok], strategy)
+    return {pk: data for pk, _, data in snapshots}
+
+
+def publish(orders, strategy):
+    # 커밋 후 SSE 구독자에게 상태 이벤트 발행 (orders/events.py, orders/api/v2/streams.py)
+    events = [StatusEvent.for_order(order, strategy) for order in orders]
+    if events:
+        hub = get_hub()
+        transaction.on_commit(lambda: [hub.publish(event) for event in events])
+
 
 class OrderV2ViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -23,263 +88,400 @@ class OrderV2ViewSet(viewsets.ReadOnlyModelViewSet):
     """
     queryset = Order.objects.all()
     serializer_class = OrderV2Serializer
+    pagination_class = OrderKeysetPagination
+    filter_backends = [OrderFilterBackend]
+    # ETag 생성/비교 전략 (orders/etags.py, settings.ORDER_ETAG_STRATEGY)
+    etag_strategy = get_strategy()
+    # 목록은 values_list + 컬럼 단위 변환기로 직렬화 (orders/api/v2/fastpath.py). False면 DRF Serializer 경로
+    fast_list = True
+    # 대량 생성(bulk): JSON 본문 최대 건수 / 스트리밍으로 받는 본문 형식
+    bulk_max_items = 1000
+    bulk_stream_formats = {'text/csv': 'csv', 'application/x-ndjson': 'jsonl', 'application/jsonl': 'jsonl'}
 
 #=========="기본 조회 함수(CRUD) def list / def retrieve"
 
+    def get_sparse_fields(self):
+        # ?fields= (요청당 1회 파싱). None이면 전체 필드
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = parse_fields(self.request, OrderV2Serializer)
+        return self._sparse_fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve' and not get_cache().enabled:
+            # ETag 계산용 version은 응답에 없어도 항상 SELECT
+            # (스냅샷 캐시를 쓰면 캐시에 전체 표현을 채워야 하므로 전체 컬럼을 읽음)
+            queryset = only(queryset, self.get_sparse_fields(), required=['version'])
+        return queryset
+
+    def sparse(self, data):
+        # 캐시된 전체 표현 -> ?fields= 로 요청한 필드만 (Serializer와 같은 순서)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return data
+        return {name: value for name, value in data.items() if name in fields}
+
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        # ?include=restaurant,rider 처리
-        include_params = request.query_params.get('include', '').split(',')
-        include_params = [param.strip() for param in include_params if param]
-        
-        # N+1 문제 해결을 위해 select_related 사용
-        if 'restaurant' in include_params and 'rider' in include_params:
-            queryset = queryset.select_related('restaurant', 'rider')
-        elif 'restaurant' in include_params:
-            queryset = queryset.select_related('restaurant')
-        elif 'rider' in include_params:
-            queryset = queryset.select_related('rider')
+        queryset, includes, fields, include_fields = self.prepare_list(request)
 
+        # 조건부 GET: 페이지 창의 (id, version)만 읽어 컬렉션 ETag 비교 -> 같으면 직렬화 없이 304
+        # included 리소스(식당/라이더)는 버전이 없어 변경을 감지할 수 없으므로 include가 없는 목록만 대상
+        if not includes and request.headers.get('If-None-Match'):
+            window = self.paginator.window_queryset(queryset, request).values_list('id', 'version')
+            response = self.list_not_modified(request, list(window))
+            if response is not None:
+                return response
+
+        queryset, fast = self.select_list(queryset, includes, fields)
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            data = serializer.data
+        rows = page if page is not None else list(queryset)
+        included = side_load(rows, includes, include_fields) if includes else None
+        return self.list_response(request, rows, fast, fields, included, paginated=page is not None)
+
+    # list()의 단계별 헬퍼. DB 조회는 호출하는 쪽에서 하므로 비동기 뷰(orders/api/v2/async_views.py)도 그대로 사용합니다.
+    def prepare_list(self, request):
+        """목록 요청 해석 -> (필터를 적용한 queryset, includes, fields, include_fields)"""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # ?include=restaurant,rider 처리 (orders/api/v2/includes.py 레지스트리)
+        # JOIN으로 넓은 행을 반복해서 읽는 대신, 페이지의 FK id만 모아 타입별로 IN 쿼리 1회
+        includes = parse_include(request)
+
+        # ?fields= / ?fields[restaurants]= 희소 필드셋 -> SELECT 컬럼도 함께 축소
+        fields = self.get_sparse_fields()
+        include_fields = parse_typed_fields(request, includes)
+        return queryset, includes, fields, include_fields
+
+    def list_not_modified(self, request, window_rows):
+        """페이지 창의 (id, version) 행으로 컬렉션 ETag 비교 -> 같으면 304 응답, 다르면 None"""
+        keys = self.paginator.paginate_rows(window_rows)
+        etag = collection_etag(request, keys, self.paginator.has_next, self.paginator.has_previous)
+        if none_match(request, etag):
+            return not_modified(f'"{etag}"')
+        return None
+
+    def select_list(self, queryset, includes, fields):
+        """직렬화 경로에 맞게 SELECT 컬럼 축소 -> (queryset, 고속 직렬화기 또는 None)"""
+        # version은 컬렉션 ETag 계산용
+        if self.fast_list:
+            fast = FastListSerializer(self.get_serializer_class(), fields)
+            required = [*self.paginator.cursor_fields, 'version', *(include.fk_attname for include in includes)]
+            return fast.select(queryset, required), fast
+        required = [*self.paginator.cursor_fields, 'version', *(include.fk_field for include in includes)]
+        return only(queryset, fields, required), None
+
+    def list_response(self, request, rows, fast, fields, included=None, paginated=True):
+        if fast is not None:
+            data = fast.to_representation(rows)
         else:
-            serializer = self.get_serializer(queryset, many=True)
-            data = serializer.data
+            data = self.get_serializer(rows, many=True, fields=fields).data
 
-        # 기본 응답 구조
-        response_data = {
-            "results": data
-        }
+        # 기본 응답 구조 (next / previous 커서 링크 포함)
+        if paginated:
+            response_data = self.paginator.get_paginated_response_data(data)
+        else:
+            response_data = {
+                "results": data
+            }
 
         # Side-loading Data 추가
-        if include_params:
-            included = {}
-            if 'restaurant' in include_params:
-                # 중복 제거하여 Restaurant 목록 추출
-                restaurant_ids = set()
-                restaurants = []
-                for order in (page if page else queryset):
-                     if order.restaurant and order.restaurant.id not in restaurant_ids:
-                         restaurant_ids.add(order.restaurant.id)
-                         restaurants.append({
-                             "id": order.restaurant.id,
-                             "name": order.restaurant.name,
-                             "address": order.restaurant.address
-                         })
-                included['restaurants'] = restaurants
-
-            if 'rider' in include_params:
-                rider_ids = set()
-                riders = []
-                for order in (page if page else queryset):
-                     if order.rider and order.rider.id not in rider_ids:
-                         rider_ids.add(order.rider.id)
-                         riders.append({
-                             "id": order.rider.id,
-                             "name": order.rider.name
-                         })
-                included['riders'] = riders
-            
+        if included is not None:
             response_data['included'] = included
-            
-        return Response(response_data)
+
+        response = Response(response_data)
+        if included is None and paginated:
+            keys = [(row_value(row, 'id'), row_value(row, 'version')) for row in rows]
+            etag = collection_etag(request, keys, self.paginator.has_next, self.paginator.has_previous)
+            response['ETag'] = f'"{etag}"'
+        return response
 
     def retrieve(self, request, *args, **kwargs):
         # 상세 조회에서도 동일하게 지원 가능여부는 선택사항. 여기선 리스트 위주로 구현.
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        response = Response(serializer.data)
-        response['ETag'] = f'"{self.get_etag(instance)}"'
+        cache = get_cache()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+
+        # 스냅샷 캐시(order:{id}) 적중 시 DB 조회 없음 (orders/cache.py)
+        snapshot = cache.get(self.kwargs[lookup_url_kwarg])
+        if snapshot is not None:
+            return self.snapshot_response(request, *snapshot)
+
+        if request.headers.get('If-None-Match'):
+            # 조건부 GET: (id, version)만 읽어 ETag 비교 -> 같으면 주문 전체를 읽지 않고 304
+            try:
+                current = get_object_or_404(
+                    self.get_queryset().values_list('id', 'version', named=True),
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                )
+            except Http404:
+                current = archived_or_404(self.kwargs[lookup_url_kwarg])
+            response = self.detail_not_modified(request, current)
+            if response is not None:
+                return response
+
+        try:
+            instance = self.get_object()
+        except Http404:
+            # 보관된(archive) 종료 주문이면 같은 표현으로 응답 (orders/archive.py)
+            instance = archived_or_404(self.kwargs[lookup_url_kwarg])
+        data = None
+        if cache.enabled:
+            data = self.get_serializer(instance).data
+            cache.fill(instance.pk, instance.version, data)
+        return self.detail_response(instance, data)
+
+    # retrieve()의 단계별 헬퍼 (비동기 뷰와 공유)
+    def snapshot_response(self, request, version, data):
+        etag = self.etag_strategy.make(data['id'], version)
+        if none_match(request, etag):
+            return not_modified(self.etag_strategy.format(etag))
+        response = Response(self.sparse(data))
+        response['ETag'] = self.etag_strategy.format(etag)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def detail_not_modified(self, request, current):
+        etag = self.get_etag(current)
+        if none_match(request, etag):
+            return not_modified(self.etag_strategy.format(etag))
+        return None
+
+    def detail_response(self, instance, data=None):
+        # data: 스냅샷 캐시에 채운 전체 표현. 캐시를 쓰지 않으면 None -> 희소 필드셋으로 직렬화
+        if data is not None:
+            response = Response(self.sparse(data))
+            response['X-Cache'] = 'MISS'
+        else:
+            response = Response(self.get_serializer(instance, fields=self.get_sparse_fields()).data)
+        response['ETag'] = self.get_etag_header(instance)
         return response
 
-#=========="헬퍼 함수 def get_etag / def check_etag"========================
+    @action(detail=True, methods=['get'], url_path='history')
+    def history(self, request, pk=None):
+        """
+        주문 상태 변경 이력 (orders/history.py).
+        ?as_of=<ISO 8601 시각> 이면 그 시각의 상태 {"status", "version", "since"} 를 돌려줍니다.
+        """
+        try:
+            pk = Order._meta.pk.to_python(pk)
+        except ValidationError:
+            raise Http404
+
+        as_of = request.query_params.get('as_of')
+        if as_of is not None:
+            try:
+                when = parse_datetime(as_of)
+            except ValueError:  # 형식은 맞지만 범위를 벗어난 값 (13월 등)
+                when = None
+            if when is None:
+                return Response({"error": "as_of must be an ISO 8601 datetime"}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(when):
+                when = timezone.make_aware(when)
+            state = state_as_of(pk, when)
+            if state is None:
+                raise Http404
+            return Response({
+                "id": pk, "as_of": when, "status": state.status, "version": state.version, "since": state.since,
+            })
+
+        history = order_history(pk)
+        if not history and not Order.objects.filter(pk=pk).exists() and not is_archived(pk):
+            raise Http404
+        return Response({"id": pk, "history": OrderStatusTransitionSerializer(history, many=True).data})
+
+#=========="헬퍼 함수 def get_etag / def precondition_failed"========================
 
     def get_etag(self, order):
-        # ETag 생성 로직: "order-{id}-v{version}"의 해시
-        raw_data = f"order-{order.id}-v{order.version}"
-        return hashlib.md5(raw_data.encode()).hexdigest()
-    
-    def check_etag(self, request, order):
+        # ETag 값 (따옴표 없음). 생성 방식은 etag_strategy (orders/etags.py, 기본 "order-{id}-v{version}"의 MD5)
+        return self.etag_strategy.for_order(order)
+
+    def get_etag_header(self, order):
+        return self.etag_strategy.format(self.get_etag(order))
+
+    def precondition_failed(self, order):
+        """412 응답. 현재 주문 표현(order)과 ETag 헤더를 포함"""
+        response = Response(
+            {
+                "error": "Precondition Failed",
+                "message": "The resource has been modified by another request.",
+                "current_version": order.version,
+                "order": OrderV2Serializer(order).data,
+            },
+            status=status.HTTP_412_PRECONDITION_FAILED
+        )
+        response['ETag'] = self.get_etag_header(order)
+        return response
+
+    def perform_transition(self, request, transition):
+        """
+        ETag 검사 + 상태 검사 + 버전 증가를 조건부 UPDATE 한 번으로 처리합니다.
+        (get_object() 후 save() 하던 2회 쿼리 + Lost Update 구간 제거)
+        """
         if_match = request.headers.get('If-Match')
         if not if_match:
-            # If-Match 헤더가 없으면 412가 아니라 428 Precondition Required를 줄 수도 있지만,
-            # 여기서는 편의상 진행하거나 400을 줍니다. 과제 요구사항에 따라 필수로 합니다.
-            # 하지만 테스트 편의를 위해 일단 없으면 패스하는 경우도 있지만,
-            # 낙관적 락 강제를 위해 필수로 하겠습니다.
-            return False, Response(
-                {"error": "If-Match header is required"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # If-Match 헤더의 따옴표 제거
-        if_match = if_match.strip('"')
-        current_etag = self.get_etag(order)
-        
-        if if_match != current_etag:
-            return False, Response(
-                {
-                    "error": "Precondition Failed", 
-                    "message": "The resource has been modified by another request.",
-                    "current_version": order.version
-                },
-                status=status.HTTP_412_PRECONDITION_FAILED
-            )
-        return True, None
-
-    def perform_action_with_locking(self, request, action_func):
-        order = self.get_object()
-        
-        # Optimistic Locking Check
-        is_valid, error_response = self.check_etag(request, order)
-        if not is_valid:
-            return error_response
-            
-        response = action_func(request, order)
-        
-        # 상태가 변경되었다면 버전 증가 및 저장 (action_func 내부에서 save() 하지 말고 여기서 처리)
-        # 하지만 action_func 내부 로직이 복잡할 수 있으니, 
-        # action_func에서 business logic만 수행하고 여기서 save하는 패턴으로 리팩토링합니다.
-        # 또는 action_func에서 save() 하고 버전을 증가시킵니다.
-        
-        return response
+            return self.if_match_required()
 
-#==========="행위 메서드 - 상태 변경 로직 ======================"
-    @idempotent
-    @action(detail=True, methods=['post'], url_path='payment')
-    def payment(self, request, pk=None):
-        order = self.get_object()
-        
-        # ETag Check
-        is_valid, error_response = self.check_etag(request, order)
-        if not is_valid: return error_response
-
-        if order.status != Order.Status.PENDING_PAYMENT:
-            return Response({"error": "Invalid state"}, status=status.HTTP_400_BAD_REQUEST)
-            
-        order.status = Order.Status.PENDING_ACCEPTANCE
-        # 버전 증가
-        order.version += 1
-        time.sleep(0.5)
-        order.save()
-        
-        response = Response(OrderV2Serializer(order).data)
-        response['ETag'] = f'"{self.get_etag(order)}"'
-        return response
+        pk = self.get_transition_pk()
+        with request_latency(request):  # 외부 연동 훅은 트랜잭션 밖에서 실행
+            for hook in transition.before:
+                hook(pk)
 
-    @action(detail=True, methods=['post'], url_path='cancellation')
-    def cancellation(self, request, pk=None):
-        order = self.get_object()
-        
-        # ETag Check
-        is_valid, error_response = self.check_etag(request, order)
-        if not is_valid: return error_response
-
-        allowed_statuses = [Order.Status.PENDING_PAYMENT, Order.Status.PENDING_ACCEPTANCE]
-        if order.status not in allowed_statuses:
-             return Response({"error": "Cannot cancel"}, status=status.HTTP_400_BAD_REQUEST)
-
-        order.status = Order.Status.CANCELLED
-        order.version += 1
-        order.save()
-        
-        response = Response(OrderV2Serializer(order).data)
-        response['ETag'] = f'"{self.get_etag(order)}"'
-        return response
+        result, snapshots = self.commit_transition(pk, parse_etags(if_match), transition)
+        if transition.two_phase and result.ok:
+            # 예약 상태로 커밋한 뒤(잠금 해제) 외부 연동 -> 확정/취소
+            with request_latency(request):
+                outcome = transition.external(pk, request.data)
+            final, result, snapshots = self.finish_two_phase(transition, result.order, outcome)
+            return self.two_phase_response(final, outcome, result, snapshots)
+        return self.transition_response(transition, result, snapshots)
 
-    @action(detail=True, methods=['post'], url_path='acceptance')
-    def acceptance(self, request, pk=None):
-        order = self.get_object()
-        
-        # ETag Check
-        is_valid, error_response = self.check_etag(request, order)
-        if not is_valid: return error_response
-        
-        if order.status != Order.Status.PENDING_ACCEPTANCE:
-             return Response({"error": "Invalid state"}, status=status.HTTP_400_BAD_REQUEST)
-            
-        order.status = Order.Status.PREPARING
-        order.version += 1
-        order.save()
-        
-        response = Response(OrderV2Serializer(order).data)
-        response['ETag'] = f'"{self.get_etag(order)}"'
-        return response
+    # perform_transition()의 단계별 헬퍼 (비동기 뷰와 공유)
+    def if_match_required(self):
+        return Response(
+            {"error": "If-Match header is required"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    @action(detail=True, methods=['post'], url_path='rejection')
-    def rejection(self, request, pk=None):
-        order = self.get_object()
-        
-        # ETag Check
-        is_valid, error_response = self.check_etag(request, order)
-        if not is_valid: return error_response
-
-        if order.status != Order.Status.PENDING_ACCEPTANCE:
-             return Response({"error": "Invalid state"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        order.status = Order.Status.REJECTED
-        order.version += 1
-        order.save()
-        
-        response = Response(OrderV2Serializer(order).data)
-        response['ETag'] = f'"{self.get_etag(order)}"'
-        return response
+    def get_transition_pk(self):
+        try:
+            return Order._meta.pk.to_python(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValidationError:
+            raise Http404
 
-    @action(detail=True, methods=['post'], url_path='preparation-complete')
-    def preparation_complete(self, request, pk=None):
-        order = self.get_object()
-        
-        # ETag Check
-        is_valid, error_response = self.check_etag(request, order)
-        if not is_valid: return error_response
-
-        if order.status != Order.Status.PREPARING:
-             return Response({"error": "Invalid state"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        order.status = Order.Status.READY_FOR_PICKUP
-        order.version += 1
-        order.save()
-        
-        response = Response(OrderV2Serializer(order).data)
-        response['ETag'] = f'"{self.get_etag(order)}"'
-        return response
+    def commit_transition(self, pk, tags, transition):
+        """단건 전이 커밋 (commit_transitions). (결과, {pk: 직렬화 결과}) 반환"""
+        [result], snapshots = commit_transitions([(pk, tags, transition)], self.etag_strategy)
+        return result, snapshots
+
+    def finish_two_phase(self, transition, reserved, outcome):
+        """
+        2단계 전이의 확정/취소: 예약한 version에 대한 조건부 UPDATE로 confirm 또는 rollback 전이 적용.
+        (적용한 전이, 결과, 스냅샷) 반환. 그 사이 다른 경로(관리자 등)로 바뀌었으면 결과는 412
+        """
+        final = TRANSITIONS[transition.confirm if outcome.approved else transition.rollback]
+        tags = [self.etag_strategy.make(reserved.pk, reserved.version)]
+        result, snapshots = self.commit_transition(reserved.pk, tags, final)
+        return final, result, snapshots
 
-    @action(detail=True, methods=['post'], url_path='pickup')
-    def pickup(self, request, pk=None):
-        order = self.get_object()
-        
-        # ETag Check
-        is_valid, error_response = self.check_etag(request, order)
-        if not is_valid: return error_response
-
-        if order.status != Order.Status.READY_FOR_PICKUP:
-             return Response({"error": "Invalid state"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        order.status = Order.Status.IN_TRANSIT
-        order.version += 1
-        order.save()
-        
-        response = Response(OrderV2Serializer(order).data)
-        response['ETag'] = f'"{self.get_etag(order)}"'
+    def two_phase_response(self, final, outcome, result, snapshots):
+        if outcome.approved or not result.ok:
+            return self.transition_response(final, result, snapshots)
+        # 외부 연동 거절/오류 -> 예약을 되돌린 주문과 함께 402 (새 ETag로 다시 시도 가능)
+        response = Response(
+            {"error": final.error_message, "message": outcome.message, "order": snapshots[result.order.pk]},
+            status=status.HTTP_402_PAYMENT_REQUIRED
+        )
+        response['ETag'] = self.get_etag_header(result.order)
         return response
 
-    @action(detail=True, methods=['post'], url_path='delivery')
-    def delivery(self, request, pk=None):
-        order = self.get_object()
-        
-        # ETag Check
-        is_valid, error_response = self.check_etag(request, order)
-        if not is_valid: return error_response
-
-        if order.status != Order.Status.IN_TRANSIT:
-             return Response({"error": "Invalid state"}, status=status.HTTP_400_BAD_REQUEST)
-
-        order.status = Order.Status.DELIVERED
-        order.version += 1
-        order.save()
-        
-        response = Response(OrderV2Serializer(order).data)
-        response['ETag'] = f'"{self.get_etag(order)}"'
+    def transition_response(self, transition, result, snapshots):
+        if result.outcome == NOT_FOUND:
+            raise Http404
+        if result.outcome == PRECONDITION_FAILED:
+            # 현재 표현과 ETag를 함께 돌려줘 클라이언트가 GET 없이 바로 재시도할 수 있게 함
+            return self.precondition_failed(result.current)
+        if result.outcome == INVALID_STATE:
+            return Response({"error": transition.error_message}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = Response(snapshots[result.order.pk])
+        response['ETag'] = self.get_etag_header(result.order)
         return response
+
+    @action(detail=False, methods=['post'], url_path='batch-transitions')
+    def batch_transitions(self, request):
+        """
+        여러 주문에 행위를 한 번에 적용합니다.
+        {"transitions": [{"order_id": 1, "action": "acceptance", "if_match": "\"<etag>\""}, ...]}
+        항목마다 ETag(If-Match) 검사는 단건 행위와 동일하며, 전체가 한 트랜잭션(한 문장)으로 처리됩니다.
+        """
+        serializer = BatchTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['transitions']
+
+        transitions = [TRANSITIONS[item['action']] for item in items]
+        results, snapshots = commit_transitions([
+            (item['order_id'], parse_etags(item['if_match']), t)
+            for item, t in zip(items, transitions)
+        ], self.etag_strategy)
+
+        data = []
+        for item, t, result in zip(items, transitions, results):
+            entry = {"order_id": item['order_id'], "action": item['action']}
+            if result.ok:
+                entry.update(status=status.HTTP_200_OK, etag=self.get_etag_header(result.order),
+                             order=snapshots[result.order.pk])
+            elif result.outcome == NOT_FOUND:
+                entry.update(status=status.HTTP_404_NOT_FOUND, error="Not found.")
+            elif result.outcome == PRECONDITION_FAILED:
+                entry.update(status=status.HTTP_412_PRECONDITION_FAILED, error="Precondition Failed",
+                             current_version=result.current_version, etag=self.get_etag_header(result.current),
+                             order=OrderV2Serializer(result.current).data)
+            else:
+                entry.update(status=status.HTTP_400_BAD_REQUEST, error=t.error_message)
+            data.append(entry)
+        return Response({"results": data})
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        주문 대량 생성 (orders/imports.py). 전체가 한 트랜잭션이라 오류 행이 있으면 아무것도 만들지 않습니다.
+        - application/json: {"orders": [{"restaurant": 1, "rider": "김라이더", "status": "preparing"}, ...]}
+          최대 bulk_max_items건, bulk_create -> 201 {"created": n, "ids": [...], "errors": []}
+        - text/csv, application/x-ndjson: 본문을 한 줄씩 읽어 묶음마다 COPY (건수 제한 없음) -> 201 {"created": n, "errors": []}
+        ?skip_errors=true 면 잘못된 행은 건너뛰고 errors에 담아 알려줍니다.
+        """
+        skip_errors = request.query_params.get('skip_errors') in serializers.BooleanField.TRUE_VALUES
+        fmt = self.bulk_stream_formats.get(request.content_type.split(';')[0].strip())
+        if fmt is not None:
+            # request.data를 건드리지 않고 본문 스트림을 바로 읽음 (본문 전체를 메모리에 올리지 않음)
+            importer = OrderImporter(getattr(settings, 'ORDER_IMPORT_CHUNK_SIZE', 5000), 'copy', skip_errors)
+            records = read_records(codecs.getreader('utf-8')(request._request), fmt)
+        else:
+            items = request.data.get('orders') if isinstance(request.data, dict) else None
+            if not isinstance(items, list) or not 0 < len(items) <= self.bulk_max_items:
+                return Response(
+                    {"orders": [f"A list of 1 to {self.bulk_max_items} orders is required."]},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            importer = OrderImporter(len(items), 'bulk_create', skip_errors)
+            records = ((row, item if isinstance(item, dict) else RowError(row, "expected an object"))
+                       for row, item in enumerate(items, start=1))
+
+        try:
+            with transaction.atomic():
+                reports = list(importer.run(records))
+        except RowError as exc:
+            return Response({"error": "Invalid row", "row": exc.row, "message": exc.message},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # 스트리밍 본문: UTF-8이 아니거나 CSV 형식이 깨짐 (행 단위 검사 전에 실패)
+            return Response({"error": "Malformed body", "message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except DataError as exc:
+            # 행 검사를 통과했지만 DB가 거부한 값 (트랜잭션은 이미 롤백됨)
+            return Response({"error": "Invalid data", "message": str(exc).strip().splitlines()[0]},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        data = {"created": sum(report.rows for report in reports)}
+        if fmt is None:
+            data["ids"] = [pk for report in reports for pk in report.ids or ()]
+        data["errors"] = [{"row": e.row, "message": e.message} for report in reports for e in report.errors]
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+#==========="행위 메서드 - 상태 변경 로직 ======================"
+# 행위 엔드포인트(payment, cancellation, ...)는 orders.state_machine.TRANSITIONS 테이블에서 생성합니다.
+def _transition_action(transition):
+    def handler(self, request, pk=None):
+        return self.perform_transition(request, transition)
+
+    handler.__name__ = transition.action
+    handler.__qualname__ = f"OrderV2ViewSet.{transition.action}"
+    handler.__doc__ = f"{' | '.join(transition.sources)} -> {transition.target}"
+    handler = action(detail=True, methods=['post'], url_path=transition.url_path)(handler)
+    if transition.idempotent:
+        handler = idempotent(handler)
+    return handler
+
+
+for _name, _transition in TRANSITIONS.items():
+    if not _transition.internal:  # 2단계 전이의 확정/취소 단계는 엔드포인트 없음
+        setattr(OrderV2ViewSet, _name, _transition_action(_transition))
@@ -4,3 +4,20 @@ from django.apps import AppConfig
 class OrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'orders'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.models.signals import post_delete, post_save
+
+        from .cache import invalidate_on_change
+        from .models import Order
+
+        # 전이 엔진 밖에서 바뀐 주문은 스냅샷 캐시에서 삭제
+        post_save.connect(invalidate_on_change, sender=Order, dispatch_uid='order-cache-save')
+        post_delete.connect(invalidate_on_change, sender=Order, dispatch_uid='order-cache-delete')
+
+        # 만료 Idempotency-Key 백그라운드 정리 (기본 꺼짐)
+        interval = getattr(settings, 'IDEMPOTENCY_PRUNE_INTERVAL', None)
+        if interval:
+            from .idempotency import start_background_pruner
+            start_background_pruner(interval, getattr(settings, 'IDEMPOTENCY_PRUNE_BATCH_SIZE', 1000))
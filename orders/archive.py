@@ -0,0 +1,140 @@
+"""
+종료 주문 보관 (hot/cold 분리)
+
+배달 완료/취소/거절 상태로 N일이 지난 주문을 orders_order에서 ArchivedOrder로 옮깁니다 (archive_orders 명령).
+주문 테이블에는 진행중 주문과 최근 주문만 남으므로 V2 목록/필터용 인덱스가 작게 유지됩니다.
+
+- 배치마다 한 문장(= 한 트랜잭션): 대상 행 잠금(SKIP LOCKED) -> 전송된 아웃박스 이벤트 삭제 -> 주문 삭제 -> 보관 테이블에 INSERT
+  중간에 멈춰도 커밋된 배치만 옮겨진 상태이므로 다시 실행하면 남은 행부터 이어서 처리합니다 (재개 가능).
+- 아직 전송되지 않은 아웃박스 이벤트가 있는 주문은 건너뜁니다 (디스패처가 보낸 뒤 다음 실행에서 보관).
+- 상태 이력(OrderStatusTransition)은 주문 외래 키 제약이 없어 그대로 남습니다.
+- incremental: 이미 보관한 가장 최근 주문의 created_at 이후만 훑습니다 (자주 돌리는 cron 용).
+  그 이전에 생성되어 늦게 종료된 주문은 전체 실행에서 옮겨집니다.
+
+V2 상세 조회는 주문 테이블에 없으면 보관 테이블을 찾아 같은 표현으로 응답합니다 (archived_or_404).
+"""
+import functools
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.http import Http404
+
+from .models import ArchivedOrder, Order, OrderEvent, OrderStatusTransition
+from .state_machine import TERMINAL_STATUSES
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@functools.lru_cache(maxsize=None)
+def _archive_sql():
+    table = Order._meta.db_table
+    events = OrderEvent._meta.db_table
+    archive = ArchivedOrder._meta.db_table
+    to_code = ' '.join(f"WHEN '{status}' THEN {code}" for status, code in OrderStatusTransition.CODES.items())
+    # batch   : 대상 주문을 id 순서로 잠금. 다른 트랜잭션이 잡고 있는 행은 건너뜀 (전이와 경합하지 않음)
+    # events  : 전송된 아웃박스 이벤트 삭제 (주문 FK 제약 때문에 주문보다 먼저, 같은 문장에서)
+    # moved   : 주문 삭제 + 삭제한 행 반환
+    # archived: 보관 테이블에 INSERT. 이미 있는 id(이전 실행이 중간에 끊긴 경우 등)는 그대로 둠
+    return f"""
+        WITH batch AS (
+            SELECT o.id
+              FROM {table} AS o
+             WHERE o.status = ANY(%s) AND o.created_at < %s AND o.created_at >= %s AND o.id > %s
+               AND NOT EXISTS (
+                   SELECT 1 FROM {events} AS e WHERE e.order_id = o.id AND e.dispatched_at IS NULL
+               )
+             ORDER BY o.id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+        ), events AS (
+            DELETE FROM {events} AS e USING batch WHERE e.order_id = batch.id
+        ), moved AS (
+            DELETE FROM {table} AS o USING batch WHERE o.id = batch.id
+         RETURNING o.*
+        ), archived AS (
+            INSERT INTO {archive}
+                   (id, restaurant_id, rider_id, restaurant_name, status_code, created_at, version, archived_at)
+            SELECT id, restaurant_id, rider_id, restaurant_name, CASE status {to_code} END, created_at, version, now()
+              FROM moved
+                ON CONFLICT (id) DO NOTHING
+        )
+        SELECT count(*), max(id) FROM moved
+    """
+
+
+@dataclass
+class ArchiveBatch:
+    moved: int
+    last_id: int
+    seconds: float
+
+    @property
+    def throughput(self):
+        return self.moved / self.seconds if self.seconds > 0 else 0.0
+
+
+def archive_orders(cutoff, batch_size=1000, since=None, max_batches=None):
+    """
+    cutoff 이전에 생성된 종료 주문을 batch_size 개씩 보관 테이블로 옮기며 배치마다 ArchiveBatch를 yield 합니다.
+    since가 있으면 그 시각 이후에 생성된 주문만 대상 (incremental_since() 참고).
+    """
+    last_id, batches = 0, 0
+    floor = since or _EPOCH
+    statuses = sorted(TERMINAL_STATUSES)
+    while max_batches is None or batches < max_batches:
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(_archive_sql(), [statuses, cutoff, floor, last_id, batch_size])
+            moved, max_id = cursor.fetchone()
+        if not moved:
+            return
+        last_id, batches = max_id, batches + 1
+        yield ArchiveBatch(moved, max_id, time.perf_counter() - started)
+
+
+def incremental_since():
+    """이미 보관한 가장 최근 주문(가장 큰 id)의 created_at. 보관한 주문이 없으면 None"""
+    return ArchivedOrder.objects.order_by('-id').values_list('created_at', flat=True).first()
+
+
+def index_sizes(*models):
+    """{테이블: [(인덱스 이름, 바이트)]} 현재 인덱스 크기"""
+    sizes = {}
+    with connection.cursor() as cursor:
+        for model in models or (Order, ArchivedOrder):
+            cursor.execute(
+                "SELECT indexrelname, pg_relation_size(indexrelid) FROM pg_stat_user_indexes"
+                " WHERE relname = %s ORDER BY indexrelname",
+                [model._meta.db_table],
+            )
+            sizes[model._meta.db_table] = cursor.fetchall()
+    return sizes
+
+
+def _archived_lookup(pk):
+    try:
+        return ArchivedOrder.objects.filter(pk=ArchivedOrder._meta.pk.to_python(pk))
+    except (TypeError, ValueError, ValidationError):  # 숫자가 아닌 id
+        raise Http404
+
+
+def archived_or_404(pk):
+    """보관된 주문을 Order 인스턴스로 (V2 상세 조회 fallback). 없으면 Http404"""
+    archived = _archived_lookup(pk).first()
+    if archived is None:
+        raise Http404("No Order matches the given query.")
+    return archived.as_order()
+
+
+async def aarchived_or_404(pk):
+    archived = await _archived_lookup(pk).afirst()
+    if archived is None:
+        raise Http404("No Order matches the given query.")
+    return archived.as_order()
+
+
+def is_archived(pk):
+    return _archived_lookup(pk).exists()
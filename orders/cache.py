@@ -0,0 +1,203 @@
+"""
+주문 스냅샷 read-through 캐시
+
+GET /api/v2/orders/{id}/ 는 쓰기보다 훨씬 많으므로, 직렬화된 OrderV2Serializer 결과와 version을
+Django 캐시 프레임워크(settings.ORDER_CACHE_ALIAS)에 "order:{id}" 키로 보관합니다.
+여러 워커가 같은 스냅샷을 봐야 하므로 공유 백엔드(Redis, Memcached 등)에서만 켭니다.
+프로세스 로컬 백엔드(locmem, dummy)를 지정하면 ORDER_CACHE_ALLOW_LOCAL=True가 아닌 한 시스템 체크 경고를 내고
+캐시를 끈 채로 동작합니다 (다른 워커가 바꾼 주문을 옛 스냅샷으로 응답하게 되므로).
+
+일관성 규칙
+- 항목은 (version, data). 삭제 대신 (version, None) 묘비(tombstone)를 짧게(ORDER_CACHE_TOMBSTONE_TIMEOUT) 남기고,
+  조회는 묘비를 없는 키로 취급합니다.
+- 조회(read-through) : 캐시에 없으면 DB에서 읽어 채움. 이미 같거나 더 새로운 version(묘비 포함)이 있으면 채우지 않으므로
+                        느린 조회가 그 사이 커밋된 변경을 옛 스냅샷으로 되돌리지 못합니다.
+- 전이(write-through): 커밋 후(transaction.on_commit) 새 스냅샷을 기록. 더 새로운 version이 이미 있으면 건너뜀.
+                        커밋되지 않은 상태는 캐시에 보이지 않습니다.
+- 그 밖의 변경(V1 save, 라이더 배정 등)은 커밋 후 변경된 version의 묘비를 남깁니다(invalidate).
+  version을 모르는 경우(삭제)는 version 없는 묘비로, 만료 전까지 모든 채우기를 막습니다.
+비교 후 기록(get -> set)은 백엔드 원자 연산이 아니므로, 묘비 보관 시간보다 느린 조회는 여전히 옛 값을 쓸 수 있습니다.
+
+적중/실패 횟수는 프로세스 단위로 세며 GET /api/v2/metrics/ (관리자 전용)로 노출합니다.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete
+
+logger = logging.getLogger(__name__)
+
+# 워커끼리 공유되지 않는 캐시 백엔드
+LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_local_alias(alias):
+    return settings.CACHES.get(alias, {}).get('BACKEND') in LOCAL_BACKENDS
+
+
+class OrderCache:
+    key_prefix = 'order'
+
+    def __init__(self, alias='default', timeout=300, tombstone_timeout=10):
+        self.alias = alias
+        self.timeout = timeout
+        self.tombstone_timeout = tombstone_timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        alias = getattr(settings, 'ORDER_CACHE_ALIAS', None)
+        if alias is not None and is_local_alias(alias) and not getattr(settings, 'ORDER_CACHE_ALLOW_LOCAL', False):
+            logger.warning("Order snapshot cache disabled: CACHES[%r] is process-local", alias)
+            alias = None
+        return cls(
+            alias=alias,
+            timeout=getattr(settings, 'ORDER_CACHE_TIMEOUT', 300),
+            tombstone_timeout=getattr(settings, 'ORDER_CACHE_TOMBSTONE_TIMEOUT', 10),
+        )
+
+    @property
+    def enabled(self):
+        return self.alias is not None
+
+    @property
+    def backend(self):
+        # caches[alias]는 스레드마다 별도 연결을 돌려줌
+        return caches[self.alias]
+
+    def key(self, pk):
+        return f'{self.key_prefix}:{pk}'
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get(self, pk):
+        """(version, data) 또는 None (묘비 포함)"""
+        if not self.enabled:
+            return None
+        return self._count(self.backend.get(self.key(pk)))
+
+    async def aget(self, pk):
+        if not self.enabled:
+            return None
+        return self._count(await self.backend.aget(self.key(pk)))
+
+    def _count(self, entry):
+        snapshot = None if entry is None or entry[1] is None else entry
+        with self._lock:
+            if snapshot is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return snapshot
+
+    @staticmethod
+    def _is_newer(version, current):
+        # current: 캐시에 있는 항목. 없거나 더 옛 version이면 기록
+        if current is None:
+            return True
+        return current[0] is not None and current[0] < version
+
+    def _store(self, pk, version, data):
+        key, entry = self.key(pk), (version, dict(data))
+        if self.backend.add(key, entry, self.timeout):
+            return
+        if self._is_newer(version, self.backend.get(key)):
+            self.backend.set(key, entry, self.timeout)
+
+    async def _astore(self, pk, version, data):
+        key, entry = self.key(pk), (version, dict(data))
+        if await self.backend.aadd(key, entry, self.timeout):
+            return
+        if self._is_newer(version, await self.backend.aget(key)):
+            await self.backend.aset(key, entry, self.timeout)
+
+    def fill(self, pk, version, data):
+        """DB에서 읽은 스냅샷으로 채움 (같거나 더 새로운 version/묘비가 있으면 덮어쓰지 않음)"""
+        if self.enabled:
+            self._store(pk, version, data)
+
+    async def afill(self, pk, version, data):
+        if self.enabled:
+            await self._astore(pk, version, data)
+
+    # ------------------------------------------------------------------
+    # 변경
+    # ------------------------------------------------------------------
+    def write_many(self, snapshots):
+        """[(pk, version, data), ...] -> 커밋된 전이의 새 스냅샷 기록 (write-through)"""
+        if self.enabled:
+            for pk, version, data in snapshots:
+                self._store(pk, version, data)
+
+    def write(self, pk, version, data):
+        self.write_many([(pk, version, data)])
+
+    def write_on_commit(self, snapshots):
+        """트랜잭션 안에서 호출: 커밋된 뒤에만 스냅샷을 기록"""
+        if self.enabled and snapshots:
+            transaction.on_commit(lambda: self.write_many(snapshots))
+
+    def invalidate_many(self, pks, version=None):
+        """스냅샷 대신 묘비 (version, None) 기록. version보다 옛(같은) 스냅샷으로 다시 채워지지 않음"""
+        if self.enabled:
+            tombstones = {self.key(pk): (version, None) for pk in pks}
+            if tombstones:
+                self.backend.set_many(tombstones, self.tombstone_timeout)
+
+    def invalidate(self, pk, version=None):
+        self.invalidate_many([pk], version)
+
+    # ------------------------------------------------------------------
+    # 통계 (프로세스 단위, GET /api/v2/metrics/)
+    # ------------------------------------------------------------------
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_ratio': hits / total if total else 0.0}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+@checks.register(checks.Tags.caches)
+def check_order_cache(app_configs, **kwargs):
+    alias = getattr(settings, 'ORDER_CACHE_ALIAS', None)
+    if alias is None or getattr(settings, 'ORDER_CACHE_ALLOW_LOCAL', False) or not is_local_alias(alias):
+        return []
+    return [checks.Warning(
+        f"ORDER_CACHE_ALIAS points to the process-local cache CACHES[{alias!r}]; the order snapshot cache is disabled.",
+        hint="Use a shared backend (Redis, Memcached) or set ORDER_CACHE_ALLOW_LOCAL = True for a single process.",
+        id='orders.W001',
+    )]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = OrderCache.from_settings()
+    return _cache
+
+
+def invalidate_on_change(sender, instance, **kwargs):
+    # ORM save()/delete()로 바뀐 주문 (V1 수정 등). 커밋 후 묘비를 남기므로 롤백되면 캐시는 그대로 유효
+    # 삭제는 version 없는 묘비 (어떤 version으로도 다시 채우지 않음)
+    version = None if kwargs.get('signal') is post_delete else instance.version
+    transaction.on_commit(lambda: get_cache().invalidate(instance.pk, version))
@@ -1,7 +1,8 @@
 import functools
+from django.http import HttpResponse
 from rest_framework.response import Response
 from rest_framework import status
-from .models import IdempotencyKey
+from .idempotency import get_store, request_fingerprint, StoredResponse, FINGERPRINT_MISMATCH
 import uuid
 
 def idempotent(func):
@@ -9,7 +10,7 @@ def idempotent(func):
     def wrapper(view_set, request, *args, **kwargs):
         # 1. 헤더에서 Idempotency-Key 추출
         idem_key = request.headers.get('Idempotency-Key')
-        
+
         # 키가 없으면 멱등성 보장 없이 그냥 실행 (또는 400 에러 - 여기선 선택)
         # README 요구사항에 따라 멱등성 보장을 위해 키가 있으면 로직 수행
         if not idem_key:
@@ -22,26 +23,32 @@ def idempotent(func):
         except ValueError:
              return Response({"error": "Invalid Idempotency-Key format. Must be UUID."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 2. 키가 이미 존재하는지 확인
-        existing_key = IdempotencyKey.objects.filter(key=uuid_key).first()
-        if existing_key:
-            # 존재하면 저장된 응답 반환
-            return Response(existing_key.response_body, status=existing_key.response_status)
-
-        # 3. 존재하지 않으면 실제 로직 실행
-        response = func(view_set, request, *args, **kwargs)
-
-        # 4. 성공 응답(2xx)인 경우에만 저장? 또는 모든 응답 저장?
-        # 보통은 부작용이 발생한 성공 케이스를 저장하여 재시도 막음.
-        # 실패(4xx, 5xx)는 저장 여부 정책 나름.
-        # 요구사항: "네트워크 오류 발생 시... 중복 처리 방지" -> 성공했으면 저장해서 중복 방지.
-        
-        if 200 <= response.status_code < 300:
-            IdempotencyKey.objects.create(
-                key=uuid_key,
-                response_status=response.status_code,
-                response_body=response.data
+        # 2. 요청 지문 계산 (요청당 1회) -> 같은 키를 다른 요청에 재사용했는지 확인용
+        fingerprint = request_fingerprint(request, kwargs.get('pk'))
+
+        # 3. 키 선점 -> 실제 로직 실행 -> 성공(2xx) 응답 저장
+        #    이미 처리된 키면 저장된 응답을, 처리중인 키면 그 결과를 기다렸다가 반환합니다.
+        #    (선점/대기/LRU 상세는 orders/idempotency.py 참고)
+        result = get_store().run(uuid_key, lambda: func(view_set, request, *args, **kwargs), fingerprint)
+
+        if result is FINGERPRINT_MISMATCH:
+            return Response(
+                {"error": "Idempotency-Key was already used for a different request."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
             )
-            
-        return response
+
+        if result is None:
+            # 같은 키의 요청이 아직 처리중
+            response = Response(
+                {"error": "A request with this Idempotency-Key is still being processed."},
+                status=status.HTTP_409_CONFLICT
+            )
+            response['Retry-After'] = '1'
+            return response
+
+        if isinstance(result, StoredResponse):
+            # 저장된 응답(렌더링된 bytes)을 그대로 반환 -> DRF 렌더링 생략
+            return HttpResponse(result.content, status=result.status, content_type='application/json')
+
+        return result
     return wrapper
@@ -0,0 +1,272 @@
+"""
+라이더 배차 (가장 가까운 배차 가능 라이더 자동 배정)
+
+주문이 픽업 대기(ready_for_pickup)가 되면 식당 좌표에서 가장 가까운 배차 가능 라이더를 배정합니다.
+1) 후보  : 프로세스 메모리의 격자 인덱스(RiderGrid)에서 k-최근접 라이더 (DB 조회 없음)
+2) 확보  : 후보 순서대로 UPDATE rider SET is_available = false WHERE id = ? AND is_available  -> 1행이면 확보
+3) 배정  : 주문 rider 지정
+   - preparation_complete 전이 안(assign_in_transition): 전이가 잠근 행에 같은 트랜잭션에서 rider만 지정.
+     전이가 올린 version에 배정이 함께 들어가므로 응답/캐시/SSE/아웃박스가 모두 배정 후 표현의 ETag를 가집니다.
+   - 나중에 다시 시도(assign, dispatch_riders 명령): 주문 행 잠금 후 rider 지정 + version 증가 (ETag가 바뀜).
+     상태 변경이 아니므로 상태 이력은 남기지 않고, 아웃박스 행(action=rider_assignment)과 SSE 이벤트만 기록합니다.
+
+인덱스는 프로세스마다 따로 있어 다른 프로세스가 이미 데려간 라이더가 남아 있을 수 있습니다.
+확보 UPDATE가 0행이면 인덱스에서 빼고 다음 후보로 넘어가므로 같은 라이더가 두 주문에 배정되지는 않습니다.
+위치/배차 가능 여부가 이 프로세스에서 바뀌면(위치 버퍼 플러시 orders/locations.py, 배달 완료 후 release_on_delivery) 인덱스도 그 라이더만 갱신하고,
+다른 프로세스에서 바뀐 것은 reload_interval(ORDER_DISPATCH_RELOAD_INTERVAL)초마다 DB에서 인덱스를 새로 만들어 반영합니다.
+배정하지 못한 주문(근처에 라이더 없음 등)은 dispatch_riders 명령이 주기적으로 다시 시도합니다.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .cache import get_cache
+from .etags import get_strategy
+from .events import StatusEvent, get_hub
+from .models import Order, OrderEvent, Restaurant, Rider
+
+# 위도 1도의 거리(km). 도시 규모에서는 등장방형(equirectangular) 근사로 충분
+KM_PER_DEGREE = 111.32
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    x = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    return math.hypot(x, lat2 - lat1) * KM_PER_DEGREE
+
+
+class RiderGrid:
+    """
+    배차 가능한 라이더 위치의 균일 격자 인덱스 (cell_size: 칸 크기, 도 단위)
+    update/discard는 라이더 한 명의 칸만 옮기므로 O(1), nearest는 가까운 칸부터 고리 모양으로 넓혀 갑니다.
+    """
+
+    def __init__(self, cell_size=0.01):
+        self.cell_size = cell_size
+        self._cells = defaultdict(set)
+        self._positions = {}  # rider_id -> (lat, lon, cell)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, rider_id):
+        return rider_id in self._positions
+
+    def cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_size)), int(math.floor(lon / self.cell_size))
+
+    def update(self, rider_id, lat, lon, available=True):
+        """라이더 위치/배차 가능 여부 반영. 배차 불가거나 좌표가 없으면 인덱스에서 뺌"""
+        if not available or lat is None or lon is None:
+            self.discard(rider_id)
+            return
+        cell = self.cell(lat, lon)
+        with self._lock:
+            old = self._positions.get(rider_id)
+            if old is not None and old[2] != cell:
+                self._remove_from_cell(rider_id, old[2])
+            self._cells[cell].add(rider_id)
+            self._positions[rider_id] = (lat, lon, cell)
+
+    def discard(self, rider_id):
+        with self._lock:
+            old = self._positions.pop(rider_id, None)
+            if old is not None:
+                self._remove_from_cell(rider_id, old[2])
+
+    def _remove_from_cell(self, rider_id, cell):
+        members = self._cells[cell]
+        members.discard(rider_id)
+        if not members:
+            del self._cells[cell]
+
+    def nearest(self, lat, lon, k=5, max_km=10.0):
+        """(lat, lon)에서 max_km 안의 가장 가까운 라이더 최대 k명 -> [(거리 km, rider_id)] 가까운 순"""
+        ci, cj = self.cell(lat, lon)
+        # 고리 r까지 훑은 뒤 아직 보지 않은 칸의 점은 최소 r칸 떨어져 있음 (경도 방향 칸이 더 좁으므로 그쪽 기준)
+        cell_km = self.cell_size * KM_PER_DEGREE * math.cos(math.radians(min(abs(lat), 89.0)))
+        max_ring = int(max_km / cell_km) + 1
+        found = []
+        with self._lock:
+            if not self._positions:
+                return []
+            for ring in range(max_ring + 1):
+                for cell in self._ring(ci, cj, ring):
+                    for rider_id in self._cells.get(cell, ()):
+                        r_lat, r_lon, _ = self._positions[rider_id]
+                        distance = distance_km(lat, lon, r_lat, r_lon)
+                        if distance <= max_km:
+                            found.append((distance, rider_id))
+                if len(found) >= k:
+                    found.sort()
+                    if found[k - 1][0] <= ring * cell_km:
+                        break
+        found.sort()
+        return found[:k]
+
+    @staticmethod
+    def _ring(ci, cj, ring):
+        if ring == 0:
+            yield ci, cj
+            return
+        for j in range(cj - ring, cj + ring + 1):
+            yield ci - ring, j
+            yield ci + ring, j
+        for i in range(ci - ring + 1, ci + ring):
+            yield i, cj - ring
+            yield i, cj + ring
+
+
+class RiderDispatcher:
+    def __init__(self, cell_size=0.01, candidates=5, max_km=10.0, reload_interval=30.0):
+        self.grid = RiderGrid(cell_size)
+        self.candidates = candidates
+        self.max_km = max_km
+        self.reload_interval = reload_interval
+        self.loaded_at = None  # 마지막으로 인덱스를 만든 시각 (time.monotonic)
+        self.conflicts = 0  # 확보 UPDATE가 0행이었던 횟수 (다른 주문/프로세스가 먼저 데려감)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            cell_size=getattr(settings, 'ORDER_DISPATCH_CELL_SIZE', 0.01),
+            candidates=getattr(settings, 'ORDER_DISPATCH_CANDIDATES', 5),
+            max_km=getattr(settings, 'ORDER_DISPATCH_MAX_KM', 10.0),
+            reload_interval=getattr(settings, 'ORDER_DISPATCH_RELOAD_INTERVAL', 30.0),
+        )
+
+    @property
+    def loaded(self):
+        return self.loaded_at is not None
+
+    def load(self, force=False):
+        """
+        배차 가능한 라이더 전체로 인덱스를 새로 만듦 (처음 배차할 때, 이후 reload_interval초가 지났을 때).
+        다른 프로세스가 풀어 준 라이더(배달 완료)와 옮긴 위치를 반영합니다. 새 격자를 다 채운 뒤 교체하므로
+        그동안의 배차는 이전 격자를 그대로 씁니다.
+        """
+        with self._lock:
+            if not force and self.loaded and time.monotonic() - self.loaded_at < self.reload_interval:
+                return
+            grid = RiderGrid(self.grid.cell_size)
+            riders = Rider.objects.filter(is_available=True, latitude__isnull=False, longitude__isnull=False)
+            for rider_id, lat, lon in riders.values_list('id', 'latitude', 'longitude').iterator(chunk_size=5000):
+                grid.update(rider_id, lat, lon)
+            self.grid = grid
+            self.loaded_at = time.monotonic()
+
+    def claim_nearest(self, lat, lon):
+        """(lat, lon)에서 가장 가까운 배차 가능 라이더를 확보 (호출자의 트랜잭션 안에서). rider_id 또는 None"""
+        self.load()
+        for _, rider_id in self.grid.nearest(lat, lon, self.candidates, self.max_km):
+            # 조건부 UPDATE로 확보. 0행이면 다른 주문(또는 다른 프로세스)이 먼저 데려감
+            claimed = Rider.objects.filter(pk=rider_id, is_available=True).update(is_available=False)
+            self.grid.discard(rider_id)
+            if claimed:
+                return rider_id
+            with self._lock:
+                self.conflicts += 1
+        return None
+
+    def assign_in_transition(self, order):
+        """
+        preparation_complete 전이 트랜잭션 안에서 호출: 전이로 갱신된 order에 라이더를 배정 (version은 전이가 올린 값 그대로).
+        주문 행은 전이 UPDATE가 이미 잠갔습니다. 배정한 rider_id 또는 None
+        """
+        if order.rider_id is not None or order.restaurant_id is None:
+            return None
+        location = (
+            Restaurant.objects.filter(pk=order.restaurant_id, latitude__isnull=False, longitude__isnull=False)
+            .values_list('latitude', 'longitude').first()
+        )
+        if location is None:
+            return None
+        rider_id = self.claim_nearest(*location)
+        if rider_id is not None:
+            Order.objects.filter(pk=order.pk).update(rider_id=rider_id)
+            order.rider_id = rider_id
+        return rider_id
+
+    def assign(self, order_pk):
+        """전이 밖에서 order_pk 주문에 가장 가까운 라이더를 배정 (version 증가). 배정한 rider_id 또는 None (대상 아님/후보 없음)"""
+        with transaction.atomic():
+            order = (
+                Order.objects.select_for_update(of=('self',))
+                .filter(pk=order_pk, status=Order.Status.READY_FOR_PICKUP, rider__isnull=True,
+                        restaurant__latitude__isnull=False, restaurant__longitude__isnull=False)
+                .values('status', 'version', 'restaurant__latitude', 'restaurant__longitude')
+                .first()
+            )
+            if order is None:
+                return None
+            rider_id = self.claim_nearest(order['restaurant__latitude'], order['restaurant__longitude'])
+            if rider_id is None:
+                return None
+            version = order['version'] + 1
+            Order.objects.filter(pk=order_pk).update(rider_id=rider_id, version=version)
+            OrderEvent.objects.create(order_id=order_pk, action='rider_assignment', from_status=order['status'],
+                                      to_status=order['status'], version=version)
+            strategy = get_strategy()
+            event = StatusEvent(order_pk, order['status'], version, strategy.format(strategy.make(order_pk, version)))
+
+            def committed():
+                get_cache().invalidate(order_pk, version)
+                get_hub().publish(event)
+
+            transaction.on_commit(committed)
+            return rider_id
+
+    def release(self, rider_id):
+        """배달을 마친 라이더를 다시 배차 가능으로"""
+        Rider.objects.filter(pk=rider_id).update(is_available=True)
+        rider = Rider.objects.filter(pk=rider_id).values_list('latitude', 'longitude').first()
+        if rider is not None and self.loaded:
+            self.grid.update(rider_id, *rider)
+
+    def pending_orders(self, limit=500):
+        """라이더가 아직 없는 픽업 대기 주문 id (오래된 순)"""
+        queryset = Order.objects.filter(
+            status=Order.Status.READY_FOR_PICKUP, rider__isnull=True, restaurant__latitude__isnull=False,
+        )
+        return list(queryset.order_by('created_at', 'id').values_list('id', flat=True)[:limit])
+
+    def assign_pending(self, limit=500):
+        """밀린 주문 배정 -> (시도한 주문 수, 배정한 수, 걸린 시간 초)"""
+        started = time.perf_counter()
+        self.load()  # reload_interval이 지났으면 다른 프로세스의 변경을 반영
+        pending = self.pending_orders(limit)
+        assigned = sum(self.assign(pk) is not None for pk in pending)
+        return len(pending), assigned, time.perf_counter() - started
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = RiderDispatcher.from_settings()
+    return _dispatcher
+
+
+# ---------------------------------------------------------------------------
+# 상태 머신 훅 (orders/state_machine.py)
+# ---------------------------------------------------------------------------
+def dispatch_on_ready(order):
+    """preparation_complete 전이 트랜잭션 안(스냅샷 기록 전): 같은 version 안에서 라이더 자동 배정"""
+    if getattr(settings, 'ORDER_DISPATCH_ENABLED', True):
+        get_dispatcher().assign_in_transition(order)
+
+
+def release_on_delivery(order):
+    if order.rider_id is not None:
+        transaction.on_commit(lambda: get_dispatcher().release(order.rider_id))
+
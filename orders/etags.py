@@ -0,0 +1,143 @@
+"""
+주문 ETag 전략
+
+OrderV2ViewSet과 상태 전이 엔진(orders/transitions.py)이 같은 전략 객체로 ETag를 만들고 비교합니다.
+- MD5ETag     : "md5(order-{id}-v{version})" (기존 형식, 기본값)
+- WeakETag    : W/"{id}-{version}"  해시 없음. 버전이 곧 표현을 결정하므로 If-Match에서도 그대로 비교합니다.
+- KeyedETag   : "{version}.{blake2b(key, id-version)}"  빠른 keyed 해시. 다른 주문/버전의 태그를 위조할 수 없음
+- CachedETag  : 다른 전략을 감싸 주문 인스턴스에 계산 결과를 저장 (한 요청에서 여러 번 필요할 때)
+
+전이 엔진은 태그를 조건부 UPDATE 안에서 비교합니다(DB 왕복 1회 유지).
+sql 이 있는 전략은 DB에서 태그를 계산해 비교하고, 없으면 태그에서 꺼낸 version을 o.version과 비교합니다.
+사용할 전략은 settings.ORDER_ETAG_STRATEGY 로 지정합니다.
+"""
+import functools
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+def parse_etags(header):
+    """
+    If-Match / If-None-Match 헤더 -> ETag 값 목록 (RFC 9110 목록 형식, 따옴표와 W/ 접두어 제거)
+    '*' 는 그대로 '*' 로 반환합니다.
+    """
+    if not header:
+        return []
+    tags = []
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+class ETagStrategy:
+    weak = False
+    # 조건부 UPDATE 안에서 태그를 계산하는 SQL 식 (o = 주문 테이블 별칭). None이면 version 비교
+    sql = None
+
+    def make(self, pk, version):
+        raise NotImplementedError
+
+    def for_order(self, order):
+        return self.make(order.id, order.version)
+
+    def format(self, value):
+        """ETag 응답 헤더 값"""
+        return f'W/"{value}"' if self.weak else f'"{value}"'
+
+    def matches(self, tags, value):
+        """parse_etags() 결과와 현재 태그 값 비교 (해시 재계산 없음)"""
+        return '*' in tags or value in tags
+
+    def db_value(self, tag, pk):
+        """
+        클라이언트 태그 -> 조건부 UPDATE에서 비교할 값.
+        sql 이 없는 전략은 태그에 담긴 version 문자열을 돌려주고, 해석할 수 없으면 None(= 항상 불일치)
+        """
+        return tag
+
+
+class MD5ETag(ETagStrategy):
+    sql = "md5('order-' || o.id || '-v' || o.version)"
+
+    def make(self, pk, version):
+        return hashlib.md5(f"order-{pk}-v{version}".encode()).hexdigest()
+
+
+class WeakETag(ETagStrategy):
+    weak = True
+
+    def make(self, pk, version):
+        return f"{pk}-{version}"
+
+    def db_value(self, tag, pk):
+        tag_pk, _, version = tag.partition('-')
+        if tag_pk != str(pk) or not version.isdigit():
+            return None
+        return version
+
+
+class KeyedETag(ETagStrategy):
+    def __init__(self, key=None):
+        key = key if key is not None else settings.SECRET_KEY
+        self.key = hashlib.blake2b(key.encode(), digest_size=32, person=b'order-etag').digest()
+
+    def mac(self, pk, version):
+        return hashlib.blake2b(f"{pk}-{version}".encode(), key=self.key, digest_size=8).hexdigest()
+
+    def make(self, pk, version):
+        return f"{version}.{self.mac(pk, version)}"
+
+    def db_value(self, tag, pk):
+        version, _, mac = tag.partition('.')
+        # compare_digest는 ASCII가 아닌 str에 TypeError -> bytes로 비교 (헤더는 임의의 latin-1 문자일 수 있음)
+        if not (version.isascii() and version.isdigit()):
+            return None
+        if not hmac.compare_digest(mac.encode(), self.mac(pk, version).encode()):
+            return None
+        return version
+
+
+class CachedETag(ETagStrategy):
+    """inner 전략의 결과를 주문 인스턴스에 (version, 값)으로 저장해 재사용"""
+
+    attname = '_etag_cache'
+
+    def __init__(self, inner=None):
+        self.inner = inner or MD5ETag()
+        self.weak = self.inner.weak
+        self.sql = self.inner.sql
+
+    def make(self, pk, version):
+        return self.inner.make(pk, version)
+
+    def for_order(self, order):
+        cached = getattr(order, self.attname, None)
+        if cached is not None and cached[0] == order.version:
+            return cached[1]
+        value = self.inner.for_order(order)
+        try:
+            setattr(order, self.attname, (order.version, value))
+        except AttributeError:
+            pass  # namedtuple 등 속성을 붙일 수 없는 행은 캐시하지 않음
+        return value
+
+    def db_value(self, tag, pk):
+        return self.inner.db_value(tag, pk)
+
+
+@functools.lru_cache(maxsize=None)
+def _load(path):
+    return import_string(path)()
+
+
+def get_strategy():
+    """settings.ORDER_ETAG_STRATEGY (기본 MD5ETag) 인스턴스"""
+    return _load(getattr(settings, 'ORDER_ETAG_STRATEGY', 'orders.etags.MD5ETag'))
@@ -0,0 +1,160 @@
+"""
+주문 상태 이벤트 fan-out 허브 (프로세스 내부, asyncio)
+
+V2 행위가 커밋되면 {id, status, version, etag} 이벤트를 발행하고,
+SSE 연결(orders/api/v2/streams.py)마다 하나씩 있는 구독자 큐로 나눠 줍니다.
+- 구독자 큐는 크기가 제한되어 있습니다. 느린 구독자의 큐가 가득 차면 큐를 비우고 LAGGED 표시를 넣어
+  연결을 끊습니다(backpressure). 클라이언트(EventSource)는 Last-Event-ID로 재접속하여 이어 받습니다.
+- 최근 이벤트는 주문별로 조금씩 보관(history)하여 재접속 시 놓친 이벤트를 다시 보냅니다.
+  history에 없으면 스트림이 DB의 현재 상태를 보내므로, 최소한 최신 상태는 항상 전달됩니다.
+- 발행(publish)은 WSGI/동기 스레드에서도 호출할 수 있으며 이벤트 루프로 넘겨 처리합니다.
+
+허브는 한 프로세스 안의 구독자에게만 전달합니다. 여러 프로세스로 운영할 때는
+각 프로세스의 허브로 이벤트를 중계하는 브로커(outbox 디스패처 등)가 필요합니다.
+"""
+import asyncio
+import threading
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+
+# 큐가 넘쳐 연결을 끊어야 하는 구독자에게 넣는 표시
+LAGGED = object()
+
+
+@dataclass(frozen=True)
+class StatusEvent:
+    id: int
+    status: str
+    version: int
+    etag: str
+
+    @classmethod
+    def for_order(cls, order, etag_strategy):
+        etag = etag_strategy.format(etag_strategy.make(order.id, order.version))
+        return cls(order.id, order.status, order.version, etag)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+class Subscription:
+    def __init__(self, order_id, maxsize):
+        self.order_id = order_id
+        self.queue = asyncio.Queue(maxsize)
+        self.lagged = False
+
+    def offer(self, event):
+        """이벤트 루프 스레드에서만 호출. 큐가 가득 차면 비우고 LAGGED를 넣음"""
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(LAGGED)
+
+    async def get(self, timeout=None):
+        """다음 이벤트 (LAGGED 포함). timeout 초 동안 없으면 None"""
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class OrderEventHub:
+    def __init__(self, queue_size=16, history_size=32, history_orders=10_000):
+        self.queue_size = queue_size
+        self.history_size = history_size
+        self.history_orders = history_orders
+        self.loop = None
+        self.subscribers = defaultdict(set)
+        self.history = OrderedDict()  # order_id -> deque[StatusEvent] (LRU)
+        self.published = 0
+        self.dropped = 0  # LAGGED로 끊은 구독자 수
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            queue_size=getattr(settings, 'ORDER_EVENTS_QUEUE_SIZE', 16),
+            history_size=getattr(settings, 'ORDER_EVENTS_HISTORY_SIZE', 32),
+        )
+
+    # ------------------------------------------------------------------
+    # 구독 (이벤트 루프 안에서 호출)
+    # ------------------------------------------------------------------
+    def subscribe(self, order_id):
+        self.loop = asyncio.get_running_loop()
+        subscription = Subscription(order_id, self.queue_size)
+        self.subscribers[order_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscribers = self.subscribers.get(subscription.order_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self.subscribers[subscription.order_id]
+
+    def replay(self, order_id, after_version):
+        """history에서 after_version 이후 이벤트. 이어지는지 알 수 없으면 None (-> 현재 상태를 보내야 함)"""
+        events = self.history.get(order_id)
+        if not events or events[0].version > after_version + 1:
+            return None
+        return [event for event in events if event.version > after_version]
+
+    @property
+    def subscriber_count(self):
+        return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    # ------------------------------------------------------------------
+    # 발행 (어느 스레드에서든 호출 가능)
+    # ------------------------------------------------------------------
+    def publish(self, event):
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return  # 아직 구독자가 없었던 프로세스
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(event)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, event)
+
+    def _dispatch(self, event):
+        self.published += 1
+        events = self.history.get(event.id)
+        if events is None:
+            events = self.history[event.id] = deque(maxlen=self.history_size)
+            while len(self.history) > self.history_orders:
+                self.history.popitem(last=False)
+        else:
+            self.history.move_to_end(event.id)
+        events.append(event)
+
+        for subscription in list(self.subscribers.get(event.id, ())):
+            subscription.offer(event)
+            if subscription.lagged:
+                self.dropped += 1
+                self.unsubscribe(subscription)
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_hub():
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = OrderEventHub.from_settings()
+    return _hub
@@ -0,0 +1,56 @@
+"""
+주문 상태 이력 조회 (OrderStatusTransition)
+
+이력은 전이 엔진(orders/transitions.py)이 전이마다 한 행씩 추가합니다.
+- order_history(pk) : 주문의 전이 목록 ((order_id, version) 인덱스 범위 조회)
+- state_as_of(pk, t): t 시각의 상태 (as-of / time-travel 조회)
+  첫 전이 이전 구간은 첫 전이의 출발 상태, 이력이 없으면 주문의 현재 상태로 봅니다.
+  V1 API(save)처럼 전이 엔진을 거치지 않은 변경은 이력에 없습니다. 보관(archive)된 주문의 이력도 그대로 조회됩니다.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+from .models import ArchivedOrder, Order, OrderStatusTransition
+from .state_machine import TRANSITIONS
+
+# (출발 상태, 도착 상태) -> 행위. 상태 머신에서 쌍마다 행위가 하나뿐이라 이력에 행위를 저장하지 않습니다.
+_ACTIONS = {(source, t.target): t.action for t in TRANSITIONS.values() for source in t.sources}
+
+
+def action_for(from_status, to_status):
+    return _ACTIONS.get((from_status, to_status))
+
+
+def order_history(pk):
+    """pk 주문의 상태 이력 (version 오름차순)"""
+    return list(OrderStatusTransition.objects.filter(order_id=pk).order_by('version'))
+
+
+@dataclass(frozen=True)
+class OrderState:
+    status: str
+    version: int
+    since: datetime = None  # 이 상태가 된 시각 (알 수 없으면 None)
+
+
+def state_as_of(pk, when, history=None):
+    """when 시각의 주문 상태(OrderState). 그 시각에 주문이 없었거나 주문/이력이 모두 없으면 None"""
+    history = order_history(pk) if history is None else history
+    order = Order.objects.filter(pk=pk).values_list('status', 'version', 'created_at').first()
+    if order is None:  # 보관된 주문 (orders/archive.py)
+        archived = ArchivedOrder.objects.filter(pk=pk).values_list('status_code', 'version', 'created_at').first()
+        if archived is not None:
+            order = (OrderStatusTransition.STATUSES[archived[0]], *archived[1:])
+    if order is not None and when < order[2]:
+        return None
+
+    passed = [t for t in history if t.created_at <= when]
+    if passed:
+        last = passed[-1]
+        return OrderState(last.to_status, last.version, last.created_at)
+    if history:
+        first = history[0]
+        return OrderState(first.from_status, first.version - 1, order[2] if order else None)
+    if order is not None:
+        return OrderState(*order)
+    return None
@@ -0,0 +1,354 @@
+"""
+Idempotency-Key 저장소
+
+- 처리 전에 키를 원자적으로 선점합니다 (INSERT ... ON CONFLICT DO NOTHING, in_progress 상태).
+  SELECT 후 INSERT 하던 방식의 경쟁 상태(TOCTOU)가 없습니다.
+- 같은 키의 동시 중복 요청은 핸들러를 다시 실행하지 않고 첫 번째 처리 결과를 기다렸다가 그대로 받습니다.
+  (같은 프로세스: threading.Event 로 대기 / 다른 프로세스: DB 행이 completed 될 때까지 폴링)
+- 최근 완료된 응답은 프로세스 내 LRU에 보관하여, 재시도가 DB를 거치지 않게 합니다.
+- 키는 IDEMPOTENCY_KEY_TTL 동안만 유효하며, 만료된 키는 없는 키로 취급합니다.
+- 처리중(in_progress) 선점은 IDEMPOTENCY_IN_PROGRESS_TIMEOUT 동안만 유효합니다(lease). 처리하던 워커가 죽어
+  선점이 풀리지 않았으면 그 시간이 지난 뒤 같은 요청(같은 지문)의 재시도가 키를 넘겨받아 새로 처리합니다.
+  완료/해제는 선점 시각이 같은 행에만 적용되므로 늦게 끝난 이전 처리가 새 선점을 덮어쓰지 않습니다.
+  만료 행은 prune_expired()로 작은 배치 단위로 삭제합니다 (관리 명령 / 백그라운드 스레드).
+- 키마다 요청 지문(fingerprint)을 함께 저장하여, 같은 키를 다른 요청에 재사용하면 거부합니다.
+- 응답은 렌더링된 JSON bytes로 저장하여, 재응답 시 DRF 렌더링을 거치지 않습니다.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .models import IdempotencyKey
+
+
+logger = logging.getLogger('django')
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status: int
+    content: bytes  # 렌더링된 JSON
+    fingerprint: str = ''
+
+
+# run()의 반환값: 같은 키가 다른 요청(지문 불일치)에 이미 사용됨
+FINGERPRINT_MISMATCH = object()
+
+_renderer = JSONRenderer()
+
+
+def request_fingerprint(request, pk=None):
+    """
+    method + route + pk + 정규화된 body 로 요청 지문을 만듭니다.
+    body는 DRF가 이미 파싱해 둔 request.data를 그대로 사용합니다 (재파싱 없음).
+    """
+    data = request.data
+    if hasattr(data, 'lists'):  # QueryDict (form 요청)
+        data = dict(data.lists())
+    match = getattr(request, 'resolver_match', None)
+    route = match.route if match is not None else request.path
+    canonical = json.dumps(
+        [request.method, route, str(pk) if pk is not None else None, data],
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str,
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """스레드 안전한 크기 제한 LRU (ttl초가 지난 항목은 없는 것으로 취급)"""
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, 만료 시각(monotonic) 또는 None)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if self.maxsize <= 0 or ttl is not None and ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class IdempotencyStore:
+    def __init__(self, lru_size=1024, wait_timeout=10.0, poll_interval=0.05, ttl=60 * 60 * 24,
+                 in_progress_timeout=60.0):
+        self.ttl = ttl
+        self.in_progress_timeout = in_progress_timeout
+        self.completed = LRUCache(lru_size, ttl=ttl)
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._inflight = {}  # key -> threading.Event (이 프로세스에서 처리중인 키)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            lru_size=getattr(settings, 'IDEMPOTENCY_LRU_SIZE', 1024),
+            wait_timeout=getattr(settings, 'IDEMPOTENCY_WAIT_TIMEOUT', 10.0),
+            poll_interval=getattr(settings, 'IDEMPOTENCY_POLL_INTERVAL', 0.05),
+            ttl=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 60 * 60 * 24),
+            in_progress_timeout=getattr(settings, 'IDEMPOTENCY_IN_PROGRESS_TIMEOUT', 60.0),
+        )
+
+    def expiry_cutoff(self):
+        """이 시각 이전에 만들어진 키는 만료된 키입니다."""
+        return timezone.now() - timedelta(seconds=self.ttl)
+
+    def lease_cutoff(self):
+        """이 시각 이전에 선점된 처리중(in_progress) 키는 처리하던 요청이 죽은 것으로 보고 넘겨받을 수 있습니다."""
+        return timezone.now() - timedelta(seconds=self.in_progress_timeout)
+
+    # ------------------------------------------------------------------
+    # DB 연산
+    # ------------------------------------------------------------------
+    def _claim(self, key, fingerprint):
+        """
+        키 선점을 시도합니다. DB 왕복 1회.
+        만료된 키, 또는 같은 지문으로 lease가 지난 처리중 키가 남아 있으면 그 행을 새로 선점합니다.
+        반환: (선점 성공 여부, 이미 완료된 응답 또는 None, 그 응답의 남은 유효 시간(초))
+              선점에 성공하면 세 번째 값은 선점 시각 (완료/해제할 때 이 선점인지 확인하는 토큰)
+              다른 요청이 선점/완료한 키면 선점 실패 + 그 요청의 지문을 담은 결과를 돌려줍니다.
+        """
+        table = IdempotencyKey._meta.db_table
+        sql = f"""
+            WITH ins AS (
+                INSERT INTO {table} AS k (key, fingerprint, status, created_at)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (key) DO UPDATE
+                   SET fingerprint = EXCLUDED.fingerprint, status = EXCLUDED.status,
+                       created_at = EXCLUDED.created_at,
+                       response_status = NULL, response_content = NULL
+                 WHERE k.created_at < %s
+                    OR (k.status = %s AND k.fingerprint = EXCLUDED.fingerprint AND k.created_at < %s)
+                RETURNING id
+            )
+            SELECT TRUE, NULL, NULL, NULL, NULL, NULL FROM ins
+            UNION ALL
+            SELECT FALSE, fingerprint, status, response_status, response_content, created_at
+              FROM {table}
+             WHERE key = %s AND NOT EXISTS (SELECT 1 FROM ins)
+        """
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [
+                key, fingerprint, IdempotencyKey.Status.IN_PROGRESS, now, self.expiry_cutoff(),
+                IdempotencyKey.Status.IN_PROGRESS, self.lease_cutoff(), key,
+            ])
+            row = cursor.fetchone()
+
+        # 동시에 다른 트랜잭션이 방금 넣은 행은 이 문장의 스냅샷에 안 보일 수 있음 -> 처리중으로 간주
+        if row is None:
+            return False, None, None
+        claimed, stored_fingerprint, key_status, response_status, response_content, created_at = row
+        if claimed:
+            return True, None, now
+        if stored_fingerprint != fingerprint:
+            return False, FINGERPRINT_MISMATCH, None
+        if key_status == IdempotencyKey.Status.COMPLETED:
+            remaining = self.ttl - (now - created_at).total_seconds()
+            return False, StoredResponse(response_status, bytes(response_content), stored_fingerprint), remaining
+        return False, None, None
+
+    def _complete(self, key, stored, claimed_at):
+        IdempotencyKey.objects.filter(key=key, created_at=claimed_at).update(
+            status=IdempotencyKey.Status.COMPLETED,
+            response_status=stored.status,
+            response_content=stored.content,
+        )
+
+    def _release(self, key, claimed_at):
+        # 실패한 처리의 선점을 풀어 재시도가 새로 처리될 수 있게 합니다.
+        IdempotencyKey.objects.filter(
+            key=key, created_at=claimed_at, status=IdempotencyKey.Status.IN_PROGRESS
+        ).delete()
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run(self, key, handler, fingerprint=''):
+        """
+        key에 대해 handler()를 최대 한 번만 실행합니다.
+        반환:
+          - handler가 반환한 응답 (이번 요청이 실제로 처리한 경우)
+          - StoredResponse (이전/동시 요청의 결과를 재사용하는 경우)
+          - FINGERPRINT_MISMATCH (같은 키가 다른 요청에 이미 사용된 경우)
+          - None (다른 요청이 처리 중이고 wait_timeout 안에 끝나지 않은 경우)
+        """
+        cached = self._cached(key, fingerprint)
+        if cached is not None:
+            return cached
+
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with self._lock:
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+
+            if not leader:
+                # 같은 프로세스에서 처리중 -> 결과를 기다림 (DB 접근 없음)
+                event.wait(max(0.0, deadline - time.monotonic()))
+                cached = self._cached(key, fingerprint)
+                if cached is not None:
+                    return cached
+                if time.monotonic() >= deadline:
+                    return None
+                continue
+
+            try:
+                # 선점 성공이면 extra는 선점 시각, 완료된 응답이면 남은 유효 시간
+                claimed, stored, extra = self._claim(key, fingerprint)
+                if claimed:
+                    return self._execute(key, handler, fingerprint, claimed_at=extra)
+                if stored is FINGERPRINT_MISMATCH:
+                    return stored
+                if stored is not None:
+                    self.completed.set(key, stored, ttl=extra)
+                    return stored
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+            # 다른 프로세스가 처리중 -> 잠시 후 다시 확인
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def _cached(self, key, fingerprint):
+        cached = self.completed.get(key)
+        if cached is not None and cached.fingerprint != fingerprint:
+            return FINGERPRINT_MISMATCH
+        return cached
+
+    def _execute(self, key, handler, fingerprint, claimed_at):
+        try:
+            response = handler()
+        except Exception:
+            self._release(key, claimed_at)
+            raise
+
+        # 성공 응답(2xx)만 저장하여 재시도를 막고, 실패는 선점을 풀어 재시도 시 새로 처리되게 합니다.
+        if 200 <= response.status_code < 300:
+            stored = StoredResponse(response.status_code, _renderer.render(response.data), fingerprint)
+            self._complete(key, stored, claimed_at)
+            self.completed.set(key, stored)
+        else:
+            self._release(key, claimed_at)
+        return response
+
+
+# ----------------------------------------------------------------------
+# 만료 키 정리
+# ----------------------------------------------------------------------
+def prune_expired(batch_size=1000, cutoff=None, max_batches=None):
+    """
+    만료된 키를 batch_size개씩 나누어 삭제합니다. 배치마다 별도 문장(autocommit)이라
+    한 번에 오래 락을 잡지 않으며, 다른 정리 작업이 잡은 행은 SKIP LOCKED로 건너뜁니다.
+    배치마다 삭제된 행 수를 yield 합니다.
+    """
+    if cutoff is None:
+        cutoff = get_store().expiry_cutoff()
+    table = IdempotencyKey._meta.db_table
+    sql = f"""
+        DELETE FROM {table}
+         WHERE id IN (
+            SELECT id FROM {table}
+             WHERE created_at < %s
+             ORDER BY created_at
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+         )
+    """
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [cutoff, batch_size])
+            deleted = cursor.rowcount
+        batches += 1
+        yield deleted
+        if deleted < batch_size:
+            break
+
+
+def table_size():
+    """IdempotencyKey 테이블의 (행 수 추정치, 인덱스 포함 전체 크기 bytes)"""
+    table = IdempotencyKey._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint, pg_total_relation_size(oid) FROM pg_class WHERE oid = %s::regclass",
+            [table],
+        )
+        return cursor.fetchone()
+
+
+def start_background_pruner(interval, batch_size=1000):
+    """interval초마다 만료 키를 정리하는 데몬 스레드를 시작합니다."""
+    def loop():
+        from django.db import close_old_connections
+        while True:
+            time.sleep(interval)
+            try:
+                close_old_connections()
+                deleted = sum(prune_expired(batch_size=batch_size))
+                if deleted:
+                    logger.info("Pruned %d expired idempotency keys", deleted)
+            except Exception:
+                logger.exception("Idempotency key pruning failed")
+
+    thread = threading.Thread(target=loop, name='idempotency-pruner', daemon=True)
+    thread.start()
+    return thread
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = IdempotencyStore.from_settings()
+    return _store
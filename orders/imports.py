@@ -0,0 +1,210 @@
+"""
+주문 대량 생성 / 가져오기 (import_orders 명령, POST /api/v2/orders/bulk/)
+
+V1 API로 한 건씩 만들면 요청/트랜잭션/INSERT가 주문마다 한 번씩이라 수십만 건 적재에 몇 시간이 걸립니다.
+여기서는 CSV/JSONL 레코드를 한 줄씩 읽어 chunk_size 건씩 묶고, 묶음마다
+1) restaurant / rider 값(id 또는 이름)을 캐시에서 찾고, 캐시에 없는 값만 IN 쿼리 1회로 조회
+2) PostgreSQL COPY(기본) 또는 bulk_create 로 한 번에 INSERT
+합니다. 파일 전체를 메모리에 올리지 않으므로 메모리 사용량은 파일 크기와 무관하게 묶음 크기에 비례합니다.
+(FK 캐시만 서로 다른 식당/라이더 수만큼 커집니다)
+
+레코드 필드: restaurant, rider, restaurant_name, status, created_at (모두 선택)
+- restaurant / rider: 숫자면 id, 아니면 이름 (같은 이름이 여럿이면 id가 가장 작은 것)
+- restaurant_name: 없으면 식당 이름, 식당도 없으면 모델 기본값
+- status: 없으면 pending_payment. created_at: 없으면 지금 (COPY 로더만 지정 가능, bulk_create는 auto_now_add가 덮어씀)
+상태 이력/아웃박스는 전이에서만 생기므로 새 주문은 기록하지 않습니다 (V1 생성과 같음).
+"""
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Order, Restaurant, Rider
+
+_TABLE = Order._meta.db_table
+_COLUMNS = ('restaurant_id', 'rider_id', 'restaurant_name', 'status', 'created_at', 'version')
+_COPY_SQL = f"COPY {_TABLE} ({', '.join(_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+_DEFAULT_NAME = Order._meta.get_field('restaurant_name').default
+_NAME_MAX_LENGTH = Order._meta.get_field('restaurant_name').max_length
+
+FORMATS = ('csv', 'jsonl')
+
+
+class RowError(ValueError):
+    def __init__(self, row, message):
+        super().__init__(f"row {row}: {message}")
+        self.row = row
+        self.message = message
+
+
+def read_records(stream, fmt):
+    """(행 번호, dict) 를 한 줄씩 yield (스트림 전체를 읽어 두지 않음)"""
+    if fmt == 'csv':
+        for row, record in enumerate(csv.DictReader(stream), start=1):
+            yield row, record
+    elif fmt == 'jsonl':
+        for row, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield row, RowError(row, f"invalid JSON ({exc})")
+                continue
+            yield row, record if isinstance(record, dict) else RowError(row, "expected a JSON object")
+    else:
+        raise ValueError(f"Unknown format '{fmt}'. Use one of {', '.join(FORMATS)}.")
+
+
+def format_for(path, default='csv'):
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else default
+
+
+def _is_id(key):
+    return key.isascii() and key.isdigit()
+
+
+class ForeignKeyCache:
+    """식당/라이더 값(id 또는 이름) -> pk. 묶음마다 처음 보는 값만 조회하고, 없는 값도 기억해 다시 조회하지 않음"""
+
+    def __init__(self, model):
+        self.model = model
+        self._by_value = {}  # 입력 값(str) -> pk 또는 None
+        self.names = {}  # pk -> 이름 (restaurant_name 기본값)
+        self.queries = 0
+
+    @staticmethod
+    def key(value):
+        if value is None:
+            return None
+        value = str(value).strip()
+        return value or None
+
+    def prefetch(self, values):
+        unknown = {key for key in map(self.key, values) if key is not None and key not in self._by_value}
+        if not unknown:
+            return
+        ids = {int(key) for key in unknown if _is_id(key)}
+        names = {key for key in unknown if not _is_id(key) and '\x00' not in key}  # NUL은 쿼리에 넣을 수 없음 -> 없는 값
+        rows = self.model.objects.filter(pk__in=ids) | self.model.objects.filter(name__in=names)
+        self.queries += 1
+        for pk, name in rows.order_by('pk').values_list('pk', 'name'):
+            self.names[pk] = name
+            if pk in ids:
+                self._by_value[str(pk)] = pk
+            self._by_value.setdefault(name, pk)
+        for key in unknown:
+            self._by_value.setdefault(key, None)
+
+    def resolve(self, value, row, label):
+        key = self.key(value)
+        if key is None:
+            return None
+        pk = self._by_value.get(key)
+        if pk is None:
+            raise RowError(row, f"unknown {label} '{key}'")
+        return pk
+
+
+@dataclass
+class ChunkReport:
+    rows: int
+    seconds: float
+    errors: list = field(default_factory=list)  # [RowError] (skip_errors일 때 건너뛴 행)
+    ids: list = None  # bulk_create 로더만
+
+    @property
+    def throughput(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class OrderImporter:
+    def __init__(self, chunk_size=5000, method='copy', skip_errors=False):
+        if method not in ('copy', 'bulk_create'):
+            raise ValueError(f"Unknown method '{method}'")
+        self.chunk_size = chunk_size
+        self.method = method
+        self.skip_errors = skip_errors  # False면 첫 오류 행에서 RowError
+        self.restaurants = ForeignKeyCache(Restaurant)
+        self.riders = ForeignKeyCache(Rider)
+
+    def run(self, records):
+        """(행 번호, 레코드) 이터러블을 chunk_size 건씩 적재하며 묶음마다 ChunkReport를 yield"""
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return
+            yield self.load_chunk(chunk)
+
+    def load_chunk(self, chunk):
+        started = time.perf_counter()
+        valid = [(row, record) for row, record in chunk if isinstance(record, dict)]
+        self.restaurants.prefetch(record.get('restaurant') for _, record in valid)
+        self.riders.prefetch(record.get('rider') for _, record in valid)
+
+        now = timezone.now()
+        values, errors = [], []
+        for row, record in chunk:
+            try:
+                if isinstance(record, RowError):
+                    raise record
+                values.append(self.to_values(row, record, now))
+            except RowError as exc:
+                if not self.skip_errors:
+                    raise
+                errors.append(exc)
+
+        ids = None
+        if values:
+            with transaction.atomic():
+                if self.method == 'copy':
+                    self.copy(values)
+                else:
+                    ids = [order.pk for order in Order.objects.bulk_create(
+                        [Order(**dict(zip(_COLUMNS, v))) for v in values])]
+        return ChunkReport(len(values), time.perf_counter() - started, errors, ids)
+
+    def to_values(self, row, record, now):
+        restaurant_id = self.restaurants.resolve(record.get('restaurant'), row, 'restaurant')
+        rider_id = self.riders.resolve(record.get('rider'), row, 'rider')
+
+        name = str(record.get('restaurant_name') or self.restaurants.names.get(restaurant_id) or _DEFAULT_NAME)
+        if len(name) > _NAME_MAX_LENGTH:
+            raise RowError(row, f"restaurant_name longer than {_NAME_MAX_LENGTH} characters")
+        if '\x00' in name:  # PostgreSQL 텍스트에 저장할 수 없음 (COPY가 DataError로 실패)
+            raise RowError(row, "restaurant_name contains a NUL character")
+
+        status = record.get('status') or Order.Status.PENDING_PAYMENT
+        if status not in Order.Status.values:
+            raise RowError(row, f"unknown status '{status}'")
+
+        created_at = record.get('created_at') or None
+        if created_at is not None:
+            if self.method != 'copy':
+                raise RowError(row, "created_at can only be set by the COPY loader")
+            try:
+                parsed = parse_datetime(str(created_at))
+            except ValueError:  # 형식은 맞지만 없는 날짜 (2월 30일 등)
+                parsed = None
+            if parsed is None:
+                raise RowError(row, f"invalid created_at '{created_at}'")
+            created_at = parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+        return restaurant_id, rider_id, name, str(status), created_at or now, 1
+
+    def copy(self, values):
+        # 묶음 하나를 CSV 텍스트로 만들어 COPY FROM STDIN (None -> 따옴표 없는 빈 값 = NULL)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for restaurant_id, rider_id, name, status, created_at, version in values:
+            writer.writerow((restaurant_id, rider_id, name, status, created_at.isoformat(), version))
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(_COPY_SQL, buffer)
@@ -0,0 +1,205 @@
+"""
+외부 연동 지연 시뮬레이션 (latency injection)
+
+경쟁 상태(race condition) 재현용으로 요청 처리 중간에 넣던 time.sleep()을 대신합니다.
+행위(action)마다 지연 프로필을 지정하며, 지정하지 않은 행위는 지연 없이 바로 반환합니다(기본값: 꺼짐).
+
+프로필 형식
+- 'off'                     : 지연 없음
+- 'fixed:<초>'              : 고정 지연
+- 'uniform:<최소>:<최대>'    : 균등 분포
+- 'normal:<평균>:<표준편차>' : 정규 분포 (0 미만은 0)
+- 'exponential:<평균>'      : 지수 분포 (긴 꼬리 지연)
+표본은 settings.ORDER_LATENCY_MAX 초를 넘지 않습니다.
+
+설정
+- settings.ORDER_LATENCY_PROFILES = {'v1_update': 'fixed:3', 'payment': 'uniform:0.3:0.7'}
+- X-Simulated-Latency 요청 헤더 (settings.ORDER_LATENCY_ALLOW_HEADER 가 True일 때만)
+    X-Simulated-Latency: fixed:0.5                    -> 이 요청의 모든 행위
+    X-Simulated-Latency: payment=fixed:0.5, v1_update=off
+
+지연은 DB 트랜잭션 밖에서만 넣습니다. 트랜잭션 안에서 기다리면 그동안 행 잠금과 연결을 잡고 있으므로
+inject()/ainject()는 열린 트랜잭션 안에서 호출되면 RuntimeError를 냅니다.
+넣은 지연은 행위별 횟수/합계/최댓값으로 집계합니다 (get_injector().stats(), GET /api/v2/metrics/).
+"""
+import asyncio
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+from rest_framework.exceptions import ParseError
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'X-Simulated-Latency'
+ALL_ACTIONS = '*'
+
+# 현재 요청의 헤더 프로필 {행위 또는 '*': LatencyProfile} (request_latency()가 설정)
+_request_profiles = contextvars.ContextVar('order_request_latency', default=None)
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    kind: str
+    params: tuple = ()
+
+    # 종류 -> 인자 개수
+    KINDS = {'off': 0, 'fixed': 1, 'uniform': 2, 'normal': 2, 'exponential': 1}
+
+    @classmethod
+    def parse(cls, spec):
+        """'uniform:0.3:0.7' -> LatencyProfile. 형식이 잘못되면 ValueError"""
+        kind, *args = str(spec).strip().split(':')
+        if kind not in cls.KINDS or len(args) != cls.KINDS[kind]:
+            raise ValueError(f"Invalid latency profile: {spec!r}")
+        params = tuple(float(arg) for arg in args)
+        if any(p < 0 for p in params) or (kind == 'uniform' and params[0] > params[1]):
+            raise ValueError(f"Invalid latency profile: {spec!r}")
+        return cls(kind, params)
+
+    @property
+    def enabled(self):
+        return self.kind != 'off'
+
+    def sample(self, rng=random):
+        if self.kind == 'fixed':
+            return self.params[0]
+        if self.kind == 'uniform':
+            return rng.uniform(*self.params)
+        if self.kind == 'normal':
+            return max(0.0, rng.gauss(*self.params))
+        if self.kind == 'exponential':
+            return rng.expovariate(1 / self.params[0]) if self.params[0] else 0.0
+        return 0.0
+
+
+OFF = LatencyProfile('off')
+
+
+def in_held_transaction():
+    """
+    DB 트랜잭션(atomic)이 열려 있는지. 실행 환경이 요청 바깥에서 미리 연 atomic 단계
+    (settings.ORDER_LATENCY_OUTER_ATOMIC_DEPTH, 예: 테스트 케이스가 감싼 2단계)는 세지 않습니다.
+    """
+    if not connection.in_atomic_block:
+        return False
+    # 가장 바깥 atomic 1단계 + 안쪽 atomic마다 savepoint_ids 1개 (savepoint=False여도 None으로 쌓임)
+    depth = 1 + len(connection.savepoint_ids)
+    return depth > getattr(settings, 'ORDER_LATENCY_OUTER_ATOMIC_DEPTH', 0)
+
+
+class LatencyInjector:
+    def __init__(self, profiles=None, allow_header=False, max_delay=10.0):
+        self.profiles = {action: LatencyProfile.parse(spec) for action, spec in (profiles or {}).items()}
+        self.allow_header = allow_header
+        self.max_delay = max_delay
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            profiles=getattr(settings, 'ORDER_LATENCY_PROFILES', {}),
+            allow_header=getattr(settings, 'ORDER_LATENCY_ALLOW_HEADER', False),
+            max_delay=getattr(settings, 'ORDER_LATENCY_MAX', 10.0),
+        )
+
+    def parse_header(self, value):
+        """X-Simulated-Latency 헤더 -> {행위 또는 '*': LatencyProfile}. 잘못된 형식은 ParseError(400)"""
+        profiles = {}
+        for entry in value.split(','):
+            if not entry.strip():
+                continue
+            action, _, spec = entry.rpartition('=')
+            try:
+                profiles[action.strip() or ALL_ACTIONS] = LatencyProfile.parse(spec)
+            except ValueError as exc:
+                raise ParseError(f"{HEADER}: {exc}")
+        return profiles
+
+    def profile_for(self, action):
+        overrides = _request_profiles.get()
+        if overrides:
+            profile = overrides.get(action, overrides.get(ALL_ACTIONS))
+            if profile is not None:
+                return profile
+        return self.profiles.get(action, OFF)
+
+    def delay_for(self, action):
+        """이번에 넣을 지연(초). 꺼져 있으면 0"""
+        profile = self.profile_for(action)
+        return min(profile.sample(), self.max_delay) if profile.enabled else 0.0
+
+    def inject(self, action):
+        """action 프로필만큼 현재 스레드를 재움. 넣은 지연(초) 반환"""
+        delay = self._prepare(action)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def ainject(self, action):
+        """inject()의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        delay = self._prepare(action)
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+    def _prepare(self, action):
+        delay = self.delay_for(action)
+        if delay:
+            if in_held_transaction():
+                raise RuntimeError(f"Latency injection for {action!r} inside a DB transaction")
+            self._record(action, delay)
+            logger.debug("injected %.3fs latency into %s", delay, action)
+        return delay
+
+    # ------------------------------------------------------------------
+    # 집계
+    # ------------------------------------------------------------------
+    def _record(self, action, delay):
+        with self._lock:
+            count, total, longest = self._stats.get(action, (0, 0.0, 0.0))
+            self._stats[action] = (count + 1, total + delay, max(longest, delay))
+
+    def stats(self):
+        """{행위: {'count', 'total', 'max'}} 지금까지 넣은 지연(초)"""
+        with self._lock:
+            return {
+                action: {'count': count, 'total': total, 'max': longest}
+                for action, (count, total, longest) in self._stats.items()
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+@contextmanager
+def request_latency(request):
+    """요청의 X-Simulated-Latency 헤더를 이 구간의 지연 프로필로 적용 (허용된 경우만)"""
+    injector = get_injector()
+    value = request.headers.get(HEADER) if injector.allow_header else None
+    token = _request_profiles.set(injector.parse_header(value) if value else None)
+    try:
+        yield
+    finally:
+        _request_profiles.reset(token)
+
+
+_injector = None
+_injector_lock = threading.Lock()
+
+
+def get_injector():
+    global _injector
+    if _injector is None:
+        with _injector_lock:
+            if _injector is None:
+                _injector = LatencyInjector.from_settings()
+    return _injector
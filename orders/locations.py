@@ -0,0 +1,217 @@
+"""
+라이더 위치 수집 (버퍼링 + 병합 + 주기적 일괄 UPDATE)
+
+라이더 앱은 몇 초마다 위치를 보내므로 핑마다 UPDATE 하면 라이더 수만큼 작은 쓰기가 초마다 쌓입니다.
+POST /api/v2/riders/locations/ 로 받은 핑은 DB에 바로 쓰지 않고 프로세스 메모리에 모읍니다.
+- pending : rider_id -> 마지막 핑. 같은 플러시 창 안의 이전 핑은 덮어씀 (라이더당 1행만 남음)
+- latest  : rider_id -> 마지막 위치. 받는 즉시 반영되는 읽기용 맵 (DB보다 최대 flush_interval 앞섬)
+flush_interval마다 백그라운드 스레드가 pending을 통째로 떼어 내 UPDATE ... FROM unnest(...) 한 문장으로 씁니다.
+보고 시각(at)이 DB에 기록된 것보다 오래된 핑은 덮어쓰지 않으므로 순서가 뒤바뀌어 도착해도 안전합니다.
+받은 시각보다 미래인 보고 시각(기기 시계 오차)은 받은 시각으로 자릅니다.
+UPDATE ... RETURNING 으로 받은 배차 가능 여부로 배차 격자 인덱스(orders/dispatch.py)도 함께 갱신합니다.
+
+프로세스가 비정상 종료되면 마지막 플러시 이후 핑은 사라집니다 (다음 핑이 곧 다시 오므로 허용).
+"""
+import atexit
+import logging
+import math
+import threading
+from dataclasses import dataclass, replace
+
+from django.conf import settings
+from django.db import DataError, close_old_connections, connection, transaction
+from django.db.models import BigIntegerField
+from django.utils import timezone
+
+from .models import Rider
+
+logger = logging.getLogger(__name__)
+
+_TABLE = Rider._meta.db_table
+
+# 보고 시각이 더 최신인 행만 갱신 (늦게 도착한 이전 핑 무시)
+_FLUSH_SQL = f"""
+    UPDATE {_TABLE} AS r
+       SET latitude = v.lat, longitude = v.lon, location_updated_at = v.at
+      FROM unnest(%s::bigint[], %s::float8[], %s::float8[], %s::timestamptz[]) AS v(id, lat, lon, at)
+     WHERE r.id = v.id
+       AND (r.location_updated_at IS NULL OR r.location_updated_at < v.at)
+ RETURNING r.id, r.latitude, r.longitude, r.is_available
+"""
+
+
+@dataclass(frozen=True)
+class LocationPing:
+    rider_id: int
+    latitude: float
+    longitude: float
+    at: object  # 보고 시각 (aware datetime)
+
+
+def _storable(ping):
+    """rider_id(bigint), 좌표(float8 유한값) 범위 안의 핑인지"""
+    return (0 < ping.rider_id <= BigIntegerField.MAX_BIGINT
+            and math.isfinite(ping.latitude) and math.isfinite(ping.longitude))
+
+
+class LocationBuffer:
+    def __init__(self, flush_interval=1.0, max_pending=50_000):
+        self.flush_interval = flush_interval  # None이면 백그라운드 플러시 없음 (flush() 직접 호출)
+        self.max_pending = max_pending  # pending이 이만큼 쌓이면 받은 요청에서 바로 플러시
+        self._pending = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # 플러시는 한 번에 하나 (백그라운드 / max_pending 초과)
+        self._thread = None
+        self._stop = threading.Event()
+        self.reset_stats()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            flush_interval=getattr(settings, 'ORDER_LOCATION_FLUSH_INTERVAL', 1.0),
+            max_pending=getattr(settings, 'ORDER_LOCATION_MAX_PENDING', 50_000),
+        )
+
+    def add(self, pings):
+        """핑 목록을 버퍼에 병합. 받은 핑 수 반환"""
+        now = timezone.now()
+        with self._lock:
+            pending, latest = self._pending, self._latest
+            for ping in pings:
+                if ping.at > now:
+                    # 시계가 앞선 기기의 미래 시각 핑이 이후의 실제 핑을 모두 "오래된 핑"으로 만들지 않도록 받은 시각으로 자름
+                    ping = replace(ping, at=now)
+                    self.stats['clamped'] += 1
+                current = latest.get(ping.rider_id)
+                if current is not None and current.at > ping.at:
+                    self.stats['stale'] += 1  # 이미 더 최신 위치를 받음
+                    continue
+                if ping.rider_id in pending:
+                    self.stats['coalesced'] += 1
+                pending[ping.rider_id] = ping
+                latest[ping.rider_id] = ping
+            self.stats['received'] += len(pings)
+            overflow = len(pending) >= self.max_pending
+        if overflow:
+            try:
+                self.flush()
+            except Exception:
+                # 일시적인 DB 오류: 핑은 flush()가 버퍼에 되돌려 놓았으므로 요청은 그대로 받고 다음 플러시에서 다시 시도
+                logger.exception("Rider location flush failed")
+        if self.flush_interval and self._thread is None:
+            self.start()
+        return len(pings)
+
+    def latest(self, rider_id):
+        """가장 최근에 받은 핑 (아직 DB에 쓰이지 않았을 수 있음). 없으면 None"""
+        return self._latest.get(rider_id)
+
+    def positions(self, rider_ids):
+        """{rider_id: LocationPing} 한 시점의 일관된 사본. 이 프로세스가 받지 않은 라이더는 DB 값으로 채움"""
+        with self._lock:
+            found = {pk: self._latest[pk] for pk in rider_ids if pk in self._latest}
+        missing = [pk for pk in rider_ids if pk not in found]
+        if missing:
+            rows = Rider.objects.filter(pk__in=missing, latitude__isnull=False).values_list(
+                'id', 'latitude', 'longitude', 'location_updated_at')
+            found.update((row[0], LocationPing(*row)) for row in rows)
+        return found
+
+    def flush(self):
+        """모인 핑을 한 문장으로 기록. 쓴 행 수 반환"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            pings = list(batch.values())
+            try:
+                rows = self._write(pings)
+            except DataError:
+                # 값 자체가 잘못된 핑(범위 밖 id/좌표 등)은 되돌려 놓으면 이후 플러시가 모두 실패하므로
+                # 저장할 수 있는 핑만 남겨 한 번 더 쓰고, 그래도 실패하면 이번 배치는 버림 (다음 핑이 곧 다시 옴)
+                valid = [p for p in pings if _storable(p)]
+                try:
+                    rows = self._write(valid) if valid and len(valid) < len(pings) else None
+                except DataError:
+                    rows = None
+                dropped = len(pings) - len(valid) if rows is not None else len(pings)
+                with self._lock:
+                    self.stats['dropped'] += dropped
+                logger.exception("Dropped %d rider location pings that could not be stored", dropped)
+                if rows is None:
+                    return 0
+            except Exception:
+                # 일시적인 오류(연결 끊김 등): 그 사이 들어온 더 최신 핑이 없을 때만 되돌려 놓음
+                with self._lock:
+                    for ping in pings:
+                        self._pending.setdefault(ping.rider_id, ping)
+                raise
+            with self._lock:
+                self.stats['flushes'] += 1
+                self.stats['written'] += len(rows)
+            self._refresh_dispatch_index(rows)
+            return len(rows)
+
+    def _write(self, pings):
+        # 호출자의 트랜잭션 안에서도 실패한 문장만 되돌리도록 savepoint로 감쌈
+        with self._lock:
+            self.stats['statements'] += 1
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(_FLUSH_SQL, [
+                [p.rider_id for p in pings], [p.latitude for p in pings],
+                [p.longitude for p in pings], [p.at for p in pings],
+            ])
+            return cursor.fetchall()
+
+    def _refresh_dispatch_index(self, rows):
+        from .dispatch import get_dispatcher
+
+        dispatcher = get_dispatcher()
+        if dispatcher.loaded:
+            for rider_id, lat, lon, available in rows:
+                dispatcher.grid.update(rider_id, lat, lon, available)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='location-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.flush_interval):
+                try:
+                    close_old_connections()
+                    self.flush()
+                except Exception:
+                    logger.exception("Rider location flush failed")
+        finally:
+            connection.close()
+
+    def reset_stats(self):
+        self.stats = {
+            'received': 0, 'coalesced': 0, 'stale': 0, 'clamped': 0, 'dropped': 0, 'flushes': 0, 'statements': 0, 'written': 0,
+        }
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_location_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = LocationBuffer.from_settings()
+    return _buffer
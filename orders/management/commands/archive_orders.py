@@ -0,0 +1,72 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from orders.archive import archive_orders, incremental_since, index_sizes
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = "종료 상태(배달 완료/취소/거절)로 오래된 주문을 보관 테이블(ArchivedOrder)로 배치 단위로 옮깁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'ORDER_ARCHIVE_AFTER_DAYS', 30),
+            help="생성 후 이 일수가 지난 종료 주문을 보관",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=getattr(settings, 'ORDER_ARCHIVE_BATCH_SIZE', 1000),
+            help="한 트랜잭션에서 옮기는 최대 주문 수",
+        )
+        parser.add_argument('--max-batches', type=int, default=None, help="최대 배치 수 (기본: 끝날 때까지)")
+        parser.add_argument('--pause', type=float, default=0.0, help="배치 사이 대기 시간(초)")
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help="이미 보관한 가장 최근 주문 이후에 생성된 주문만 훑음 (자주 실행하는 cron 용)",
+        )
+        parser.add_argument(
+            '--reindex', action='store_true',
+            help="끝난 뒤 주문 테이블 인덱스를 REINDEX CONCURRENTLY 로 다시 만들어 빈 공간을 돌려받음",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        since = incremental_since() if options['incremental'] else None
+        self.report_index_sizes("인덱스 크기(전)")
+        self.stdout.write(
+            f"보관 기준: created_at < {cutoff.isoformat()}" + (f", >= {since.isoformat()}" if since else "")
+        )
+
+        total = 0
+        started = time.perf_counter()
+        batches = archive_orders(cutoff, options['batch_size'], since=since, max_batches=options['max_batches'])
+        for i, batch in enumerate(batches, start=1):
+            total += batch.moved
+            if options['verbosity'] > 1:
+                self.stdout.write(
+                    f"  batch {i}: {batch.moved} rows (~id {batch.last_id}) in {batch.seconds * 1000:.0f}ms"
+                    f" ({batch.throughput:,.0f} rows/s)"
+                )
+            if options['pause']:
+                time.sleep(options['pause'])
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(self.style.SUCCESS(f"{total:,} orders archived in {elapsed:.2f}s ({rate:,.0f} rows/s)"))
+
+        if options['reindex'] and total:
+            # 삭제한 행의 인덱스 공간은 VACUUM 후 재사용될 뿐 줄지 않으므로 다시 만듦 (쓰기를 막지 않음)
+            with connection.cursor() as cursor:
+                cursor.execute(f'REINDEX TABLE CONCURRENTLY {connection.ops.quote_name(Order._meta.db_table)}')
+        self.report_index_sizes("인덱스 크기(후)")
+
+    def report_index_sizes(self, title):
+        self.stdout.write(f"{title}:")
+        for table, indexes in index_sizes().items():
+            total = sum(size for _, size in indexes)
+            self.stdout.write(f"  {table}: {total / 1024:,.1f} KiB")
+            for name, size in indexes:
+                self.stdout.write(f"    {name}: {size / 1024:,.1f} KiB")
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.outbox import OutboxDispatcher, pending_count
+
+
+class Command(BaseCommand):
+    help = "주문 이벤트 아웃박스(OrderEvent)의 미전송 행을 배치로 꺼내 싱크로 보냅니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sink', action='append', dest='sinks', default=None,
+            help="싱크 (여러 번 지정 가능): log:<경로> / http://... / callback:<점 경로>. 기본: settings.ORDER_OUTBOX_SINKS",
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=getattr(settings, 'ORDER_OUTBOX_BATCH_SIZE', 500),
+            help="한 트랜잭션에서 잠그고 보내는 최대 이벤트 수",
+        )
+        parser.add_argument('--workers', type=int, default=1, help="병렬 워커(스레드) 수. 주문 id로 나눠 맡음")
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'ORDER_OUTBOX_POLL_INTERVAL', 1.0),
+            help="보낼 이벤트가 없을 때 다시 확인하는 간격(초)",
+        )
+        parser.add_argument('--once', action='store_true', help="밀린 이벤트를 모두 보내면 종료")
+        parser.add_argument('--delete', action='store_true', help="전송한 행을 dispatched_at 기록 대신 삭제")
+
+    def handle(self, *args, **options):
+        dispatcher = OutboxDispatcher.from_settings(
+            sinks=options['sinks'],
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            delete=options['delete'],
+        )
+        if not dispatcher.sinks:
+            raise CommandError("싱크가 없습니다. --sink 또는 settings.ORDER_OUTBOX_SINKS 를 지정하세요.")
+
+        self.stdout.write(
+            f"미전송 이벤트: {pending_count():,}건, workers={dispatcher.workers}, batch={dispatcher.batch_size}"
+        )
+        lock = threading.Lock()
+        totals = {'events': 0, 'batches': 0, 'max_lag': 0.0}
+
+        def on_batch(report):
+            with lock:
+                totals['events'] += report.size
+                totals['batches'] += 1
+                totals['max_lag'] = max(totals['max_lag'], report.lag)
+                if options['verbosity'] > 0:
+                    self.stdout.write(
+                        f"  [w{report.worker}] {report.size} events in {report.seconds * 1000:.1f}ms"
+                        f" ({report.throughput:,.0f} ev/s), lag {report.lag:.3f}s"
+                    )
+
+        started = time.perf_counter()
+        try:
+            dispatcher.run(once=options['once'], poll_interval=options['poll_interval'], on_batch=on_batch)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            dispatcher.close()
+        elapsed = time.perf_counter() - started
+
+        if dispatcher.errors:
+            raise CommandError(f"워커 {len(dispatcher.errors)}개가 실패했습니다: {dispatcher.errors[0]!r}")
+        rate = totals['events'] / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['events']:,} events in {totals['batches']:,} batches, {elapsed:.2f}s"
+            f" ({rate:,.0f} ev/s), max lag {totals['max_lag']:.3f}s"
+        ))
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orders.dispatch import get_dispatcher
+
+
+class Command(BaseCommand):
+    help = "라이더가 배정되지 않은 픽업 대기 주문에 가장 가까운 배차 가능 라이더를 배정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="한 번에 꺼내는 최대 주문 수")
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'ORDER_DISPATCH_POLL_INTERVAL', 5.0),
+            help="배정할 주문이 없거나 남은 주문에 라이더가 없을 때 다시 확인하는 간격(초)",
+        )
+        parser.add_argument('--once', action='store_true', help="밀린 주문을 한 번 훑고 종료")
+
+    def handle(self, *args, **options):
+        dispatcher = get_dispatcher()
+        dispatcher.load()
+        self.stdout.write(f"배차 가능 라이더: {len(dispatcher.grid):,}명")
+
+        totals = {'orders': 0, 'assigned': 0}
+        started = time.perf_counter()
+        try:
+            while True:
+                tried, assigned, seconds = dispatcher.assign_pending(options['batch_size'])
+                totals['orders'] += tried
+                totals['assigned'] += assigned
+                if tried and options['verbosity'] > 0:
+                    self.stdout.write(
+                        f"  {assigned}/{tried} orders assigned in {seconds * 1000:.1f}ms"
+                        f" ({seconds * 1000 / tried:.2f}ms/order)"
+                    )
+                if options['once']:
+                    break
+                if assigned < options['batch_size']:
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['assigned']:,} of {totals['orders']:,} orders assigned in {elapsed:.2f}s"
+        ))
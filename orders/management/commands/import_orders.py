@@ -0,0 +1,65 @@
+import csv
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DataError, reset_queries
+
+from orders.imports import FORMATS, OrderImporter, RowError, format_for, read_records
+
+
+class Command(BaseCommand):
+    help = "CSV/JSONL 파일의 주문을 묶음 단위(COPY 또는 bulk_create)로 적재합니다. 파일은 한 줄씩 읽습니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV/JSONL 파일 경로 ('-' 이면 표준 입력)")
+        parser.add_argument('--format', choices=FORMATS, default=None, help="기본: 확장자로 판단 (.jsonl/.ndjson 외에는 csv)")
+        parser.add_argument(
+            '--chunk-size', type=int, default=getattr(settings, 'ORDER_IMPORT_CHUNK_SIZE', 5000),
+            help="한 트랜잭션에서 적재하는 행 수",
+        )
+        parser.add_argument(
+            '--method', choices=('copy', 'bulk_create'), default='copy',
+            help="copy: PostgreSQL COPY FROM STDIN (기본, created_at 지정 가능) / bulk_create: ORM 다중 행 INSERT",
+        )
+        parser.add_argument('--skip-errors', action='store_true', help="잘못된 행은 건너뛰고 끝에 알려줌 (기본: 첫 오류에서 중단)")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or format_for(path)
+        importer = OrderImporter(options['chunk_size'], options['method'], options['skip_errors'])
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        total, errors = 0, []
+        started = time.perf_counter()
+        try:
+            for i, report in enumerate(importer.run(read_records(stream, fmt)), start=1):
+                reset_queries()  # DEBUG=True여도 묶음마다 쌓이는 쿼리 로그(bulk_create는 SQL이 큼)를 비움
+                total += report.rows
+                errors.extend(report.errors)
+                if options['verbosity'] > 1:
+                    self.stdout.write(
+                        f"  chunk {i}: {report.rows:,} rows in {report.seconds * 1000:.0f}ms"
+                        f" ({report.throughput:,.0f} rows/s)"
+                    )
+        except RowError as exc:
+            # 이전 묶음은 이미 커밋됨. 오류 행을 고친 뒤 그 행부터 다시 적재
+            raise CommandError(f"{exc} ({total:,} rows imported before the error)")
+        except (UnicodeDecodeError, csv.Error, DataError) as exc:
+            # 파일 인코딩/형식 오류, DB가 거부한 값: 오류가 난 묶음만 롤백됨
+            raise CommandError(f"{str(exc).strip().splitlines()[0]} ({total:,} rows imported before the error)")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - started
+
+        for error in errors[:10]:
+            self.stderr.write(f"  skipped {error}")
+        if len(errors) > 10:
+            self.stderr.write(f"  ... {len(errors) - 10:,} more")
+        rate = total / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"{total:,} orders imported in {elapsed:.2f}s ({rate:,.0f} rows/s), {len(errors):,} rows skipped,"
+            f" FK lookups: {importer.restaurants.queries + importer.riders.queries} queries"
+        ))
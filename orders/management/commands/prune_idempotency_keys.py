@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from orders.idempotency import prune_expired, table_size
+
+
+class Command(BaseCommand):
+    help = "만료된 Idempotency-Key 행을 작은 배치 단위로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=getattr(settings, 'IDEMPOTENCY_PRUNE_BATCH_SIZE', 1000),
+            help="한 번에 삭제하는 최대 행 수",
+        )
+        parser.add_argument(
+            '--ttl', type=int,
+            default=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 60 * 60 * 24),
+            help="보관 기간(초). 이보다 오래된 키를 삭제",
+        )
+        parser.add_argument('--max-batches', type=int, default=None, help="최대 배치 수 (기본: 끝날 때까지)")
+        parser.add_argument('--pause', type=float, default=0.0, help="배치 사이 대기 시간(초)")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options['ttl'])
+        rows_before, bytes_before = table_size()
+        self.stdout.write(f"테이블 크기(전): ~{rows_before:,} rows, {bytes_before / 1024:,.1f} KiB")
+        self.stdout.write(f"삭제 기준: created_at < {cutoff.isoformat()}")
+
+        total = 0
+        started = time.perf_counter()
+        batches = prune_expired(
+            batch_size=options['batch_size'], cutoff=cutoff, max_batches=options['max_batches']
+        )
+        for i, deleted in enumerate(batches, start=1):
+            total += deleted
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  batch {i}: {deleted} rows")
+            if options['pause'] and deleted:
+                time.sleep(options['pause'])
+        elapsed = time.perf_counter() - started
+
+        rows_after, bytes_after = table_size()
+        rate = total / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(f"테이블 크기(후): ~{rows_after:,} rows, {bytes_after / 1024:,.1f} KiB")
+        self.stdout.write(self.style.SUCCESS(
+            f"{total:,} keys pruned in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+        ))
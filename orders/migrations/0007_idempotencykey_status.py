@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_restaurant_rider_order_restaurant_order_rider'),
+    ]
+
+    operations = [
+        # 기존 행은 모두 처리 완료된 응답이므로 completed로 채운 뒤 기본값을 in_progress로 바꿉니다.
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='status',
+            field=models.CharField(choices=[('in_progress', '처리중'), ('completed', '처리 완료')], default='completed', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='status',
+            field=models.CharField(choices=[('in_progress', '처리중'), ('completed', '처리 완료')], default='in_progress', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='response_body',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='response_status',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # 키 발급마다 INSERT 되는 테이블이므로 쓰기를 막지 않도록 CREATE INDEX CONCURRENTLY (트랜잭션 밖에서 실행)
+    atomic = False
+
+    dependencies = [
+        ('orders', '0007_idempotencykey_status'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='idempotencykey',
+            index=models.Index(fields=['created_at'], name='idempotency_created_idx'),
+        ),
+    ]
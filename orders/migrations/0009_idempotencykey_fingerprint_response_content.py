@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+
+def render_stored_responses(apps, schema_editor):
+    # 기존 JSON 응답을 DRF JSONRenderer와 같은 형식의 bytes로 변환
+    from rest_framework.renderers import JSONRenderer
+
+    IdempotencyKey = apps.get_model('orders', 'IdempotencyKey')
+    renderer = JSONRenderer()
+    for row in IdempotencyKey.objects.exclude(response_body=None).iterator():
+        row.response_content = renderer.render(row.response_body)
+        row.save(update_fields=['response_content'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_idempotencykey_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='response_content',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(render_stored_responses, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='idempotencykey',
+            name='response_body',
+        ),
+    ]
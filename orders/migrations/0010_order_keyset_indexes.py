@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:08
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # 큰 주문 테이블에서 쓰기를 막지 않도록 CREATE INDEX CONCURRENTLY (트랜잭션 밖에서 실행)
+    atomic = False
+
+    dependencies = [
+        ('orders', '0009_idempotencykey_fingerprint_response_content'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['-created_at', '-id'], name='order_created_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='order_status_created_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['restaurant', '-created_at', '-id'], name='order_rest_created_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['rider', '-created_at', '-id'], name='order_rider_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_orderevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField()),
+                ('from_code', models.PositiveSmallIntegerField()),
+                ('to_code', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('order', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='status_history', to='orders.order')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='order_transition_created_idx')],
+                'constraints': [models.UniqueConstraint(fields=('order', 'version'), name='order_transition_version_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:03
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0013_payment_processing_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('restaurant_name', models.CharField(max_length=100)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('version', models.IntegerField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('restaurant', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.restaurant')),
+                ('rider', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.rider')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='archived_order_created_brin')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:06
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # 큰 주문 테이블에서 쓰기를 막지 않도록 CREATE INDEX CONCURRENTLY (트랜잭션 밖에서 실행)
+    atomic = False
+
+    dependencies = [
+        ('orders', '0014_archivedorder'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ('pending_payment', 'payment_processing', 'pending_acceptance', 'preparing', 'ready_for_pickup', 'in_transit'))), fields=['restaurant', '-created_at', '-id'], include=('status',), name='order_rest_active_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ('pending_payment', 'payment_processing', 'pending_acceptance', 'preparing', 'ready_for_pickup', 'in_transit'))), fields=['rider', '-created_at', '-id'], include=('status',), name='order_rider_active_idx'),
+        ),
+    ]
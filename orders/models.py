@@ -1,23 +1,40 @@
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 import uuid
 
 class Restaurant(models.Model):
     name = models.CharField(max_length=100)
     address = models.CharField(max_length=200)
+    # 배차 기준 좌표 (없으면 자동 배차 대상 아님, orders/dispatch.py)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     
     def __str__(self):
         return self.name
 
 class Rider(models.Model):
     name = models.CharField(max_length=100)
+    # 마지막으로 보고한 위치와 배차 가능 여부 (배정되면 False, 배달 완료 후 다시 True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    location_updated_at = models.DateTimeField(null=True, blank=True)
+    is_available = models.BooleanField(default=True)
     
     def __str__(self):
         return self.name
 
+# 종료 상태(배달 완료/취소/거절)가 아닌 상태. 부분 인덱스 조건이라 Meta 안에서 쓸 수 있게 값으로 둡니다.
+# (state_machine.TERMINAL_STATUSES와 겹치지 않고 합치면 전체 상태 - orders/tests_dashboards.py에서 검사)
+ACTIVE_ORDER_STATUSES = (
+    'pending_payment', 'payment_processing', 'pending_acceptance', 'preparing', 'ready_for_pickup', 'in_transit',
+)
+
+
 class Order(models.Model):
     # 주문 상태 정의
     class Status(models.TextChoices):
         PENDING_PAYMENT = 'pending_payment', '결제 대기'
+        PAYMENT_PROCESSING = 'payment_processing', '결제 처리중' # 결제 연동 호출 중 (2단계 결제의 예약 상태)
         PENDING_ACCEPTANCE = 'pending_acceptance', '주문 접수 대기'
         PREPARING = 'preparing', '조리중'
         READY_FOR_PICKUP = 'ready_for_pickup', '픽업 대기'
@@ -40,15 +57,169 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     version = models.IntegerField(default=1) # 낙관적 락을 위한 버전 필드
 
+    class Meta:
+        # V2 목록 키셋 페이지네이션 (created_at, id) 및 필터별 복합 인덱스
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='order_created_id_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='order_status_created_id_idx'),
+            models.Index(fields=['restaurant', '-created_at', '-id'], name='order_rest_created_id_idx'),
+            models.Index(fields=['rider', '-created_at', '-id'], name='order_rider_created_id_idx'),
+            # 식당/라이더 대시보드의 진행중 주문 (orders/api/v2/dashboards.py)
+            # 진행중 주문만 담은 부분 인덱스라 종료 주문이 쌓여도 크기가 진행중 주문 수에 비례합니다.
+            # status를 INCLUDE 해 상태 조건과 count 모드가 힙을 읽지 않음 (index-only scan)
+            models.Index(
+                fields=['restaurant', '-created_at', '-id'], include=['status'],
+                condition=models.Q(status__in=ACTIVE_ORDER_STATUSES), name='order_rest_active_idx',
+            ),
+            models.Index(
+                fields=['rider', '-created_at', '-id'], include=['status'],
+                condition=models.Q(status__in=ACTIVE_ORDER_STATUSES), name='order_rider_active_idx',
+            ),
+        ]
+
     def __str__(self):
         return f"Order {self.id} ({self.status})"
 
+
+class OrderEvent(models.Model):
+    """
+    주문 상태 변경 이벤트 아웃박스 (orders/outbox.py)
+    전이 엔진(orders/transitions.py)이 조건부 UPDATE와 같은 SQL 문장에서 기록하므로,
+    전이가 커밋되면 이벤트도 반드시 남고 롤백되면 함께 사라집니다.
+    dispatch_order_events 명령이 미전송 행을 배치로 꺼내 싱크로 보내고 dispatched_at을 채웁니다.
+    """
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='events')
+    action = models.CharField(max_length=30)
+    from_status = models.CharField(max_length=20)
+    to_status = models.CharField(max_length=20)
+    version = models.IntegerField()  # 전이 후 주문 버전 (소비자 측 중복 제거/순서 판단용)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 디스패처가 읽는 미전송 행만 담는 부분 인덱스 (전송된 행이 쌓여도 크기 유지)
+            models.Index(fields=['id'], condition=models.Q(dispatched_at__isnull=True),
+                         name='orderevent_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"OrderEvent {self.id} (order {self.order_id} v{self.version} {self.to_status})"
+
+class OrderStatusTransition(models.Model):
+    """
+    주문 상태 변경 이력 (추가 전용, orders/history.py)
+    전이 엔진이 조건부 UPDATE와 같은 SQL 문장에서 전이마다 한 행을 추가합니다.
+    상태는 문자열 대신 아래 고정 정수 코드(smallint)로 저장합니다. 행위(action)는 (출발, 도착) 상태 쌍으로 결정되므로 저장하지 않습니다.
+    주문이 삭제/보관(archive)되어도 이력은 남도록 DB 외래 키 제약은 걸지 않습니다.
+    """
+    # 저장된 이력의 의미가 바뀌므로 기존 코드는 바꾸거나 재사용하지 말고, 새 상태는 끝에 추가
+    CODES = {
+        Order.Status.PENDING_PAYMENT: 1,
+        Order.Status.PENDING_ACCEPTANCE: 2,
+        Order.Status.PREPARING: 3,
+        Order.Status.READY_FOR_PICKUP: 4,
+        Order.Status.CANCELLED: 5,
+        Order.Status.REJECTED: 6,
+        Order.Status.IN_TRANSIT: 7,
+        Order.Status.DELIVERED: 8,
+        Order.Status.PAYMENT_PROCESSING: 9,
+    }
+    STATUSES = {code: status for status, code in CODES.items()}
+
+    order = models.ForeignKey(
+        Order, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,  # (order, version) 인덱스로 충분
+        related_name='status_history',
+    )
+    version = models.IntegerField()  # 전이 후 주문 버전
+    from_code = models.PositiveSmallIntegerField()
+    to_code = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # 주문별 이력 조회/as-of 조회 (order_id, version) 겸 중복 기록 방지
+            models.UniqueConstraint(fields=['order', 'version'], name='order_transition_version_uniq'),
+        ]
+        indexes = [
+            # 기간별 조회 (특정 시각 사이에 바뀐 주문)
+            models.Index(fields=['created_at'], name='order_transition_created_idx'),
+        ]
+
+    @property
+    def from_status(self):
+        return self.STATUSES[self.from_code]
+
+    @property
+    def to_status(self):
+        return self.STATUSES[self.to_code]
+
+    def __str__(self):
+        return f"Order {self.order_id} v{self.version}: {self.from_status} -> {self.to_status}"
+
+
+class ArchivedOrder(models.Model):
+    """
+    보관된 주문 (종료 상태로 오래된 주문의 cold 저장소, orders/archive.py / archive_orders 명령)
+    배달 완료/취소/거절 후 바뀌지 않는 주문을 orders_order에서 옮겨, 진행중 주문 조회용 인덱스를 작게 유지합니다.
+    id는 원래 주문 id 그대로이며, 상태는 이력과 같은 smallint 코드(OrderStatusTransition.CODES)로 저장합니다.
+    인덱스는 기본 키와 created_at BRIN(블록 범위 요약, 수십 KiB)뿐입니다.
+    식당/라이더가 삭제되어도 보관 행은 바꾸지 않도록 DB 외래 키 제약은 걸지 않습니다.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    restaurant = models.ForeignKey(
+        Restaurant, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, null=True, related_name='+',
+    )
+    rider = models.ForeignKey(
+        Rider, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, null=True, related_name='+',
+    )
+    restaurant_name = models.CharField(max_length=100)
+    status_code = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField()
+    version = models.IntegerField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            BrinIndex(fields=['created_at'], name='archived_order_created_brin'),
+        ]
+
+    @property
+    def status(self):
+        return OrderStatusTransition.STATUSES[self.status_code]
+
+    def as_order(self):
+        """같은 값의 Order 인스턴스 (저장하지 않음). 보관 주문도 V2 Serializer/ETag를 그대로 쓰기 위함"""
+        return Order(
+            id=self.id, restaurant_id=self.restaurant_id, rider_id=self.rider_id,
+            restaurant_name=self.restaurant_name, status=self.status, created_at=self.created_at,
+            version=self.version,
+        )
+
+    def __str__(self):
+        return f"ArchivedOrder {self.id} ({self.status})"
+
+
 class IdempotencyKey(models.Model):
+    class Status(models.TextChoices):
+        IN_PROGRESS = 'in_progress', '처리중'
+        COMPLETED = 'completed', '처리 완료'
+
     key = models.UUIDField(unique=True, help_text="Client provided Idempotency Key")
-    # 어떤 HTTP 응답을 줬는지 저장 (JSON 직렬화)
-    response_status = models.IntegerField()
-    response_body = models.JSONField()
+    # 키를 먼저 선점(in_progress)한 뒤 처리하고, 끝나면 응답과 함께 completed로 바꿉니다.
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.IN_PROGRESS)
+    # 요청 지문: method + route + pk + 정규화된 body 의 해시. 같은 키를 다른 요청에 재사용하면 422
+    fingerprint = models.CharField(max_length=32, blank=True, default='')
+    # 어떤 HTTP 응답을 줬는지 저장 (렌더링된 JSON bytes 그대로 -> 재응답 시 DRF 렌더링 생략)
+    response_status = models.IntegerField(null=True, blank=True)
+    response_content = models.BinaryField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # 만료(TTL) 판정 및 배치 정리(prune_idempotency_keys)용 인덱스
+            models.Index(fields=['created_at'], name='idempotency_created_idx'),
+        ]
+
     def __str__(self):
         return str(self.key)
\ No newline at end of file
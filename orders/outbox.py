@@ -0,0 +1,260 @@
+"""
+주문 상태 변경 이벤트 아웃박스 디스패처
+
+전이 엔진(orders/transitions.py)이 조건부 UPDATE와 같은 문장에서 OrderEvent 행을 기록하고,
+이 모듈이 미전송 행을 배치로 꺼내 싱크(로그 파일, HTTP, 프로세스 내 콜백)로 보냅니다.
+
+배치 처리 순서 (한 트랜잭션)
+1. SELECT ... ORDER BY id LIMIT n FOR UPDATE SKIP LOCKED
+   다른 워커/프로세스가 잠근 행은 건너뛰므로 여러 디스패처가 같은 테이블을 나눠 처리합니다.
+2. 모든 싱크에 전송
+3. 전송한 행에 dispatched_at 기록(또는 삭제) 후 커밋
+
+전달 보장은 at-least-once 입니다. 싱크 전송 뒤 커밋 전에 실패하면 다음 배치에서 다시 보내므로,
+소비자는 이벤트 id(또는 order_id + version)로 중복을 걸러야 합니다.
+워커는 order_id % workers 로 주문을 나눠 맡으므로 한 디스패처 안에서는 같은 주문의 이벤트가 순서대로 나갑니다.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OrderEvent
+
+logger = logging.getLogger(__name__)
+
+_TABLE = OrderEvent._meta.db_table
+
+# 미전송 행만 담는 부분 인덱스(orderevent_pending_idx)를 id 순서로 읽습니다.
+_CLAIM_SQL = f"""
+    SELECT id, order_id, action, from_status, to_status, version, created_at
+      FROM {_TABLE}
+     WHERE dispatched_at IS NULL
+       AND order_id %% %s = %s
+     ORDER BY id
+     LIMIT %s
+       FOR UPDATE SKIP LOCKED
+"""
+_MARK_SQL = f"UPDATE {_TABLE} SET dispatched_at = now() WHERE id = ANY(%s)"
+_DELETE_SQL = f"DELETE FROM {_TABLE} WHERE id = ANY(%s)"
+
+
+# ---------------------------------------------------------------------------
+# 싱크
+# ---------------------------------------------------------------------------
+class Sink:
+    """send(events)가 예외 없이 끝나면 전달 완료로 봅니다. 예외가 나면 배치 전체를 다시 보냅니다."""
+
+    def send(self, events):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LogFileSink(Sink):
+    """이벤트를 JSON Lines 형식으로 파일 끝에 추가"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def send(self, events):
+        lines = ''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class HttpSink(Sink):
+    """배치를 {"events": [...]} JSON으로 POST. 2xx 이외의 응답이나 연결 오류는 재전송 대상"""
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+        self._local = threading.local()  # requests.Session은 워커 스레드마다 하나씩 (연결 재사용)
+
+    @property
+    def session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def send(self, events):
+        response = self.session.post(self.url, json={'events': events}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class CallbackSink(Sink):
+    """프로세스 내부 콜백 callback(events). 점 경로 문자열도 받습니다."""
+
+    def __init__(self, callback):
+        if isinstance(callback, str):
+            callback = import_string(callback)
+        self.callback = callback
+
+    def send(self, events):
+        self.callback(events)
+
+
+def build_sink(spec):
+    """
+    싱크 지정 문자열 -> Sink
+      log:<파일 경로>  /  http://...  https://...  /  callback:<점 경로>
+    Sink 인스턴스는 그대로 돌려줍니다.
+    """
+    if isinstance(spec, Sink):
+        return spec
+    if spec.startswith(('http://', 'https://')):
+        return HttpSink(spec)
+    kind, _, target = spec.partition(':')
+    if kind == 'log' and target:
+        return LogFileSink(target)
+    if kind == 'callback' and target:
+        return CallbackSink(target)
+    raise ValueError(f"알 수 없는 아웃박스 싱크: {spec!r}")
+
+
+# ---------------------------------------------------------------------------
+# 디스패처
+# ---------------------------------------------------------------------------
+@dataclass
+class BatchReport:
+    worker: int
+    size: int
+    seconds: float  # 잠금 ~ 커밋까지 걸린 시간
+    lag: float  # 배치에서 가장 오래된 이벤트가 기록된 뒤 전송될 때까지 걸린 시간(초)
+
+    @property
+    def throughput(self):
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+def _as_event(row):
+    event_id, order_id, action, from_status, to_status, version, created_at = row
+    return {
+        'id': event_id,
+        'order_id': order_id,
+        'action': action,
+        'from_status': from_status,
+        'to_status': to_status,
+        'version': version,
+        'created_at': created_at.isoformat(),
+    }
+
+
+class OutboxDispatcher:
+    def __init__(self, sinks, batch_size=500, workers=1, delete=False):
+        self.sinks = [build_sink(sink) for sink in sinks]
+        self.batch_size = batch_size
+        self.workers = workers
+        self.delete = delete  # True면 전송한 행을 삭제 (기본은 dispatched_at 기록)
+        self.errors = []
+
+    @classmethod
+    def from_settings(cls, **overrides):
+        options = {
+            'sinks': getattr(settings, 'ORDER_OUTBOX_SINKS', []),
+            'batch_size': getattr(settings, 'ORDER_OUTBOX_BATCH_SIZE', 500),
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**options)
+
+    def dispatch_batch(self, worker=0):
+        """
+        worker 몫의 미전송 이벤트를 최대 batch_size개 보내고 BatchReport 반환. 보낼 이벤트가 없으면 None.
+        싱크가 예외를 내면 트랜잭션이 롤백되어 행이 미전송 상태로 남고 예외가 그대로 전파됩니다.
+        """
+        started = time.perf_counter()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(_CLAIM_SQL, [self.workers, worker, self.batch_size])
+                rows = cursor.fetchall()
+                if not rows:
+                    return None
+                events = [_as_event(row) for row in rows]
+                for sink in self.sinks:
+                    sink.send(events)
+                cursor.execute(_DELETE_SQL if self.delete else _MARK_SQL, [[row[0] for row in rows]])
+        lag = (timezone.now() - min(row[-1] for row in rows)).total_seconds()
+        return BatchReport(worker, len(rows), time.perf_counter() - started, lag)
+
+    def run_worker(self, worker, once=False, poll_interval=1.0, on_batch=None, stop=None):
+        """
+        배치를 반복 처리. once면 보낼 이벤트가 없을 때 종료하고 실패하면 예외를 냅니다.
+        상시 실행 중 실패하면 점점 길게(최대 30초) 기다렸다가 다시 시도합니다.
+        """
+        stop = stop or threading.Event()
+        failures = 0
+        while not stop.is_set():
+            try:
+                report = self.dispatch_batch(worker)
+            except Exception:
+                if once:
+                    raise
+                failures += 1
+                logger.exception("outbox worker %s: 배치 전송 실패 (%s회 연속)", worker, failures)
+                stop.wait(min(poll_interval * 2 ** failures, 30.0))
+                continue
+            failures = 0
+            if report is None:
+                if once:
+                    return
+                stop.wait(poll_interval)
+                continue
+            if on_batch is not None:
+                on_batch(report)
+
+    def run(self, once=False, poll_interval=1.0, on_batch=None, stop=None):
+        """
+        workers개의 워커를 실행. 워커가 1개면 현재 스레드(현재 DB 연결)에서 실행하고,
+        여러 개면 워커마다 스레드(= 별도 DB 연결)를 띄웁니다. 스레드 워커의 예외는 self.errors에 모읍니다.
+        """
+        stop = stop or threading.Event()
+        if self.workers == 1:
+            self.run_worker(0, once, poll_interval, on_batch, stop)
+            return
+
+        def main(worker):
+            try:
+                self.run_worker(worker, once, poll_interval, on_batch, stop)
+            except Exception as exc:
+                logger.exception("outbox worker %s 종료", worker)
+                self.errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=main, args=(worker,), name=f'outbox-{worker}', daemon=True)
+            for worker in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def pending_count():
+    return OrderEvent.objects.filter(dispatched_at__isnull=True).count()
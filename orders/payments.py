@@ -0,0 +1,97 @@
+"""
+결제 연동 (2단계 결제)
+
+결제는 상태 머신의 2단계 전이입니다 (orders/state_machine.py).
+1) 예약  : pending_payment -> payment_processing 조건부 UPDATE 후 바로 커밋 (행 잠금은 문장 실행 동안만)
+2) 연동  : 트랜잭션 밖에서 결제 게이트웨이 호출 (charge_payment / acharge_payment)
+3) 확정  : 승인이면 payment_confirmation(-> pending_acceptance),
+           거절/오류면 payment_failure(-> pending_payment) 를 예약한 version에 대한 조건부 UPDATE로 적용
+게이트웨이 지연 동안 행 잠금과 DB 연결을 잡지 않고, 그 사이 다른 요청은 payment_processing 상태를 보고
+412/400으로 실패합니다.
+
+게이트웨이는 settings.ORDER_PAYMENT_GATEWAY(점 경로)와 ORDER_PAYMENT_GATEWAY_OPTIONS(생성자 인자)로 지정합니다.
+기본값 FakeGateway는 외부 호출 없이 지연(orders/latency.py의 'payment' 프로필)과 거절만 흉내냅니다.
+"""
+import logging
+import random
+import threading
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .latency import get_injector, in_held_transaction
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PaymentResult:
+    approved: bool
+    reference: str = ''  # 게이트웨이 거래 번호
+    message: str = ''  # 거절/오류 사유
+
+
+class PaymentGateway:
+    def charge(self, order_pk, data):
+        """order_pk 주문 결제 요청 (data는 요청 본문). PaymentResult 반환, 통신 오류는 예외"""
+        raise NotImplementedError
+
+    async def acharge(self, order_pk, data):
+        # 비동기 클라이언트가 없는 게이트웨이는 스레드에서 실행 (DB를 쓰지 않으므로 thread_sensitive 불필요)
+        return await sync_to_async(self.charge, thread_sensitive=False)(order_pk, data)
+
+
+class FakeGateway(PaymentGateway):
+    """로컬 가짜 게이트웨이. decline_rate 비율로 거절합니다."""
+
+    def __init__(self, decline_rate=0.0, latency_action='payment'):
+        self.decline_rate = decline_rate
+        self.latency_action = latency_action
+
+    def charge(self, order_pk, data):
+        get_injector().inject(self.latency_action)
+        return self._result(order_pk)
+
+    async def acharge(self, order_pk, data):
+        await get_injector().ainject(self.latency_action)
+        return self._result(order_pk)
+
+    def _result(self, order_pk):
+        if self.decline_rate and random.random() < self.decline_rate:
+            return PaymentResult(False, message="Declined by gateway")
+        return PaymentResult(True, reference=f'fake-{order_pk}')
+
+
+def charge_payment(order_pk, data):
+    """트랜잭션 밖에서 게이트웨이 호출. 통신 오류도 거절(PaymentResult)로 돌려줘 예약을 되돌리게 함"""
+    if in_held_transaction():
+        raise RuntimeError("Payment gateway call inside a DB transaction")
+    try:
+        return get_gateway().charge(order_pk, data)
+    except Exception as exc:
+        logger.exception("payment gateway error (order %s)", order_pk)
+        return PaymentResult(False, message=str(exc) or exc.__class__.__name__)
+
+
+async def acharge_payment(order_pk, data):
+    try:
+        return await get_gateway().acharge(order_pk, data)
+    except Exception as exc:
+        logger.exception("payment gateway error (order %s)", order_pk)
+        return PaymentResult(False, message=str(exc) or exc.__class__.__name__)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                gateway_class = import_string(getattr(settings, 'ORDER_PAYMENT_GATEWAY', 'orders.payments.FakeGateway'))
+                _gateway = gateway_class(**getattr(settings, 'ORDER_PAYMENT_GATEWAY_OPTIONS', {}))
+    return _gateway
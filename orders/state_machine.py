@@ -0,0 +1,138 @@
+"""
+주문 상태 머신 (선언형 전이 테이블)
+
+행위(action) -> 허용 출발 상태 -> 도착 상태 -> 부수 효과 를 한 곳에 선언하고,
+모듈 import 시점에 한 번만 컴파일하여 불변(frozen) 조회 테이블과 비트마스크로 만듭니다.
+V2 ViewSet(라우트 생성 포함), 관리자 페이지, 일괄 처리 엔드포인트가 모두 이 테이블을 사용합니다.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from .dispatch import dispatch_on_ready, release_on_delivery
+from .models import Order
+from .payments import acharge_payment, charge_payment
+
+S = Order.Status
+
+
+@dataclass(frozen=True)
+class Transition:
+    action: str
+    sources: tuple
+    target: str
+    url_path: str
+    error_message: str = "Invalid state"
+    idempotent: bool = False  # Idempotency-Key 처리 대상 여부
+    before: tuple = ()  # 전이 직전에 실행할 훅 (order_pk를 인자로 받음)
+    abefore: tuple = ()  # before의 비동기 버전 (비동기 뷰가 사용. 없으면 before를 스레드에서 실행)
+    during: tuple = ()  # 전이 트랜잭션 안, 스냅샷/캐시 기록 전에 실행할 훅 (갱신된 order를 받아 같은 version에 함께 반영)
+    after: tuple = ()  # 전이 성공 후 실행할 훅 (갱신된 order를 인자로 받음)
+    # 2단계 전이: 이 전이로 예약 상태로 옮겨 커밋한 뒤 트랜잭션 밖에서 external(order_pk, data)를 호출하고,
+    # 결과(approved)에 따라 confirm / rollback 전이를 예약한 version에 대한 조건부 UPDATE로 적용 (orders/payments.py)
+    external: object = None
+    aexternal: object = None  # external의 비동기 버전 (비동기 뷰가 사용)
+    confirm: str = None
+    rollback: str = None
+    internal: bool = False  # 2단계 전이의 확정/취소 단계 (엔드포인트/일괄 처리 없이 서버만 적용)
+    # 아래는 compile 단계에서 채워짐
+    source_mask: int = 0
+
+    def allows(self, status):
+        return bool(STATUS_BITS.get(status, 0) & self.source_mask)
+
+    @property
+    def two_phase(self):
+        return self.external is not None
+
+    @property
+    def batchable(self):
+        # 외부 연동(before 훅, 2단계 전이)이나 Idempotency-Key가 필요한 전이, 내부 전이는 일괄 처리에서 제외
+        return not (self.idempotent or self.before or self.two_phase or self.internal)
+
+
+# ---------------------------------------------------------------------------
+# 전이 테이블 (선언부)
+# ---------------------------------------------------------------------------
+TRANSITION_TABLE = (
+    # 결제: 예약(payment) -> 게이트웨이 호출 -> 확정(payment_confirmation) / 취소(payment_failure)
+    Transition('payment', (S.PENDING_PAYMENT,), S.PAYMENT_PROCESSING, 'payment', idempotent=True,
+               external=charge_payment, aexternal=acharge_payment,
+               confirm='payment_confirmation', rollback='payment_failure'),
+    Transition('payment_confirmation', (S.PAYMENT_PROCESSING,), S.PENDING_ACCEPTANCE, None, internal=True),
+    Transition('payment_failure', (S.PAYMENT_PROCESSING,), S.PENDING_PAYMENT, None, internal=True,
+               error_message="Payment failed"),
+    Transition('cancellation', (S.PENDING_PAYMENT, S.PENDING_ACCEPTANCE), S.CANCELLED, 'cancellation',
+               error_message="Cannot cancel"),
+    Transition('acceptance', (S.PENDING_ACCEPTANCE,), S.PREPARING, 'acceptance'),
+    Transition('rejection', (S.PENDING_ACCEPTANCE,), S.REJECTED, 'rejection'),
+    # 픽업 대기가 되면 같은 트랜잭션에서 가장 가까운 라이더 자동 배정, 배달 완료 후 라이더를 다시 배차 가능으로
+    # (orders/dispatch.py)
+    Transition('preparation_complete', (S.PREPARING,), S.READY_FOR_PICKUP, 'preparation-complete',
+               during=(dispatch_on_ready,)),
+    Transition('pickup', (S.READY_FOR_PICKUP,), S.IN_TRANSIT, 'pickup'),
+    Transition('delivery', (S.IN_TRANSIT,), S.DELIVERED, 'delivery', after=(release_on_delivery,)),
+)
+
+
+# ---------------------------------------------------------------------------
+# 컴파일 (import 시 1회)
+# ---------------------------------------------------------------------------
+# 상태마다 비트 하나를 배정
+STATUS_BITS = MappingProxyType({status.value: 1 << i for i, status in enumerate(S)})
+
+
+def _compile(table):
+    compiled = {}
+    for t in table:
+        if t.action in compiled:
+            raise ValueError(f"Duplicated transition action: {t.action}")
+        mask = 0
+        for source in t.sources:
+            mask |= STATUS_BITS[source]
+        compiled[t.action] = Transition(
+            action=t.action,
+            sources=tuple(str(s) for s in t.sources),
+            target=str(t.target),
+            url_path=t.url_path,
+            error_message=t.error_message,
+            idempotent=t.idempotent,
+            before=tuple(t.before),
+            abefore=tuple(t.abefore),
+            during=tuple(t.during),
+            after=tuple(t.after),
+            external=t.external,
+            aexternal=t.aexternal,
+            confirm=t.confirm,
+            rollback=t.rollback,
+            internal=t.internal,
+            source_mask=mask,
+        )
+    for t in compiled.values():
+        # 확정/취소 전이는 예약 상태에서 출발해야 함
+        for name in filter(None, (t.confirm, t.rollback)):
+            if name not in compiled or t.target not in compiled[name].sources:
+                raise ValueError(f"Invalid two-phase transition for {t.action}: {name}")
+    return MappingProxyType(compiled)
+
+
+TRANSITIONS = _compile(TRANSITION_TABLE)
+
+# 상태 -> 해당 상태에서 가능한 행위 목록 (관리자 페이지 / 문서용)
+ACTIONS_BY_STATUS = MappingProxyType({
+    status: frozenset(name for name, t in TRANSITIONS.items() if t.source_mask & bit)
+    for status, bit in STATUS_BITS.items()
+})
+
+# 어떤 행위로도 빠져나갈 수 없는 종료 상태
+TERMINAL_STATUSES = frozenset(status for status, actions in ACTIONS_BY_STATUS.items() if not actions)
+
+
+def get_transition(action):
+    """행위 이름으로 전이 정의를 조회합니다. 없으면 None."""
+    return TRANSITIONS.get(action)
+
+
+def can_transition(action, status):
+    """O(1): 해당 상태에서 행위가 허용되는지 비트마스크로 검사합니다."""
+    t = TRANSITIONS.get(action)
+    return t is not None and bool(STATUS_BITS.get(status, 0) & t.source_mask)
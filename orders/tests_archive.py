@@ -0,0 +1,109 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.archive import archive_orders, incremental_since
+from orders.cache import OrderCache, get_cache
+from orders.models import ArchivedOrder, Order, OrderEvent, OrderStatusTransition, Restaurant
+from orders.state_machine import TRANSITIONS
+from orders.transitions import transition_orders
+
+
+class ArchiveOrdersTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        # 스냅샷 캐시는 기본 꺼짐 (공유 백엔드 전용). 단일 프로세스 테스트에서는 locmem으로 켬
+        patcher = mock.patch('orders.cache._cache', OrderCache(alias='default'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        get_cache().backend.clear()
+        self.restaurant = Restaurant.objects.create(name="치킨집", address="서울시")
+        self.old = timezone.now() - timedelta(days=60)
+
+    def make(self, status, age=None, **kwargs):
+        order = Order.objects.create(status=status, restaurant=self.restaurant, **kwargs)
+        Order.objects.filter(pk=order.pk).update(created_at=age or self.old)
+        return order
+
+    def test_moves_old_terminal_orders_in_batches(self):
+        delivered = [self.make(Order.Status.DELIVERED) for _ in range(5)]
+        cancelled = self.make(Order.Status.CANCELLED)
+        active = self.make(Order.Status.PREPARING)
+        recent = self.make(Order.Status.DELIVERED, age=timezone.now())
+
+        batches = list(archive_orders(timezone.now() - timedelta(days=30), batch_size=2))
+        self.assertEqual([b.moved for b in batches], [2, 2, 2])
+        self.assertEqual(
+            set(ArchivedOrder.objects.values_list('id', flat=True)), {o.id for o in [*delivered, cancelled]},
+        )
+        self.assertEqual(set(Order.objects.values_list('id', flat=True)), {active.id, recent.id})
+
+        archived = ArchivedOrder.objects.get(pk=cancelled.pk)
+        self.assertEqual((archived.status, archived.restaurant_id, archived.created_at),
+                         (Order.Status.CANCELLED, self.restaurant.id, self.old))
+
+    def test_resumable_and_max_batches(self):
+        for _ in range(5):
+            self.make(Order.Status.REJECTED)
+        cutoff = timezone.now() - timedelta(days=30)
+        self.assertEqual(sum(b.moved for b in archive_orders(cutoff, batch_size=2, max_batches=1)), 2)
+        # 다시 실행하면 남은 행부터 이어서 처리
+        self.assertEqual(sum(b.moved for b in archive_orders(cutoff, batch_size=2)), 3)
+        self.assertEqual(ArchivedOrder.objects.count(), 5)
+
+    def test_keeps_orders_with_pending_events(self):
+        order = self.make(Order.Status.PREPARING)
+        transition_orders([(order.id, ['*'], TRANSITIONS['preparation_complete'])])
+        for action in ('pickup', 'delivery'):
+            transition_orders([(order.id, ['*'], TRANSITIONS[action])])
+        cutoff = timezone.now() - timedelta(days=30)
+
+        self.assertEqual(list(archive_orders(cutoff)), [])  # 아웃박스 미전송
+        OrderEvent.objects.update(dispatched_at=timezone.now())
+        self.assertEqual(sum(b.moved for b in archive_orders(cutoff)), 1)
+        self.assertFalse(OrderEvent.objects.exists())
+        self.assertEqual(OrderStatusTransition.objects.filter(order_id=order.id).count(), 3)  # 이력은 유지
+
+    def test_incremental_since(self):
+        self.assertIsNone(incremental_since())
+        self.make(Order.Status.DELIVERED)
+        list(archive_orders(timezone.now() - timedelta(days=30)))
+        self.assertEqual(incremental_since(), self.old)
+
+        # 이미 보관한 주문보다 먼저 생성된 주문은 incremental 범위 밖
+        straggler = self.make(Order.Status.DELIVERED, age=self.old - timedelta(days=1))
+        newer = self.make(Order.Status.DELIVERED, age=self.old + timedelta(days=1))
+        moved = list(archive_orders(timezone.now() - timedelta(days=30), since=incremental_since()))
+        self.assertEqual(sum(b.moved for b in moved), 1)
+        self.assertTrue(ArchivedOrder.objects.filter(pk=newer.pk).exists())
+        self.assertTrue(Order.objects.filter(pk=straggler.pk).exists())
+
+    def test_retrieve_falls_back_to_archive(self):
+        order = self.make(Order.Status.DELIVERED)
+        url = f'/api/v2/orders/{order.id}/'
+        before = self.client.get(url)
+        get_cache().backend.clear()
+        list(archive_orders(timezone.now() - timedelta(days=30)))
+
+        after = self.client.get(url)
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual((after.json(), after['ETag']), (before.json(), before['ETag']))
+        get_cache().backend.clear()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=before['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(f'{url}?fields=status').json(), {'status': 'delivered'})
+        self.assertEqual(self.client.get(f'{url}history/').status_code, 200)
+        self.assertEqual(self.client.get('/api/v2/orders/999999/').status_code, 404)
+
+    def test_command(self):
+        self.make(Order.Status.DELIVERED)
+        out = StringIO()
+        call_command('archive_orders', '--days', '30', stdout=out)
+        output = out.getvalue()
+        self.assertIn("1 orders archived", output)
+        self.assertIn("archived_order_created_brin", output)
+        self.assertEqual(ArchivedOrder.objects.count(), 1)
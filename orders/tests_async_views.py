@@ -0,0 +1,147 @@
+import asyncio
+import time
+import uuid
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import include, path
+from rest_framework.test import APIClient
+
+from orders.api.v2.urls import build_urlpatterns
+from orders.cache import OrderCache, get_cache
+from orders.latency import LatencyInjector
+from orders.models import ArchivedOrder, Order, OrderEvent, Restaurant, Rider
+
+# 같은 V2 라우트를 동기(/sync/)와 비동기(/async/) 뷰로 나란히 연결해 응답을 비교
+urlpatterns = [
+    path('sync/api/v2/', include(build_urlpatterns(async_views=False))),
+    path('async/api/v2/', include(build_urlpatterns(async_views=True))),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncOrderViewsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        # 스냅샷 캐시는 기본 꺼짐 (공유 백엔드 전용). 단일 프로세스 테스트에서는 locmem으로 켬
+        patcher = mock.patch('orders.cache._cache', OrderCache(alias='default'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        get_cache().backend.clear()
+        restaurant = Restaurant.objects.create(name="치킨집", address="서울시")
+        rider = Rider.objects.create(name="배달원")
+        self.orders = [
+            Order.objects.create(restaurant=restaurant if i % 2 else None, rider=rider if i % 3 else None,
+                                 status=Order.Status.PENDING_ACCEPTANCE)
+            for i in range(5)
+        ]
+        self.order = self.orders[0]
+
+    async def fetch(self, path, **headers):
+        sync = await sync_to_async(self.client.get)(f'/sync/api/v2/{path}', headers=headers)
+        get_cache().backend.clear()
+        result = await self.async_client.get(f'/async/api/v2/{path}', headers=headers)
+        return sync, result
+
+    async def committed(self, request):
+        # TestCase는 커밋하지 않으므로 요청이 등록한 on_commit 콜백을 ORM 스레드에서 실행
+        capture = self.captureOnCommitCallbacks(execute=True)
+        await sync_to_async(capture.__enter__)()
+        try:
+            return await request
+        finally:
+            await sync_to_async(capture.__exit__)(None, None, None)
+
+    def assert_same(self, sync, result, etag=True):
+        self.assertEqual(result.status_code, sync.status_code)
+        self.assertEqual(result.content.replace(b'/async/', b'/sync/'), sync.content)
+        if etag:  # 목록 ETag는 요청 경로(/sync/, /async/)를 포함하므로 비교하지 않음
+            self.assertEqual(result.get('ETag'), sync.get('ETag'))
+
+    async def test_list_matches_sync(self):
+        for query in ('', '?page_size=2', '?fields=id,status', '?include=restaurant,rider&fields[riders]=name',
+                      '?status=preparing'):
+            sync, result = await self.fetch(f'orders/{query}')
+            self.assert_same(sync, result, etag=False)
+            self.assertEqual(result['Content-Type'], 'application/json')
+
+        # 다음 페이지 커서 / 304
+        sync, result = await self.fetch('orders/?page_size=2')
+        next_path = result.json()['next'].split('/async/api/v2/')[1]
+        self.assert_same(*await self.fetch(next_path), etag=False)
+        etag = (await self.async_client.get('/async/api/v2/orders/'))['ETag']
+        result = await self.async_client.get('/async/api/v2/orders/', headers={'If-None-Match': etag})
+        self.assertEqual(result.status_code, 304)
+
+    async def test_retrieve_matches_sync(self):
+        sync, result = await self.fetch(f'orders/{self.order.id}/?fields=status')
+        self.assert_same(sync, result)
+        self.assertEqual(result['X-Cache'], 'MISS')
+        hit = await self.async_client.get(f'/async/api/v2/orders/{self.order.id}/?fields=status')
+        self.assertEqual((hit['X-Cache'], hit.content), ('HIT', sync.content))
+
+        not_modified = await self.async_client.get(
+            f'/async/api/v2/orders/{self.order.id}/', headers={'If-None-Match': sync['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assert_same(*await self.fetch('orders/999999/'))
+        archived = await ArchivedOrder.objects.acreate(
+            id=999998, restaurant_name="치킨집", status_code=8, created_at=self.order.created_at, version=5)
+        sync, result = await self.fetch(f'orders/{archived.id}/')
+        self.assertEqual(result.status_code, 200)
+        self.assert_same(sync, result)
+        self.assert_same(*await self.fetch('orders/abc/'))
+
+    async def test_transition(self):
+        url = f'/async/api/v2/orders/{self.order.id}/'
+        etag = (await self.async_client.get(url))['ETag']
+
+        missing = await self.async_client.post(f'{url}acceptance/')
+        self.assertEqual(missing.status_code, 400)
+        stale = await self.async_client.post(f'{url}acceptance/', headers={'If-Match': '"stale"'})
+        self.assertEqual((stale.status_code, stale.json()['current_version']), (412, 1))
+        invalid = await self.async_client.post(f'{url}delivery/', headers={'If-Match': etag})
+        self.assertEqual(invalid.status_code, 400)
+
+        # 캐시 write-through는 커밋 후
+        res = await self.committed(self.async_client.post(f'{url}acceptance/', headers={'If-Match': etag}))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['status'], Order.Status.PREPARING)
+        self.assertEqual(await OrderEvent.objects.filter(order=self.order).acount(), 1)
+        cached = await self.async_client.get(url)
+        self.assertEqual((cached['X-Cache'], cached['ETag']), ('HIT', res['ETag']))
+
+        wrong_method = await self.async_client.get(f'{url}acceptance/')
+        self.assertEqual(wrong_method.status_code, 405)
+
+    @mock.patch('orders.latency._injector', LatencyInjector({'payment': 'fixed:0.5'}))
+    async def test_payment_wait_does_not_block(self):
+        # 결제 연동 대기(0.5초)는 asyncio.sleep -> 동시 요청이 서로 기다리지 않음
+        for order in self.orders:
+            order.status = Order.Status.PENDING_PAYMENT
+            await order.asave()
+
+        async def pay(order):
+            etag = (await self.async_client.get(f'/async/api/v2/orders/{order.id}/'))['ETag']
+            return await self.async_client.post(
+                f'/async/api/v2/orders/{order.id}/payment/', headers={'If-Match': etag})
+
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(pay(order) for order in self.orders))
+        elapsed = time.perf_counter() - started
+        self.assertEqual([res.status_code for res in responses], [200] * len(self.orders))
+        self.assertLess(elapsed, 0.5 * len(self.orders) / 2)
+
+    async def test_idempotent_payment(self):
+        self.order.status = Order.Status.PENDING_PAYMENT
+        await self.order.asave()
+        url = f'/async/api/v2/orders/{self.order.id}/'
+        headers = {'If-Match': (await self.async_client.get(url))['ETag'], 'Idempotency-Key': str(uuid.uuid4())}
+
+        first = await self.async_client.post(f'{url}payment/', headers=headers)
+        replay = await self.async_client.post(f'{url}payment/', headers=headers)
+        self.assertEqual((first.status_code, replay.status_code), (200, 200))
+        self.assertEqual(replay.content, first.content)
+        self.assertEqual(first.json()['status'], Order.Status.PENDING_ACCEPTANCE)
+        # 예약(payment) + 확정(payment_confirmation) 이벤트 한 쌍만 기록
+        self.assertEqual(await OrderEvent.objects.filter(order=self.order).acount(), 2)
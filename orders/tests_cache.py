@@ -0,0 +1,143 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from orders.cache import OrderCache, check_order_cache, get_cache
+from orders.models import Order
+
+
+class OrderSnapshotCacheTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        # 스냅샷 캐시는 기본 꺼짐 (공유 백엔드 전용). 단일 프로세스 테스트에서는 locmem으로 켬
+        self.cache = OrderCache(alias='default')
+        patcher = mock.patch('orders.cache._cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache.backend.clear()
+        self.order = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+        self.url = f'/api/v2/orders/{self.order.id}/'
+
+    def test_read_through(self):
+        with self.assertNumQueries(1):
+            miss = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            hit = self.client.get(self.url)
+        self.assertEqual(miss['X-Cache'], 'MISS')
+        self.assertEqual(hit['X-Cache'], 'HIT')
+        self.assertEqual(hit.content, miss.content)
+        self.assertEqual(hit['ETag'], miss['ETag'])
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+        # 캐시 적중 + If-None-Match -> DB 없이 304
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=hit['ETag'])
+        self.assertEqual(res.status_code, 304)
+
+        # 캐시된 전체 표현에서 희소 필드셋 적용
+        self.assertEqual(self.client.get(self.url + '?fields=status').json(), {'status': self.order.status})
+
+    def test_transition_writes_through_after_commit(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            res = self.client.post(f'{self.url}acceptance/', HTTP_IF_MATCH=etag)
+            # 커밋 전에는 다른 조회가 커밋되지 않은 상태를 보지 않음
+            self.assertEqual(self.cache.get(self.order.id)[0], 1)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(callbacks)
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.json(), res.json())
+        self.assertEqual(cached.json()['version'], 2)
+        self.assertEqual(cached['ETag'], res['ETag'])
+
+    def test_batch_transition_writes_through(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/v2/orders/batch-transitions/', {
+                'transitions': [{'order_id': self.order.id, 'action': 'rejection', 'if_match': etag}]
+            }, format='json')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json()['status'], Order.Status.REJECTED)
+
+    def test_failed_transition_keeps_snapshot(self):
+        self.client.get(self.url)
+        res = self.client.post(f'{self.url}acceptance/', HTTP_IF_MATCH='"stale"')
+        self.assertEqual(res.status_code, 412)
+        self.assertEqual(self.cache.get(self.order.id)[0], 1)
+
+    def test_rolled_back_transition_keeps_snapshot(self):
+        etag = self.client.get(self.url)['ETag']
+        with mock.patch('orders.api.v2.views.publish', side_effect=DatabaseError):
+            with self.captureOnCommitCallbacks(execute=True), self.assertRaises(DatabaseError):
+                self.client.post(f'{self.url}acceptance/', HTTP_IF_MATCH=etag)
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.version, self.cache.get(self.order.id)[0]), (1, 1))
+
+    def test_orm_save_invalidates_after_commit(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order.status = Order.Status.CANCELLED
+            self.order.save()
+        self.assertEqual(self.client.get(self.url).json()['status'], Order.Status.CANCELLED)
+
+    def test_stale_reader_cannot_overwrite_newer_snapshot(self):
+        # 느린 조회가 옛 version을 채우려 해도 write-through된 최신 스냅샷이 유지됨
+        self.cache.write(self.order.id, 3, {'id': self.order.id, 'version': 3})
+        self.cache.fill(self.order.id, 2, {'id': self.order.id, 'version': 2})
+        self.assertEqual(self.cache.get(self.order.id)[0], 3)
+        # 늦게 도착한 옛 write-through도 마찬가지
+        self.cache.write(self.order.id, 2, {'id': self.order.id, 'version': 2})
+        self.assertEqual(self.cache.get(self.order.id)[0], 3)
+
+    def test_tombstone_blocks_stale_fill(self):
+        # 변경 전에 읽은 조회가 invalidate 뒤에 채우려 해도 묘비 version 이하는 기록되지 않음
+        self.cache.fill(self.order.id, 1, {'id': self.order.id, 'version': 1})
+        self.cache.invalidate(self.order.id, 2)
+        self.assertIsNone(self.cache.get(self.order.id))
+        self.cache.fill(self.order.id, 1, {'id': self.order.id, 'version': 1})
+        self.cache.fill(self.order.id, 2, {'id': self.order.id, 'version': 2})
+        self.assertIsNone(self.cache.get(self.order.id))
+        self.cache.fill(self.order.id, 3, {'id': self.order.id, 'version': 3})
+        self.assertEqual(self.cache.get(self.order.id)[0], 3)
+
+        # version을 모르는 묘비(삭제)는 만료 전까지 어떤 채우기도 막음
+        self.cache.invalidate(self.order.id)
+        self.cache.fill(self.order.id, 9, {'id': self.order.id, 'version': 9})
+        self.assertIsNone(self.cache.get(self.order.id))
+
+    def test_metrics_endpoint(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(self.client.get('/api/v2/metrics/').status_code, 403)
+        self.client.force_authenticate(User.objects.create_user('ops', is_staff=True))
+        res = self.client.get('/api/v2/metrics/')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['order_cache'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+
+class OrderCacheSettingsTestCase(TestCase):
+    def test_disabled_by_default(self):
+        self.assertFalse(OrderCache.from_settings().enabled)
+        self.assertEqual(check_order_cache(None), [])
+
+    @override_settings(ORDER_CACHE_ALIAS='default')
+    def test_refuses_process_local_backend(self):
+        with self.assertLogs('orders.cache', 'WARNING'):
+            self.assertFalse(OrderCache.from_settings().enabled)
+        self.assertEqual([error.id for error in check_order_cache(None)], ['orders.W001'])
+
+        with self.settings(ORDER_CACHE_ALLOW_LOCAL=True):
+            self.assertTrue(OrderCache.from_settings().enabled)
+            self.assertEqual(check_order_cache(None), [])
+
+    @override_settings(ORDER_CACHE_ALIAS='shared', CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'shared': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379'},
+    })
+    def test_shared_backend(self):
+        self.assertTrue(OrderCache.from_settings().enabled)
+        self.assertEqual(check_order_cache(None), [])
@@ -0,0 +1,64 @@
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.db.models import F
+from django.test import LiveServerTestCase
+
+from order_client import OrderClient
+from orders.models import Order
+
+
+class OrderClientTestCase(LiveServerTestCase):
+    def setUp(self):
+        self.client = OrderClient(self.live_server_url, backoff=0.001)
+        self.order = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_retries_412_with_returned_etag(self):
+        _, etag = self.client.get(self.order.id)
+        # 다른 요청이 먼저 버전을 올림 -> 첫 시도는 412, 응답의 ETag로 GET 없이 재시도
+        Order.objects.filter(pk=self.order.pk).update(version=2)
+
+        with mock.patch.object(self.client.session, 'get', wraps=self.client.session.get) as get:
+            result = self.client.act(self.order.id, 'acceptance', etag=etag)
+        self.assertEqual((result.status_code, result.attempts), (200, 2))
+        self.assertEqual((result.data['status'], result.data['version']), ('preparing', 3))
+        get.assert_not_called()
+        self.assertEqual(self.client.etags[self.order.id], result.etag)
+
+    def test_retries_are_bounded(self):
+        # 재시도 사이마다 다른 요청이 먼저 주문을 바꾸는 상황
+        self.client.max_retries = 2
+        bump = lambda delay: Order.objects.filter(pk=self.order.pk).update(version=F('version') + 1)  # noqa: E731
+        with mock.patch('order_client.time.sleep', side_effect=bump) as sleep:
+            result = self.client.act(self.order.id, 'acceptance', etag='"stale"')
+        self.assertEqual((result.status_code, result.attempts), (412, 3))
+        self.assertEqual(sleep.call_count, 2)
+        self.assertTrue(all(0 <= call.args[0] <= 0.002 for call in sleep.call_args_list))  # jitter 상한 backoff * 2^n
+
+    def test_invalid_state_is_not_retried(self):
+        result = self.client.act(self.order.id, 'delivery')
+        self.assertEqual((result.status_code, result.attempts), (400, 1))
+
+    def test_contending_clients_settle(self):
+        # 같은 주문에 접수/거절 동시 요청: 진 쪽은 412 -> 재시도에서 상태 검사(400)로 끝남
+        order = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+        results = []
+
+        def act(action):
+            with OrderClient(self.live_server_url, backoff=0.005) as client:
+                try:
+                    results.append(client.act(order.id, action))
+                finally:
+                    connection.close()
+
+        threads = [threading.Thread(target=act, args=(action,))
+                   for action in ('acceptance', 'rejection')]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(r.status_code for r in results), [200, 400])
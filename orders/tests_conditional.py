@@ -0,0 +1,62 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from orders.cache import get_cache
+from orders.models import Order, Restaurant
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        restaurant = Restaurant.objects.create(name="치킨집", address="서울시")
+        self.orders = [Order.objects.create(restaurant=restaurant) for _ in range(3)]
+        self.order = self.orders[0]
+
+    def test_retrieve_returns_304_with_single_narrow_query(self):
+        etag = self.client.get(f'/api/v2/orders/{self.order.id}/')['ETag']
+        get_cache().invalidate(self.order.id)  # 스냅샷 캐시 없이 (id, version) 조회 경로 검증
+        with self.assertNumQueries(1):
+            res = self.client.get(f'/api/v2/orders/{self.order.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res['ETag'], etag)
+        self.assertEqual(res.content, b'')
+
+        # 목록/약한 비교 형식도 허용
+        res = self.client.get(f'/api/v2/orders/{self.order.id}/', HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        self.assertEqual(res.status_code, 304)
+
+    def test_retrieve_after_change_returns_full_body(self):
+        etag = self.client.get(f'/api/v2/orders/{self.order.id}/')['ETag']
+        self.client.post(f'/api/v2/orders/{self.order.id}/cancellation/', HTTP_IF_MATCH=etag)
+        res = self.client.get(f'/api/v2/orders/{self.order.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['status'], Order.Status.CANCELLED)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_retrieve_missing_order_returns_404(self):
+        res = self.client.get('/api/v2/orders/999999/', HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(res.status_code, 404)
+
+    def test_list_collection_etag(self):
+        url = '/api/v2/orders/?page_size=2'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+        # 다른 쿼리 문자열은 다른 ETag
+        self.assertNotEqual(self.client.get('/api/v2/orders/?page_size=3')['ETag'], etag)
+
+        # 페이지 안 주문의 버전이 바뀌면 본문을 다시 내려줌
+        Order.objects.filter(pk=self.orders[-1].pk).update(version=5)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_etag_changes_when_new_order_enters_page(self):
+        url = '/api/v2/orders/?page_size=2'
+        etag = self.client.get(url)['ETag']
+        Order.objects.create()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_with_include_has_no_etag(self):
+        res = self.client.get('/api/v2/orders/?include=restaurant')
+        self.assertNotIn('ETag', res)
@@ -0,0 +1,80 @@
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.models import ACTIVE_ORDER_STATUSES, Order, Restaurant, Rider
+from orders.state_machine import TERMINAL_STATUSES
+
+
+class ActiveOrdersTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.restaurant = Restaurant.objects.create(name="치킨집", address="서울시")
+        self.other = Restaurant.objects.create(name="피자집", address="서울시")
+        self.rider = Rider.objects.create(name="라이더")
+        S = Order.Status
+        self.orders = {
+            status: Order.objects.create(status=status, restaurant=self.restaurant, rider=self.rider)
+            for status in (S.PENDING_PAYMENT, S.PENDING_ACCEPTANCE, S.PREPARING, S.READY_FOR_PICKUP,
+                           S.IN_TRANSIT, S.DELIVERED, S.CANCELLED)
+        }
+        Order.objects.create(status=S.PREPARING, restaurant=self.other)
+
+    def url(self, owner, pk):
+        return reverse(f'{owner}-v2-active-orders', args=[pk])
+
+    def ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['results']]
+
+    def test_active_statuses_partition_all_statuses(self):
+        self.assertEqual(set(ACTIVE_ORDER_STATUSES) & TERMINAL_STATUSES, set())
+        self.assertEqual(set(ACTIVE_ORDER_STATUSES) | TERMINAL_STATUSES, set(Order.Status.values))
+
+    def test_restaurant_active_orders(self):
+        S = Order.Status
+        with CaptureQueriesContext(connection) as queries:
+            ids = self.ids(self.client.get(self.url('restaurant', self.restaurant.id)))
+        owner_checks = [q for q in queries if 'FROM "orders_restaurant"' in q['sql']]
+        self.assertEqual(len(owner_checks), 1)  # 식당 존재 확인은 요청당 1회
+        # 최신 주문부터, 식당 대시보드 기본 상태만
+        self.assertEqual(ids, [self.orders[s].id for s in (S.READY_FOR_PICKUP, S.PREPARING, S.PENDING_ACCEPTANCE)])
+
+        ids = self.ids(self.client.get(self.url('restaurant', self.restaurant.id), {'status': 'preparing'}))
+        self.assertEqual(ids, [self.orders[S.PREPARING].id])
+
+    def test_rider_active_orders(self):
+        S = Order.Status
+        response = self.client.get(self.url('rider', self.rider.id), {'include': 'restaurant', 'page_size': 1})
+        self.assertEqual(self.ids(response), [self.orders[S.IN_TRANSIT].id])
+        self.assertIsNotNone(response.json()['next'])
+        self.assertEqual(response.json()['included']['restaurants'][0]['id'], self.restaurant.id)
+
+    def test_count_mode(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url('restaurant', self.restaurant.id), {'count': 'true'})
+        self.assertEqual(response.json(), {
+            "count": 3, "by_status": {'pending_acceptance': 1, 'preparing': 1, 'ready_for_pickup': 1},
+        })
+        self.assertEqual(len(queries), 2)  # 식당 존재 확인 + GROUP BY 1회
+
+        response = self.client.get(self.url('rider', self.rider.id), {'count': '1', 'status': 'in_transit'})
+        self.assertEqual(response.json(), {"count": 1, "by_status": {'in_transit': 1}})
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(self.url('restaurant', 999999)).status_code, 404)
+        response = self.client.get(self.url('rider', self.rider.id), {'status': 'preparing'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json())
+
+    def test_uses_partial_indexes(self):
+        # 작은 테이블에서도 부분 인덱스를 고르도록 순차 스캔을 끄고 실행 계획 확인
+        queryset = Order.objects.filter(restaurant_id=self.restaurant.id, status__in=['preparing'])
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            self.assertIn('order_rest_active_idx', queryset.order_by('-created_at', '-id').explain())
+            counts = Order.objects.filter(rider_id=self.rider.id, status__in=['in_transit']).values('status')
+            self.assertIn('order_rider_active_idx', counts.annotate(n=Count('*')).order_by().explain())
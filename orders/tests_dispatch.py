@@ -0,0 +1,162 @@
+import random
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.admin import OrderAdmin
+from orders.dispatch import RiderDispatcher, RiderGrid, distance_km
+from orders.events import get_hub
+from orders.models import Order, OrderEvent, Restaurant, Rider
+
+# 서울 시청 근처
+LAT, LON = 37.5665, 126.9780
+
+
+class RiderGridTestCase(SimpleTestCase):
+    def test_nearest_matches_brute_force(self):
+        rng = random.Random(7)
+        grid = RiderGrid(cell_size=0.005)
+        points = {i: (LAT + rng.uniform(-0.1, 0.1), LON + rng.uniform(-0.1, 0.1)) for i in range(2000)}
+        for rider_id, (lat, lon) in points.items():
+            grid.update(rider_id, lat, lon)
+
+        for _ in range(50):
+            lat, lon = LAT + rng.uniform(-0.1, 0.1), LON + rng.uniform(-0.1, 0.1)
+            expected = sorted((distance_km(lat, lon, *p), i) for i, p in points.items())
+            expected = [item for item in expected if item[0] <= 3.0][:5]
+            self.assertEqual(grid.nearest(lat, lon, k=5, max_km=3.0), expected)
+
+    def test_incremental_update(self):
+        grid = RiderGrid()
+        grid.update(1, LAT, LON)
+        grid.update(2, LAT + 0.05, LON)
+        self.assertEqual([r for _, r in grid.nearest(LAT, LON, k=2)], [1, 2])
+
+        grid.update(1, LAT + 0.08, LON)  # 다른 칸으로 이동
+        self.assertEqual([r for _, r in grid.nearest(LAT, LON, k=2)], [2, 1])
+        grid.update(2, LAT, LON, available=False)
+        self.assertNotIn(2, grid)
+        self.assertEqual(grid.nearest(LAT, LON, k=2, max_km=1.0), [])
+        self.assertEqual(len(grid), 1)
+
+
+class RiderDispatchTestCase(TestCase):
+    def setUp(self):
+        self.dispatcher = RiderDispatcher()
+        patcher = mock.patch('orders.dispatch._dispatcher', self.dispatcher)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.restaurant = Restaurant.objects.create(name="치킨집", address="서울시", latitude=LAT, longitude=LON)
+        self.near = Rider.objects.create(name="가까운 라이더", latitude=LAT + 0.001, longitude=LON)
+        self.far = Rider.objects.create(name="먼 라이더", latitude=LAT + 0.02, longitude=LON)
+        Rider.objects.create(name="쉬는 라이더", latitude=LAT, longitude=LON, is_available=False)
+        Rider.objects.create(name="위치 없음")
+
+    def ready_order(self):
+        return Order.objects.create(status=Order.Status.READY_FOR_PICKUP, restaurant=self.restaurant)
+
+    def test_assigns_nearest_available_rider(self):
+        first, second, third = self.ready_order(), self.ready_order(), self.ready_order()
+        hub = get_hub()
+        published = []
+        with mock.patch.object(hub, 'publish', published.append), self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.dispatcher.assign(first.pk), self.near.pk)
+            self.assertEqual(self.dispatcher.assign(second.pk), self.far.pk)
+            self.assertIsNone(self.dispatcher.assign(third.pk))  # 남은 배차 가능 라이더 없음
+
+        first.refresh_from_db()
+        self.assertEqual((first.rider_id, first.version), (self.near.pk, 2))
+        self.assertFalse(Rider.objects.get(pk=self.near.pk).is_available)
+        self.assertIsNone(self.dispatcher.assign(first.pk))  # 이미 배정된 주문
+
+        # 전이 밖의 배정도 ETag가 바뀌므로 아웃박스와 SSE로 알림 (상태는 그대로)
+        self.assertEqual(
+            list(OrderEvent.objects.order_by('id').values_list('order_id', 'action', 'to_status', 'version')),
+            [(first.pk, 'rider_assignment', Order.Status.READY_FOR_PICKUP, 2),
+             (second.pk, 'rider_assignment', Order.Status.READY_FOR_PICKUP, 2)],
+        )
+        self.assertEqual([(e.id, e.version) for e in published], [(first.pk, 2), (second.pk, 2)])
+
+    def test_claim_is_conditional(self):
+        self.dispatcher.load()
+        # 다른 프로세스가 먼저 데려간 라이더: 인덱스에는 남아 있지만 확보 UPDATE가 0행 -> 다음 후보
+        Rider.objects.filter(pk=self.near.pk).update(is_available=False)
+        self.assertEqual(self.dispatcher.assign(self.ready_order().pk), self.far.pk)
+        self.assertNotIn(self.near.pk, self.dispatcher.grid)
+
+    def test_index_reloads_changes_from_other_processes(self):
+        self.dispatcher.load()
+        # 다른 프로세스에서 배달을 마쳐 풀려난 라이더 (이 프로세스의 인덱스에는 없음)
+        resting = Rider.objects.get(name="쉬는 라이더")
+        Rider.objects.filter(pk=resting.pk).update(is_available=True)
+        self.dispatcher.load()
+        self.assertNotIn(resting.pk, self.dispatcher.grid)  # reload_interval 전에는 다시 읽지 않음
+
+        self.dispatcher.loaded_at -= self.dispatcher.reload_interval
+        order = self.ready_order()
+        self.assertEqual(self.dispatcher.assign_pending()[:2], (1, 1))
+        self.assertEqual(Order.objects.get(pk=order.pk).rider_id, resting.pk)
+
+    def test_lifecycle(self):
+        client = APIClient()
+        order = Order.objects.create(status=Order.Status.PREPARING, restaurant=self.restaurant)
+        etag = client.get(f'/api/v2/orders/{order.pk}/')['ETag']
+
+        def act(action, etag):
+            # 직전 행위 응답의 ETag로 이어서 요청 (다시 GET 하지 않음)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(reverse(f'order-v2-{action}', args=[order.pk]), HTTP_IF_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            return response
+
+        # 배정은 전이와 같은 version에 들어가므로 응답 표현/ETag가 이미 배정 후 상태
+        response = act('preparation-complete', etag)
+        self.assertEqual((response.json()['rider'], response.json()['version']), (self.near.pk, 2))
+        self.assertEqual(client.get(f'/api/v2/orders/{order.pk}/')['ETag'], response['ETag'])
+        response = act('pickup', response['ETag'])
+        act('delivery', response['ETag'])
+        self.assertTrue(Rider.objects.get(pk=self.near.pk).is_available)
+        self.assertIn(self.near.pk, self.dispatcher.grid)
+        self.assertFalse(OrderEvent.objects.filter(action='rider_assignment').exists())
+
+    def test_admin_action_uses_transition_hooks(self):
+        order = self.ready_order()
+        self.dispatcher.assign(order.pk)
+        Order.objects.filter(pk=order.pk).update(status=Order.Status.IN_TRANSIT)
+        [delivery] = [a for a in OrderAdmin.actions if a.__name__ == 'apply_delivery']
+        hub = get_hub()
+        published = []
+        with mock.patch.object(hub, 'publish', published.append), self.captureOnCommitCallbacks(execute=True):
+            delivery(mock.Mock(), None, Order.objects.filter(pk=order.pk))
+
+        # 관리자 배달 완료도 라이더 반납(after 훅)과 SSE 발행을 거침
+        self.assertTrue(Rider.objects.get(pk=self.near.pk).is_available)
+        self.assertIn(self.near.pk, self.dispatcher.grid)
+        self.assertEqual([(e.id, e.status, e.version) for e in published], [(order.pk, Order.Status.DELIVERED, 3)])
+
+    def test_batch_transition_assigns_in_same_version(self):
+        client = APIClient()
+        order = Order.objects.create(status=Order.Status.PREPARING, restaurant=self.restaurant)
+        etag = client.get(f'/api/v2/orders/{order.pk}/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(reverse('order-v2-batch-transitions'), {"transitions": [
+                {"order_id": order.pk, "action": "preparation_complete", "if_match": etag},
+            ]}, format='json')
+        [entry] = response.json()['results']
+        self.assertEqual(entry['order']['rider'], self.near.pk)
+        self.assertEqual(client.get(f'/api/v2/orders/{order.pk}/')['ETag'], entry['etag'])
+
+    def test_command_assigns_pending_orders(self):
+        orders = [self.ready_order() for _ in range(3)]
+        Order.objects.create(status=Order.Status.READY_FOR_PICKUP)  # 식당 좌표 없음 -> 대상 아님
+        out = StringIO()
+        call_command('dispatch_riders', '--once', stdout=out)
+        self.assertIn("2 of 3 orders assigned", out.getvalue())
+        self.assertEqual(
+            list(Order.objects.filter(pk__in=[o.pk for o in orders]).order_by('id').values_list('rider_id', flat=True)),
+            [self.near.pk, self.far.pk, None],
+        )
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from orders.api.v2.views import OrderV2ViewSet
+from orders.etags import CachedETag, KeyedETag, MD5ETag, WeakETag, parse_etags
+from orders.models import Order
+
+
+class ETagStrategyTestCase(SimpleTestCase):
+    def test_parse_if_match_list(self):
+        self.assertEqual(parse_etags('"a", W/"b" ,"c"'), ['a', 'b', 'c'])
+        self.assertEqual(parse_etags('*'), ['*'])
+        self.assertEqual(parse_etags(''), [])
+
+    def test_matches_without_rehashing_client_tags(self):
+        strategy = MD5ETag()
+        value = strategy.make(1, 2)
+        self.assertTrue(strategy.matches(['x', value], value))
+        self.assertTrue(strategy.matches(['*'], value))
+        self.assertFalse(strategy.matches(['x'], value))
+
+    def test_db_values(self):
+        self.assertEqual(WeakETag().db_value('7-3', 7), '3')
+        self.assertIsNone(WeakETag().db_value('8-3', 7))  # 다른 주문의 태그
+        keyed = KeyedETag(key='k')
+        self.assertEqual(keyed.db_value(keyed.make(7, 3), 7), '3')
+        self.assertIsNone(keyed.db_value(keyed.make(8, 3), 7))
+        self.assertIsNone(keyed.db_value('3.0000000000000000', 7))  # 위조된 태그
+        self.assertIsNone(keyed.db_value('3.é', 7))  # ASCII가 아닌 태그
+        self.assertIsNone(keyed.db_value('٣.' + keyed.mac(7, 3), 7))
+
+    def test_cached_strategy_follows_version(self):
+        strategy = CachedETag(MD5ETag())
+        order = Order(id=1, version=1)
+        first = strategy.for_order(order)
+        self.assertEqual(first, MD5ETag().make(1, 1))
+        with mock.patch.object(MD5ETag, 'make', side_effect=AssertionError):
+            self.assertEqual(strategy.for_order(order), first)  # 재계산 없음
+        order.version = 2
+        self.assertEqual(strategy.for_order(order), MD5ETag().make(1, 2))
+
+
+class ETagStrategyApiTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.order = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+
+    def accept(self, if_match):
+        return self.client.post(f'/api/v2/orders/{self.order.id}/acceptance/', HTTP_IF_MATCH=if_match)
+
+    def test_weak_strategy_round_trip(self):
+        with mock.patch.object(OrderV2ViewSet, 'etag_strategy', WeakETag()):
+            etag = self.client.get(f'/api/v2/orders/{self.order.id}/')['ETag']
+            self.assertEqual(etag, f'W/"{self.order.id}-1"')
+            self.assertEqual(self.accept(etag).status_code, 200)
+            self.assertEqual(self.accept(etag).status_code, 412)  # 이미 version 2
+
+    def test_keyed_strategy_rejects_forged_tag(self):
+        with mock.patch.object(OrderV2ViewSet, 'etag_strategy', KeyedETag()):
+            res = self.accept(f'"1.{"0" * 16}"')
+            self.assertEqual(res.status_code, 412)
+            self.assertEqual(self.accept('"1.\xe9"').status_code, 412)
+            self.assertEqual(res.json()['current_version'], 1)
+            etag = self.client.get(f'/api/v2/orders/{self.order.id}/')['ETag']
+            self.assertEqual(self.accept(etag).status_code, 200)
+
+    def test_if_match_list_and_wildcard(self):
+        etag = self.client.get(f'/api/v2/orders/{self.order.id}/')['ETag']
+        self.assertEqual(self.accept(f'"stale", {etag}').status_code, 200)
+        res = self.client.post(f'/api/v2/orders/{self.order.id}/preparation-complete/', HTTP_IF_MATCH='*')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['version'], 3)
@@ -0,0 +1,163 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from orders.api.v2.streams import EventStreamApplication
+from orders.events import LAGGED, OrderEventHub, StatusEvent, get_hub
+from orders.models import Order
+
+
+def event(order_id, version, status='preparing'):
+    return StatusEvent(order_id, status, version, f'"{order_id}-{version}"')
+
+
+class OrderEventHubTestCase(SimpleTestCase):
+    def test_fan_out_and_backpressure(self):
+        async def scenario():
+            hub = OrderEventHub(queue_size=2)
+            fast, slow = hub.subscribe(1), hub.subscribe(1)
+            other = hub.subscribe(2)
+            hub.publish(event(1, 2))
+            self.assertEqual(await fast.get(0), event(1, 2))
+            hub.publish(event(1, 3))
+            self.assertEqual(await fast.get(0), event(1, 3))
+            self.assertIsNone(await other.get(0))
+            # slow는 한 번도 읽지 않음 -> 세 번째 이벤트에서 큐가 넘쳐 LAGGED 후 구독 해제
+            hub.publish(event(1, 4))
+            self.assertIs(await slow.get(0), LAGGED)
+            self.assertEqual(hub.dropped, 1)
+            self.assertEqual(hub.subscriber_count, 2)
+
+        asyncio.run(scenario())
+
+    def test_replay(self):
+        async def scenario():
+            hub = OrderEventHub(history_size=2)
+            hub.subscribe(1)
+            for version in (2, 3, 4):
+                hub.publish(event(1, version))
+            self.assertEqual([e.version for e in hub.replay(1, 3)], [4])
+            self.assertEqual(hub.replay(1, 4), [])
+            self.assertIsNone(hub.replay(1, 1))  # version 2는 이미 밀려남 -> 현재 상태로 대체
+            self.assertIsNone(hub.replay(9, 1))
+
+        asyncio.run(scenario())
+
+    def test_publish_from_other_thread(self):
+        async def scenario():
+            hub = OrderEventHub()
+            subscription = hub.subscribe(1)
+            await asyncio.to_thread(hub.publish, event(1, 2))
+            self.assertEqual(await subscription.get(1), event(1, 2))
+
+        asyncio.run(scenario())
+
+
+class EventStreamApplicationTestCase(SimpleTestCase):
+    order_id = 987654
+
+    def scope(self, path, method='GET'):
+        return {'type': 'http', 'method': method, 'path': path, 'headers': [(b'last-event-id', b'1')]}
+
+    @mock.patch('orders.api.v2.streams.load_order')
+    def test_streams_until_disconnect(self, load_order):
+        load_order.return_value = Order(id=self.order_id, status=Order.Status.PREPARING, version=1)
+
+        async def scenario():
+            app = EventStreamApplication(mock.AsyncMock())
+            communicator = ApplicationCommunicator(app, self.scope(f'/api/v2/orders/{self.order_id}/events/'))
+            await communicator.send_input({'type': 'http.request', 'body': b''})
+            start = await communicator.receive_output(1)
+            self.assertEqual(start['status'], 200)
+            self.assertIn((b'content-type', b'text/event-stream; charset=utf-8'), start['headers'])
+            self.assertTrue((await communicator.receive_output(1))['body'].startswith(b'retry:'))
+
+            # Last-Event-ID: 1 == 현재 version -> 현재 상태는 다시 보내지 않고 새 이벤트만
+            get_hub().publish(event(self.order_id, 2))
+            body = (await communicator.receive_output(1))['body'].decode()
+            self.assertTrue(body.startswith('id: 2\n'))
+
+            await communicator.send_input({'type': 'http.disconnect'})
+            await communicator.wait(1)
+            self.assertNotIn(self.order_id, get_hub().subscribers)
+
+        asyncio.run(scenario())
+
+    def test_other_paths_fall_through(self):
+        async def scenario():
+            fallback = mock.AsyncMock()
+            app = EventStreamApplication(fallback)
+            await app(self.scope('/api/v2/orders/1/'), None, None)
+            fallback.assert_awaited_once()
+
+            sent = []
+
+            async def send(message):
+                sent.append(message)
+
+            await app(self.scope('/api/v2/orders/1/events/', method='POST'), None, send)
+            self.assertEqual(sent[0]['status'], 405)
+
+        asyncio.run(scenario())
+
+
+class OrderEventStreamTestCase(TestCase):
+    def setUp(self):
+        self.order = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+        self.url = f'/api/v2/orders/{self.order.id}/events/'
+
+    async def read_events(self, stream, count):
+        events = []
+        while len(events) < count:
+            chunk = await asyncio.wait_for(anext(stream), 5)
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if chunk.startswith('id:'):
+                lines = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+                events.append((int(lines['id']), json.loads(lines['data'])))
+        return events
+
+    async def test_stream_sends_current_state_then_commits(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        [(event_id, data)] = await self.read_events(stream, 1)
+        self.assertEqual((event_id, data['status']), (1, Order.Status.PENDING_ACCEPTANCE))
+
+        get_hub().publish(event(self.order.id, 2))
+        [(event_id, data)] = await self.read_events(stream, 1)
+        self.assertEqual(event_id, 2)
+        self.assertEqual(data, event(self.order.id, 2).as_dict())
+        await stream.aclose()
+
+    async def test_resume_with_last_event_id(self):
+        hub = get_hub()
+        hub.subscribe(self.order.id)  # history를 남기기 위한 구독자
+        for version in (2, 3):
+            hub.publish(event(self.order.id, version))
+        await Order.objects.filter(pk=self.order.pk).aupdate(version=3)
+        response = await self.async_client.get(self.url, headers={'Last-Event-ID': '1'})
+        stream = aiter(response.streaming_content)
+        self.assertEqual([v for v, _ in await self.read_events(stream, 2)], [2, 3])
+        await stream.aclose()
+
+    async def test_missing_order(self):
+        response = await self.async_client.get('/api/v2/orders/999999/events/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_transition_publishes_after_commit(self):
+        published = []
+        hub = get_hub()
+        original, hub.publish = hub.publish, published.append
+        try:
+            client = APIClient()
+            etag = client.get(f'/api/v2/orders/{self.order.id}/')['ETag']
+            with self.captureOnCommitCallbacks(execute=True):
+                client.post(f'/api/v2/orders/{self.order.id}/acceptance/', HTTP_IF_MATCH=etag)
+        finally:
+            hub.publish = original
+        self.assertEqual([(e.id, e.status, e.version) for e in published],
+                         [(self.order.id, Order.Status.PREPARING, 2)])
@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from orders.api.v2.fastpath import FastListSerializer
+from orders.api.v2.serializers import OrderV2Serializer
+from orders.api.v2.views import OrderV2ViewSet
+from orders.models import Order, Restaurant, Rider
+
+
+class FastListSerializerGoldenTestCase(TestCase):
+    """고속 경로와 DRF Serializer 경로의 JSON 바이트가 같은지 비교"""
+
+    def setUp(self):
+        self.client = APIClient()
+        restaurant = Restaurant.objects.create(name="치킨집", address="서울시")
+        rider = Rider.objects.create(name="배달원")
+        for i in range(6):
+            Order.objects.create(
+                restaurant=restaurant if i % 2 else None,
+                rider=rider if i % 3 else None,
+                restaurant_name=f'가게 "{i}" \\ 🍗',
+                status=list(Order.Status)[i % len(Order.Status)],
+            )
+        # 마이크로초 0 / 0이 아닌 값 모두 포함 (isoformat 자릿수 차이 검증)
+        Order.objects.filter(pk=Order.objects.first().pk).update(
+            created_at=timezone.now().replace(microsecond=0)
+        )
+
+    def assert_same_bytes(self, fields=None):
+        queryset = Order.objects.order_by('-created_at', '-id')
+        expected = JSONRenderer().render(OrderV2Serializer(queryset, many=True, fields=fields).data)
+        fast = FastListSerializer(OrderV2Serializer, fields)
+        actual = JSONRenderer().render(fast.to_representation(list(fast.select(queryset))))
+        self.assertEqual(actual, expected)
+
+    def test_serializer_output_is_byte_identical(self):
+        self.assert_same_bytes()
+        self.assert_same_bytes(['status', 'id'])
+        self.assert_same_bytes(['created_at', 'rider'])
+
+    def test_api_response_is_byte_identical(self):
+        for url in (
+            '/api/v2/orders/?page_size=4',
+            '/api/v2/orders/?include=restaurant,rider&fields=id,restaurant',
+            '/api/v2/orders/?status=pending_payment',
+        ):
+            fast = self.client.get(url).content
+            with mock.patch.object(OrderV2ViewSet, 'fast_list', False):
+                slow = self.client.get(url).content
+            self.assertEqual(fast, slow, url)
+
+    def test_empty_page(self):
+        fast = FastListSerializer(OrderV2Serializer)
+        self.assertEqual(fast.to_representation([]), [])
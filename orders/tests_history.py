@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.history import state_as_of
+from orders.models import Order, OrderStatusTransition
+from orders.state_machine import TRANSITIONS
+from orders.transitions import transition_orders
+
+
+class OrderStatusHistoryTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.order = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+        self.url = f'/api/v2/orders/{self.order.id}/'
+
+    def act(self, path):
+        etag = self.client.get(self.url)['ETag']
+        res = self.client.post(f'{self.url}{path}/', HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+
+    def test_transitions_are_recorded_as_codes(self):
+        self.act('acceptance')
+        self.act('preparation-complete')
+        rows = list(OrderStatusTransition.objects.order_by('version').values_list('version', 'from_code', 'to_code'))
+        self.assertEqual(rows, [(2, 2, 3), (3, 3, 4)])
+
+        res = self.client.get(f'{self.url}history/')
+        self.assertEqual(res.status_code, 200)
+        history = res.json()['history']
+        self.assertEqual(
+            [(h['version'], h['action'], h['from_status'], h['to_status']) for h in history],
+            [(2, 'acceptance', 'pending_acceptance', 'preparing'),
+             (3, 'preparation_complete', 'preparing', 'ready_for_pickup')],
+        )
+
+    def test_failed_transition_is_not_recorded(self):
+        res = self.client.post(f'{self.url}acceptance/', HTTP_IF_MATCH='"stale"')
+        self.assertEqual(res.status_code, 412)
+        self.assertFalse(OrderStatusTransition.objects.exists())
+        self.assertEqual(self.client.get(f'{self.url}history/').json()['history'], [])
+
+    def test_batch_records_history_in_transition_statement(self):
+        others = Order.objects.bulk_create([Order(status=Order.Status.PENDING_ACCEPTANCE) for _ in range(3)])
+        items = [(order.id, ['*'], TRANSITIONS['acceptance']) for order in [self.order, *others]]
+        with CaptureQueriesContext(connection) as ctx:
+            transition_orders(items)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(OrderStatusTransition.objects.count(), 4)
+
+    def test_as_of(self):
+        self.act('acceptance')
+        self.act('preparation-complete')
+        created = timezone.now() - timedelta(hours=1)
+        Order.objects.filter(pk=self.order.pk).update(created_at=created)
+        for version, minutes in ((2, 10), (3, 20)):
+            OrderStatusTransition.objects.filter(version=version).update(created_at=created + timedelta(minutes=minutes))
+
+        def as_of(minutes):
+            when = (created + timedelta(minutes=minutes)).isoformat()
+            return self.client.get(f'{self.url}history/', {'as_of': when})
+
+        self.assertEqual(as_of(-1).status_code, 404)  # 주문 생성 전
+        before = as_of(5).json()
+        self.assertEqual((before['status'], before['version']), ('pending_acceptance', 1))
+        middle = as_of(15).json()
+        self.assertEqual((middle['status'], middle['version']), ('preparing', 2))
+        self.assertEqual(middle['since'], as_of(10).json()['since'])
+        latest = as_of(30).json()
+        self.assertEqual((latest['status'], latest['version']), ('ready_for_pickup', 3))
+
+    def test_as_of_without_history_uses_current_state(self):
+        state = state_as_of(self.order.id, timezone.now() + timedelta(minutes=1))
+        self.assertEqual((state.status, state.version), ('pending_acceptance', 1))
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get(f'{self.url}history/', {'as_of': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(f'{self.url}history/', {'as_of': '2026-13-01T00:00:00'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v2/orders/999999/history/').status_code, 404)
@@ -0,0 +1,177 @@
+import hashlib
+import threading
+import uuid
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from orders import transitions
+from orders.models import Order, IdempotencyKey
+
+
+def etag_of(order):
+    return f'"{hashlib.md5(f"order-{order.id}-v{order.version}".encode()).hexdigest()}"'
+
+
+class IdempotencyConcurrencyTestCase(TransactionTestCase):
+    PARALLEL = 8
+
+    def test_parallel_duplicates_execute_once(self):
+        order = Order.objects.create(status=Order.Status.PENDING_PAYMENT)
+        url = reverse('order-v2-payment', args=[order.id])
+        headers = {'HTTP_IF_MATCH': etag_of(order), 'HTTP_IDEMPOTENCY_KEY': str(uuid.uuid4())}
+        data = {'payment_method': 'card', 'amount': 20000}
+
+        responses = []
+        barrier = threading.Barrier(self.PARALLEL)
+
+        def fire():
+            try:
+                barrier.wait()
+                responses.append(APIClient().post(url, data, **headers))
+            finally:
+                connection.close()
+
+        with mock.patch('orders.api.v2.views.transition_orders', wraps=transitions.transition_orders) as engine:
+            threads = [threading.Thread(target=fire) for _ in range(self.PARALLEL)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        # 실제 결제(예약 + 확정 전이)는 정확히 1번, 나머지는 같은 응답을 재사용
+        self.assertEqual(engine.call_count, 2)
+        self.assertEqual([r.status_code for r in responses], [200] * self.PARALLEL)
+        self.assertEqual(len({r.content for r in responses}), 1)
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.version), (Order.Status.PENDING_ACCEPTANCE, 3))
+        self.assertEqual(IdempotencyKey.objects.get().status, IdempotencyKey.Status.COMPLETED)
+
+
+# 결제 연동/지연 주입의 트랜잭션 검사에서 TestCase가 감싼 atomic 2단계(클래스 + 테스트)는 제외
+@override_settings(ORDER_LATENCY_OUTER_ATOMIC_DEPTH=2)
+class IdempotencyReplayTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.order = Order.objects.create(status=Order.Status.PENDING_PAYMENT)
+        self.url = reverse('order-v2-payment', args=[self.order.id])
+
+    def test_hot_retry_is_served_from_memory(self):
+        headers = {'HTTP_IF_MATCH': etag_of(self.order), 'HTTP_IDEMPOTENCY_KEY': str(uuid.uuid4())}
+        first = self.client.post(self.url, {'payment_method': 'card', 'amount': 1}, **headers)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            second = self.client.post(self.url, {'payment_method': 'card', 'amount': 1}, **headers)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.json(), first.json())
+
+    def test_replay_is_pre_rendered_bytes(self):
+        headers = {'HTTP_IF_MATCH': etag_of(self.order), 'HTTP_IDEMPOTENCY_KEY': str(uuid.uuid4())}
+        data = {'payment_method': 'card', 'amount': 1}
+        first = self.client.post(self.url, data, format='json', **headers)
+        second = self.client.post(self.url, data, format='json', **headers)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+
+    def test_key_reuse_with_different_payload_is_rejected(self):
+        key = str(uuid.uuid4())
+        headers = {'HTTP_IF_MATCH': etag_of(self.order), 'HTTP_IDEMPOTENCY_KEY': key}
+        first = self.client.post(self.url, {'payment_method': 'card', 'amount': 1}, **headers)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        # 다른 금액
+        response = self.client.post(self.url, {'payment_method': 'card', 'amount': 2}, **headers)
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+        # 다른 주문 (메모리 캐시를 비워 DB 경로도 확인)
+        from orders.idempotency import get_store
+        get_store().completed.discard(uuid.UUID(key))
+        other = Order.objects.create(status=Order.Status.PENDING_PAYMENT)
+        response = self.client.post(
+            reverse('order-v2-payment', args=[other.id]), {'payment_method': 'card', 'amount': 1}, **headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_failed_request_releases_key(self):
+        key = str(uuid.uuid4())
+        failed = self.client.post(self.url, {}, HTTP_IF_MATCH='"stale"', HTTP_IDEMPOTENCY_KEY=key)
+        self.assertEqual(failed.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertFalse(IdempotencyKey.objects.filter(key=key).exists())
+
+        retried = self.client.post(self.url, {}, HTTP_IF_MATCH=etag_of(self.order), HTTP_IDEMPOTENCY_KEY=key)
+        self.assertEqual(retried.status_code, status.HTTP_200_OK)
+
+
+class IdempotencyExpiryTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def _expire(self, key):
+        from datetime import timedelta
+        from django.utils import timezone
+        IdempotencyKey.objects.filter(key=key).update(created_at=timezone.now() - timedelta(days=2))
+
+    def test_expired_key_is_treated_as_absent(self):
+        from orders.idempotency import get_store
+        order = Order.objects.create(status=Order.Status.PENDING_PAYMENT)
+        key = uuid.uuid4()
+        url = reverse('order-v2-cancellation', args=[order.id])
+        # cancellation은 @idempotent 대상이 아니므로 저장소를 직접 사용
+        store = get_store()
+        first = store.run(key, lambda: self.client.post(url, {}, HTTP_IF_MATCH=etag_of(order)))
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        self._expire(key)
+        store.completed.discard(key)
+        calls = []
+        store.run(key, lambda: calls.append(1) or first)
+        self.assertEqual(calls, [1])
+
+    def test_crashed_holder_lease_is_taken_over(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from rest_framework.response import Response
+        from orders.idempotency import FINGERPRINT_MISMATCH, IdempotencyStore
+        store = IdempotencyStore(wait_timeout=0.1, poll_interval=0.02, in_progress_timeout=30)
+        key = uuid.uuid4()
+        # 선점한 워커가 죽어 in_progress로 남은 행
+        IdempotencyKey.objects.create(key=key, fingerprint='fp')
+        calls = []
+
+        def handler():
+            calls.append(1)
+            return Response({"ok": True})
+
+        self.assertIsNone(store.run(key, handler, fingerprint='fp'))  # lease 안: 처리중으로 보고 기다림
+        self.assertEqual(calls, [])
+
+        crashed_at = timezone.now() - timedelta(seconds=31)
+        IdempotencyKey.objects.filter(key=key).update(created_at=crashed_at)
+        self.assertIs(store.run(key, handler, fingerprint='other'), FINGERPRINT_MISMATCH)
+        self.assertEqual(store.run(key, handler, fingerprint='fp').status_code, 200)
+        self.assertEqual(calls, [1])
+
+        # 늦게 끝난 이전 처리의 해제는 새로 완료된 키를 지우지 않음
+        store._release(key, crashed_at)
+        self.assertEqual(IdempotencyKey.objects.get(key=key).status, IdempotencyKey.Status.COMPLETED)
+
+    def test_prune_command_deletes_in_batches(self):
+        from io import StringIO
+        from django.core.management import call_command
+        keys = [uuid.uuid4() for _ in range(5)]
+        IdempotencyKey.objects.bulk_create([
+            IdempotencyKey(key=k, status=IdempotencyKey.Status.COMPLETED, response_status=200, response_content=b'{}')
+            for k in keys
+        ])
+        for k in keys[:3]:
+            self._expire(k)
+
+        out = StringIO()
+        call_command('prune_idempotency_keys', batch_size=2, stdout=out)
+        self.assertEqual(set(IdempotencyKey.objects.values_list('key', flat=True)), set(keys[3:]))
+        self.assertIn("3 keys pruned", out.getvalue())
@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.imports import OrderImporter, read_records
+from orders.models import Order, Restaurant, Rider
+
+
+class ImportOrdersTestCase(TestCase):
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name="치킨집", address="서울시")
+        self.other = Restaurant.objects.create(name="피자집", address="서울시")
+        self.rider = Rider.objects.create(name="김라이더")
+
+    def write(self, content, suffix):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_csv_with_cached_foreign_keys(self):
+        path = self.write(
+            "restaurant,rider,status,created_at\n"
+            "치킨집,김라이더,delivered,2026-01-02T03:04:05+00:00\n"
+            f"{self.other.id},,preparing,\n"
+            "치킨집,,,\n"
+            "피자집,김라이더,in_transit,\n"
+            ",,,\n",
+            '.csv',
+        )
+        out = StringIO()
+        call_command('import_orders', path, '--chunk-size', '2', stdout=out)
+        # 첫 묶음에서 식당/라이더 각 1회. id로 찾은 피자집은 이름으로도 캐시되어 이후 묶음은 조회 없음
+        self.assertIn("5 orders imported", out.getvalue())
+        self.assertIn("FK lookups: 2 queries", out.getvalue())
+
+        rows = list(Order.objects.order_by('id').values_list(
+            'restaurant_id', 'rider_id', 'restaurant_name', 'status', 'version'))
+        self.assertEqual(rows, [
+            (self.restaurant.id, self.rider.id, "치킨집", 'delivered', 1),
+            (self.other.id, None, "피자집", 'preparing', 1),
+            (self.restaurant.id, None, "치킨집", 'pending_payment', 1),
+            (self.other.id, self.rider.id, "피자집", 'in_transit', 1),
+            (None, None, "맛있는 치킨집", 'pending_payment', 1),
+        ])
+        self.assertEqual(Order.objects.order_by('id').first().created_at,
+                         datetime(2026, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc))
+
+    def test_jsonl_errors(self):
+        path = self.write(
+            json.dumps({"restaurant": "치킨집"}) + "\n"
+            + json.dumps({"restaurant": "없는 식당"}) + "\n"
+            + "{broken\n"
+            + json.dumps({"status": "flying"}) + "\n"
+            + json.dumps({"rider": self.rider.id}) + "\n",
+            '.jsonl',
+        )
+        with self.assertRaisesMessage(CommandError, "row 2: unknown restaurant '없는 식당' (1 rows imported"):
+            call_command('import_orders', path, '--chunk-size', '1', stdout=StringIO())
+        self.assertEqual(Order.objects.count(), 1)  # 오류 이전 묶음은 커밋됨
+
+        Order.objects.all().delete()
+        err = StringIO()
+        call_command('import_orders', path, '--skip-errors', stdout=StringIO(), stderr=err)
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertIn("row 3: invalid JSON", err.getvalue())
+        self.assertIn("row 4: unknown status 'flying'", err.getvalue())
+
+    def test_bulk_create_method(self):
+        importer = OrderImporter(chunk_size=10, method='bulk_create', skip_errors=True)
+        records = read_records(StringIO("restaurant,created_at\n치킨집,\n치킨집,2026-01-01T00:00:00Z\n"), 'csv')
+        [report] = importer.run(records)
+        self.assertEqual((report.rows, len(report.ids)), (1, 1))
+        self.assertEqual([e.message for e in report.errors], ["created_at can only be set by the COPY loader"])
+
+
+class BulkOrderEndpointTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('order-v2-bulk')
+        self.restaurant = Restaurant.objects.create(name="치킨집", address="서울시")
+
+    def test_json(self):
+        response = self.client.post(self.url, {"orders": [
+            {"restaurant": "치킨집", "status": "preparing"}, {"restaurant": self.restaurant.id},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        ids = response.json()['ids']
+        self.assertEqual(list(Order.objects.order_by('id').values_list('id', 'status')),
+                         [(ids[0], 'preparing'), (ids[1], 'pending_payment')])
+
+    def test_json_errors_create_nothing(self):
+        response = self.client.post(self.url, {"orders": [{"restaurant": "치킨집"}, "oops"]}, format='json')
+        self.assertEqual((response.status_code, response.json()['row']), (400, 2))
+        self.assertFalse(Order.objects.exists())
+
+        response = self.client.post(f'{self.url}?skip_errors=true', {"orders": [{}, {"status": "x"}]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['created'], response.json()['errors'][0]['row']), (1, 2))
+
+        too_many = {"orders": [{}] * 1001}
+        self.assertEqual(self.client.post(self.url, too_many, format='json').status_code, 400)
+
+    def test_streamed_csv_and_jsonl(self):
+        body = "restaurant,status\n" + "치킨집,ready_for_pickup\n" * 3
+        response = self.client.post(self.url, body.encode(), content_type='text/csv')
+        self.assertEqual((response.status_code, response.json()), (201, {"created": 3, "errors": []}))
+
+        body = '{"restaurant": "치킨집"}\n{"restaurant": "없음"}\n'
+        response = self.client.post(self.url, body.encode(), content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Order.objects.count(), 3)
+
+    def test_malformed_stream_is_rejected(self):
+        body = "restaurant,restaurant_name\n치킨집,ok\n".encode('cp949')  # UTF-8이 아님
+        response = self.client.post(self.url, body, content_type='text/csv')
+        self.assertEqual((response.status_code, response.json()['error']), (400, "Malformed body"))
+
+        body = '{"restaurant_name": "a\\u0000b"}\n{"restaurant": "a\\u0000b"}\n'
+        response = self.client.post(self.url, body.encode(), content_type='application/x-ndjson')
+        self.assertEqual((response.status_code, response.json()['row']), (400, 1))
+        response = self.client.post(f'{self.url}?skip_errors=true', body.encode(), content_type='application/x-ndjson')
+        self.assertEqual([e['message'] for e in response.json()['errors']],
+                         ["restaurant_name contains a NUL character", "unknown restaurant 'a\x00b'"])
+        self.assertFalse(Order.objects.exists())
@@ -0,0 +1,93 @@
+import random
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from orders.latency import LatencyInjector, LatencyProfile
+from orders.models import Order
+
+
+class LatencyProfileTestCase(TestCase):
+    def test_parse_and_sample(self):
+        rng = random.Random(1)
+        self.assertFalse(LatencyProfile.parse('off').enabled)
+        self.assertEqual(LatencyProfile.parse('fixed:0.5').sample(rng), 0.5)
+        self.assertTrue(0.1 <= LatencyProfile.parse('uniform:0.1:0.3').sample(rng) <= 0.3)
+        self.assertTrue(all(LatencyProfile.parse('normal:0:1').sample(rng) >= 0 for _ in range(100)))
+        self.assertGreaterEqual(LatencyProfile.parse('exponential:0.2').sample(rng), 0)
+
+        for spec in ('sleep:1', 'fixed', 'fixed:-1', 'uniform:0.3:0.1', 'fixed:abc'):
+            with self.assertRaises(ValueError):
+                LatencyProfile.parse(spec)
+
+    def test_delay_is_capped(self):
+        injector = LatencyInjector({'payment': 'fixed:30'}, max_delay=0.01)
+        self.assertEqual(injector.delay_for('payment'), 0.01)
+        self.assertEqual(injector.delay_for('acceptance'), 0)
+
+
+# 결제 연동/지연 주입의 트랜잭션 검사에서 TestCase가 감싼 atomic 2단계(클래스 + 테스트)는 제외
+@override_settings(ORDER_LATENCY_OUTER_ATOMIC_DEPTH=2)
+class LatencyInjectionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.order = Order.objects.create(status=Order.Status.PENDING_PAYMENT)
+
+    def pay(self, order=None, **headers):
+        url = f'/api/v2/orders/{(order or self.order).id}/'
+        etag = self.client.get(url)['ETag']
+        return self.client.post(f'{url}payment/', headers={'If-Match': etag, **headers})
+
+    def test_disabled_by_default(self):
+        injector = LatencyInjector()
+        with mock.patch('orders.latency._injector', injector):
+            started = time.perf_counter()
+            self.assertEqual(self.pay().status_code, 200)
+            self.assertEqual(self.client.put(f'/api/orders/{self.order.id}/', {'status': 'cancelled'}).status_code, 200)
+            self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(injector.stats(), {})
+
+    def test_configured_profile_is_recorded(self):
+        injector = LatencyInjector({'payment': 'fixed:0.05', 'v1_update': 'fixed:0.02'})
+        with mock.patch('orders.latency._injector', injector):
+            self.assertEqual(self.pay().status_code, 200)
+            self.client.put(f'/api/orders/{self.order.id}/', {'status': 'cancelled'})
+        self.assertEqual(injector.stats(), {
+            'payment': {'count': 1, 'total': 0.05, 'max': 0.05},
+            'v1_update': {'count': 1, 'total': 0.02, 'max': 0.02},
+        })
+        self.client.force_authenticate(User.objects.create_user('ops', is_staff=True))
+        with mock.patch('orders.latency._injector', injector):
+            metrics = self.client.get('/api/v2/metrics/').json()
+        self.assertEqual(metrics['latency'], injector.stats())
+
+    def test_header_override(self):
+        injector = LatencyInjector({'payment': 'fixed:0.05'}, allow_header=True)
+        with mock.patch('orders.latency._injector', injector):
+            self.assertEqual(self.pay(**{'X-Simulated-Latency': 'payment=off'}).status_code, 200)
+            self.assertEqual(injector.stats(), {})
+
+            other = Order.objects.create(status=Order.Status.PENDING_PAYMENT)
+            self.assertEqual(self.pay(other, **{'X-Simulated-Latency': 'fixed:0.01'}).status_code, 200)
+            self.assertEqual(injector.stats()['payment']['total'], 0.01)
+
+            self.assertEqual(self.pay(**{'X-Simulated-Latency': 'payment=slow'}).status_code, 400)
+
+    def test_header_ignored_unless_allowed(self):
+        injector = LatencyInjector()
+        with mock.patch('orders.latency._injector', injector):
+            self.assertEqual(self.pay(**{'X-Simulated-Latency': 'fixed:5'}).status_code, 200)
+        self.assertEqual(injector.stats(), {})
+
+    def test_refuses_inside_transaction(self):
+        injector = LatencyInjector({'payment': 'fixed:0.01'})
+        with transaction.atomic(), self.assertRaises(RuntimeError):
+            injector.inject('payment')
+        self.assertEqual(injector.inject('payment'), 0.01)
+        self.assertEqual(async_to_sync(injector.ainject)('payment'), 0.01)
+        self.assertEqual(injector.stats()['payment']['count'], 2)
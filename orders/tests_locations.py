@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.dispatch import RiderDispatcher
+from orders.locations import LocationBuffer, LocationPing
+from orders.models import Rider
+
+LAT, LON = 37.5665, 126.9780
+
+
+class LocationBufferTestCase(TestCase):
+    def setUp(self):
+        self.buffer = LocationBuffer(flush_interval=None)
+        patcher = mock.patch('orders.locations._buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.riders = [Rider.objects.create(name=f"라이더{i}") for i in range(3)]
+        self.now = timezone.now() - timedelta(minutes=1)  # 핑 시각(now + 초)이 미래가 되지 않도록
+
+    def ping(self, rider, offset, seconds=0):
+        return LocationPing(rider.pk, LAT + offset, LON, self.now + timedelta(seconds=seconds))
+
+    def test_coalesces_to_one_statement(self):
+        for second in range(5):
+            self.buffer.add([self.ping(rider, second * 0.001, second) for rider in self.riders])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual([q['sql'].split()[0] for q in queries if 'SAVEPOINT' not in q['sql']], ['UPDATE'])
+        self.assertEqual(self.buffer.stats['coalesced'], 12)
+        self.assertEqual((self.buffer.stats['statements'], self.buffer.flush()), (1, 0))
+
+        rider = Rider.objects.get(pk=self.riders[0].pk)
+        self.assertEqual((rider.latitude, rider.location_updated_at), (LAT + 0.004, self.now + timedelta(seconds=4)))
+
+    def test_older_pings_do_not_overwrite(self):
+        rider = self.riders[0]
+        self.buffer.add([self.ping(rider, 0.002, seconds=10)])
+        self.buffer.add([self.ping(rider, 0.001, seconds=5)])  # 늦게 도착한 이전 핑
+        self.assertEqual(self.buffer.stats['stale'], 1)
+        self.assertEqual(self.buffer.latest(rider.pk).latitude, LAT + 0.002)
+
+        # 다른 프로세스가 이미 더 최신 위치를 기록한 경우
+        Rider.objects.filter(pk=rider.pk).update(location_updated_at=self.now + timedelta(seconds=20))
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertIsNone(Rider.objects.get(pk=rider.pk).latitude)
+
+    def test_future_pings_are_clamped(self):
+        rider = self.riders[0]
+        self.buffer.add([self.ping(rider, 0.001, seconds=3600)])  # 시계가 한 시간 앞선 기기
+        self.assertEqual(self.buffer.stats['clamped'], 1)
+        self.assertLessEqual(self.buffer.latest(rider.pk).at, timezone.now())
+        self.buffer.flush()
+
+        self.buffer.add([LocationPing(rider.pk, LAT + 0.002, LON, timezone.now())])  # 이후의 실제 핑
+        self.assertEqual((self.buffer.stats['stale'], self.buffer.flush()), (0, 1))
+        self.assertEqual(Rider.objects.get(pk=rider.pk).latitude, LAT + 0.002)
+
+    def test_unstorable_pings_are_dropped_not_requeued(self):
+        bad = LocationPing(2 ** 63, LAT, LON, self.now)  # bigint 범위 밖
+        self.buffer.add([bad, self.ping(self.riders[0], 0)])
+        with self.assertLogs('orders.locations', 'ERROR'):
+            self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.buffer.stats['dropped'], 1)
+        self.buffer.add([self.ping(self.riders[1], 0)])
+        self.assertEqual(self.buffer.flush(), 1)  # 다음 플러시는 정상
+
+    def test_overflow_flushes_immediately(self):
+        self.buffer.max_pending = 2
+        self.buffer.add([self.ping(self.riders[0], 0)])
+        self.assertEqual(self.buffer.stats['flushes'], 0)
+        self.buffer.add([self.ping(self.riders[1], 0)])
+        self.assertEqual(self.buffer.stats['flushes'], 1)
+        self.assertEqual(Rider.objects.filter(latitude__isnull=False).count(), 2)
+
+    def test_overflow_flush_error_still_accepts(self):
+        self.buffer.max_pending = 1
+        url = reverse('rider-v2-locations')
+        pings = {"pings": [{"rider_id": self.riders[0].pk, "latitude": LAT, "longitude": LON}]}
+        with mock.patch.object(self.buffer, '_write', side_effect=OperationalError), self.assertLogs('orders.locations'):
+            response = APIClient().post(url, pings, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.buffer.flush(), 1)  # 되돌려 놓은 핑은 다음 플러시에서 기록
+
+    def test_flush_refreshes_dispatch_index(self):
+        dispatcher = RiderDispatcher()
+        dispatcher.load()
+        Rider.objects.filter(pk=self.riders[1].pk).update(is_available=False)
+        self.buffer.add([self.ping(rider, 0) for rider in self.riders])
+        with mock.patch('orders.dispatch._dispatcher', dispatcher):
+            self.buffer.flush()
+        self.assertEqual(
+            [rider_id for _, rider_id in dispatcher.grid.nearest(LAT, LON, k=5)],
+            sorted([self.riders[0].pk, self.riders[2].pk]),
+        )
+
+    def test_endpoint(self):
+        client = APIClient()
+        url = reverse('rider-v2-locations')
+        at = (self.now - timedelta(seconds=1)).isoformat()
+        response = client.post(url, {"pings": [
+            {"rider_id": self.riders[0].pk, "latitude": LAT, "longitude": LON, "at": at},
+            {"rider_id": self.riders[1].pk, "latitude": LAT, "longitude": LON},
+        ]}, format='json')
+        self.assertEqual((response.status_code, response.json()), (202, {"accepted": 2}))
+        Rider.objects.filter(pk=self.riders[2].pk).update(latitude=1.0, longitude=2.0, location_updated_at=self.now)
+
+        # 플러시 전에도 메모리의 최신 위치가 보이고, 받은 적 없는 라이더는 DB 값
+        ids = ','.join(str(rider.pk) for rider in self.riders)
+        with CaptureQueriesContext(connection) as queries:
+            results = client.get(url, {'ids': ids}).json()['results']
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([(r['rider_id'], r['latitude']) for r in results],
+                         [(self.riders[0].pk, LAT), (self.riders[1].pk, LAT), (self.riders[2].pk, 1.0)])
+        self.assertEqual(Rider.objects.filter(latitude=LAT).count(), 0)
+
+        invalid = ({"rider_id": 1, "latitude": 91, "longitude": 0}, {"rider_id": 2 ** 63, "latitude": 0, "longitude": 0})
+        for ping in invalid:
+            self.assertEqual(client.post(url, {"pings": [ping]}, format='json').status_code, 400)
+        self.assertEqual(client.get(url, {'ids': 'x'}).status_code, 400)
+        self.assertEqual(client.get(url, {'ids': str(2 ** 63)}).status_code, 400)
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from orders.models import Order, Restaurant, Rider
 
@@ -44,15 +46,13 @@ class NPlusOneTestCase(TestCase):
         
     def test_side_loading_and_query_optimization(self):
         # ?include=restaurant,rider 호출
-        # 예상: 
-        # 1. Count Query (Pagination)
-        # 2. Main Query (Order JOIN Restaurant JOIN Rider) - select_related 덕분
-        # 총 2회 (혹은 pagination 없으면 1회)
-        
-        # 주의: assertNumQueries는 정확한 숫자를 요구함.
-        # Pagination이 켜져있다면 count(*) 쿼리가 하나 더 나감.
-        
-        with self.assertNumQueries(1): 
+        # 예상:
+        # 1. Main Query (Order 페이지, 키셋 페이지네이션이라 count 쿼리 없음)
+        # 2. Restaurant IN (페이지에 등장한 id들) 1회
+        # 3. Rider IN (페이지에 등장한 id들) 1회
+        # 총 3회 (JOIN으로 넓은 행을 주문마다 반복해서 읽지 않음)
+
+        with self.assertNumQueries(3):
             res = self.client.get('/api/v2/orders/?include=restaurant,rider')
             
         self.assertEqual(res.status_code, 200)
@@ -72,3 +72,73 @@ class NPlusOneTestCase(TestCase):
         print("\n[N+1 Test] Side-loading Structure Verified:")
         print(f"Restaurants: {len(included['restaurants'])}")
         print(f"Riders: {len(included['riders'])}")
+
+    def test_side_loading_query_count_is_independent_of_page_size(self):
+        # 식당/라이더가 모두 다른 주문 30개 추가 -> 페이지가 커져도 쿼리 수는 그대로
+        for i in range(30):
+            Order.objects.create(
+                restaurant=Restaurant.objects.create(name=f"식당 {i}", address="서울시"),
+                rider=Rider.objects.create(name=f"라이더 {i}"),
+            )
+
+        with self.assertNumQueries(3):
+            small = self.client.get('/api/v2/orders/?include=restaurant,rider&page_size=5').json()
+        with self.assertNumQueries(3):
+            large = self.client.get('/api/v2/orders/?include=restaurant,rider&page_size=40').json()
+
+        self.assertEqual(len(small['included']['restaurants']), 5)
+        self.assertEqual(len(large['included']['restaurants']), 32)
+        # 포함된 데이터는 RestaurantSerializer 형식
+        self.assertEqual(set(large['included']['restaurants'][0]), {'id', 'name', 'address'})
+
+    def test_side_loading_empty_page_runs_no_include_queries(self):
+        # 빈 페이지에서 전체 queryset을 다시 순회하던 문제 확인
+        with self.assertNumQueries(1):
+            res = self.client.get('/api/v2/orders/?include=restaurant,rider&status=preparing')
+        self.assertEqual(res.json()['included'], {'restaurants': [], 'riders': []})
+
+    def test_unknown_include_is_rejected(self):
+        res = self.client.get('/api/v2/orders/?include=menu')
+        self.assertEqual(res.status_code, 400)
+
+
+class SparseFieldsetTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        restaurant = Restaurant.objects.create(name="치킨집 1호점", address="서울시 강남구")
+        rider = Rider.objects.create(name="배달원 김씨")
+        for _ in range(3):
+            Order.objects.create(restaurant=restaurant, rider=rider)
+
+    def test_list_fields_narrow_output_and_select(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get('/api/v2/orders/?fields=id,status,version')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]['sql']
+        self.assertNotIn('restaurant_name', sql)  # SELECT 컬럼에서도 제외
+        for order in res.json()['results']:
+            self.assertEqual(set(order), {'id', 'status', 'version'})
+
+    def test_side_loaded_fields(self):
+        # 주문 필드에 restaurant가 없어도 사이드로딩용 FK는 읽어야 함 (추가 쿼리 없음)
+        with self.assertNumQueries(2):
+            res = self.client.get('/api/v2/orders/?include=restaurant&fields=id&fields[restaurants]=name')
+        data = res.json()
+        self.assertEqual(data['included']['restaurants'], [{'name': "치킨집 1호점"}])
+        self.assertEqual(set(data['results'][0]), {'id'})
+
+    def test_unknown_fields_are_rejected(self):
+        self.assertEqual(self.client.get('/api/v2/orders/?fields=id,secret').status_code, 400)
+        self.assertEqual(self.client.get('/api/v2/orders/?fields[riders]=name').status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/v2/orders/?include=rider&fields[riders]=phone').status_code, 400
+        )
+
+    def test_retrieve_etag_without_version_field(self):
+        import hashlib
+        order = Order.objects.first()
+        res = self.client.get(f'/api/v2/orders/{order.id}/?fields=status')
+        self.assertEqual(res.json(), {'status': order.status})
+        expected = hashlib.md5(f"order-{order.id}-v{order.version}".encode()).hexdigest()
+        self.assertEqual(res['ETag'], f'"{expected}"')
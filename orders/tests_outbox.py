@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderEvent
+from orders.outbox import CallbackSink, HttpSink, LogFileSink, OutboxDispatcher, build_sink, pending_count
+from orders.state_machine import TRANSITIONS
+from orders.transitions import transition_orders
+
+received = []
+
+
+def collect(events):
+    received.extend(events)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # 로컬 HTTP 스텁: 받은 배치를 서버 객체에 모음
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.batches.append(json.loads(body)['events'])
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class OrderOutboxTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        received.clear()
+        self.order = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+        self.url = f'/api/v2/orders/{self.order.id}/'
+
+    def accept(self, if_match=None):
+        etag = if_match or self.client.get(self.url)['ETag']
+        return self.client.post(f'{self.url}acceptance/', HTTP_IF_MATCH=etag)
+
+    def test_transition_writes_event(self):
+        # 아웃박스 INSERT는 전이 SQL 문장 안에 있음 (문장 수는 tests_v2의 단일 왕복 테스트가 확인)
+        self.assertEqual(self.accept().status_code, 200)
+        event = OrderEvent.objects.get()
+        self.assertEqual(
+            (event.order_id, event.action, event.from_status, event.to_status, event.version, event.dispatched_at),
+            (self.order.id, 'acceptance', 'pending_acceptance', 'preparing', 2, None),
+        )
+
+    def test_failed_transition_writes_no_event(self):
+        self.assertEqual(self.accept('"stale"').status_code, 412)
+        reject = self.client.post(f'{self.url}delivery/', HTTP_IF_MATCH=self.client.get(self.url)['ETag'])
+        self.assertEqual(reject.status_code, 400)
+        self.assertFalse(OrderEvent.objects.exists())
+
+    def test_batch_transition_writes_one_event_per_success(self):
+        other = Order.objects.create(status=Order.Status.DELIVERED)
+        transition_orders([
+            (self.order.id, ['*'], TRANSITIONS['acceptance']),
+            (other.id, ['*'], TRANSITIONS['acceptance']),
+        ])
+        self.assertEqual(list(OrderEvent.objects.values_list('order_id', flat=True)), [self.order.id])
+
+    def test_dispatch_delivers_and_marks(self):
+        self.accept()
+        self.client.post(f'{self.url}preparation-complete/', HTTP_IF_MATCH=self.client.get(self.url)['ETag'])
+        dispatcher = OutboxDispatcher([CallbackSink(collect)], batch_size=1)
+
+        reports = []
+        dispatcher.run(once=True, on_batch=reports.append)
+        self.assertEqual([event['version'] for event in received], [2, 3])
+        self.assertEqual([report.size for report in reports], [1, 1])
+        self.assertGreaterEqual(reports[0].lag, 0)
+        self.assertEqual(pending_count(), 0)
+
+        # 이미 보낸 이벤트는 다시 보내지 않음
+        self.assertIsNone(dispatcher.dispatch_batch())
+        self.assertEqual(len(received), 2)
+
+    def test_failed_sink_keeps_events_pending(self):
+        self.accept()
+
+        def fail(events):
+            raise ConnectionError("sink down")
+
+        dispatcher = OutboxDispatcher([CallbackSink(collect), CallbackSink(fail)])
+        with self.assertRaises(ConnectionError):
+            dispatcher.run(once=True)
+        self.assertEqual(pending_count(), 1)
+
+        # 복구 후 다시 보냄 (at-least-once: 첫 싱크는 같은 이벤트를 두 번 받음)
+        OutboxDispatcher([CallbackSink(collect)]).run(once=True)
+        self.assertEqual([event['id'] for event in received], [received[0]['id']] * 2)
+        self.assertEqual(pending_count(), 0)
+
+    def test_workers_partition_by_order(self):
+        other = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+        transition_orders([(pk, ['*'], TRANSITIONS['acceptance']) for pk in (self.order.id, other.id)])
+        dispatcher = OutboxDispatcher([CallbackSink(collect)], workers=2)
+        report = dispatcher.dispatch_batch(worker=self.order.id % 2)
+        self.assertEqual(report.size, 1)
+        self.assertEqual(received[0]['order_id'], self.order.id)
+
+    def test_delete_mode(self):
+        self.accept()
+        OutboxDispatcher([CallbackSink(collect)], delete=True).run(once=True)
+        self.assertFalse(OrderEvent.objects.exists())
+
+    def test_http_sink(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        server.batches = []
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        self.accept()
+        sink = build_sink(f'http://127.0.0.1:{server.server_port}/events')
+        self.assertIsInstance(sink, HttpSink)
+        OutboxDispatcher([sink]).run(once=True)
+        self.assertEqual([[event['action'] for event in batch] for batch in server.batches], [['acceptance']])
+
+    def test_command_with_log_sink(self):
+        self.accept()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'events.jsonl')
+            out = StringIO()
+            call_command('dispatch_order_events', '--once', f'--sink=log:{path}', stdout=out)
+            with open(path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual([line['to_status'] for line in lines], ['preparing'])
+        self.assertIn('1 events', out.getvalue())
+        self.assertEqual(pending_count(), 0)
+
+    def test_build_sink(self):
+        self.assertIsInstance(build_sink('callback:orders.tests_outbox.collect'), CallbackSink)
+        with tempfile.TemporaryDirectory() as tmp:
+            sink = build_sink(f"log:{os.path.join(tmp, 'x.jsonl')}")
+            self.assertIsInstance(sink, LogFileSink)
+            sink.close()
+        with self.assertRaises(ValueError):
+            build_sink('kafka:orders')
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from orders.models import Order, Restaurant
+
+
+class OrderKeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.restaurant = Restaurant.objects.create(name="치킨집", address="서울시")
+        # 같은 created_at을 가진 주문을 섞어 id 보조 정렬까지 검증
+        same_time = timezone.now()
+        self.orders = []
+        for i in range(7):
+            order = Order.objects.create(
+                restaurant=self.restaurant if i % 2 else None,
+                status=Order.Status.PREPARING if i < 3 else Order.Status.DELIVERED,
+            )
+            self.orders.append(order)
+        Order.objects.filter(pk__in=[o.pk for o in self.orders[2:5]]).update(created_at=same_time)
+        self.expected = list(Order.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def test_walks_all_pages_with_cursor(self):
+        url = '/api/v2/orders/?page_size=3'
+        seen, pages = [], []
+        while url:
+            with self.assertNumQueries(1):  # COUNT 없이 LIMIT 쿼리 1회
+                data = self.client.get(url).json()
+            pages.append(data)
+            seen.extend(order['id'] for order in data['results'])
+            url = data['next']
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]['previous'])
+
+        # 이전 페이지 링크로 되돌아가기
+        previous = self.client.get(pages[1]['previous']).json()
+        self.assertEqual([o['id'] for o in previous['results']], self.expected[:3])
+
+    def test_filters(self):
+        data = self.client.get('/api/v2/orders/', {'status': Order.Status.PREPARING}).json()
+        self.assertEqual({o['status'] for o in data['results']}, {Order.Status.PREPARING})
+        self.assertEqual(len(data['results']), 3)
+
+        data = self.client.get('/api/v2/orders/', {'restaurant': self.restaurant.id}).json()
+        self.assertEqual(len(data['results']), 3)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/v2/orders/', {'status': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v2/orders/', {'restaurant': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v2/orders/', {'cursor': '!!!'}).status_code, 404)
@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.latency import in_held_transaction
+from orders.models import Order, OrderEvent, OrderStatusTransition
+from orders.payments import FakeGateway, PaymentGateway, PaymentResult
+from orders.state_machine import TRANSITIONS
+
+
+class RecordingGateway(PaymentGateway):
+    """호출 시점의 트랜잭션 여부를 기록하고, 호출 중에 실행할 동작(during)을 받는 게이트웨이"""
+
+    def __init__(self, result=PaymentResult(True, reference='ok'), during=None, error=None):
+        self.result = result
+        self.during = during
+        self.error = error
+        self.calls = []
+
+    def charge(self, order_pk, data):
+        self.calls.append((order_pk, dict(data), in_held_transaction()))
+        if self.during:
+            self.during()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+# 결제 연동/지연 주입의 트랜잭션 검사에서 TestCase가 감싼 atomic 2단계(클래스 + 테스트)는 제외
+@override_settings(ORDER_LATENCY_OUTER_ATOMIC_DEPTH=2)
+class TwoPhasePaymentTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.order = Order.objects.create(status=Order.Status.PENDING_PAYMENT)
+        self.url = f'/api/v2/orders/{self.order.id}/'
+
+    def pay(self, gateway, etag=None):
+        etag = etag or self.client.get(self.url)['ETag']
+        with mock.patch('orders.payments._gateway', gateway):
+            return self.client.post(f'{self.url}payment/', {'amount': 20000}, format='json', HTTP_IF_MATCH=etag)
+
+    def test_reserve_then_confirm_outside_transaction(self):
+        gateway = RecordingGateway()
+        res = self.pay(gateway)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((res.json()['status'], res.json()['version']), ('pending_acceptance', 3))
+        self.assertEqual(gateway.calls, [(self.order.id, {'amount': 20000}, False)])
+        self.assertEqual(
+            list(OrderEvent.objects.order_by('id').values_list('action', 'to_status')),
+            [('payment', 'payment_processing'), ('payment_confirmation', 'pending_acceptance')],
+        )
+        self.assertEqual(OrderStatusTransition.objects.count(), 2)
+        self.assertEqual(self.client.get(self.url)['ETag'], res['ETag'])
+
+    def test_decline_rolls_back_reservation(self):
+        res = self.pay(RecordingGateway(PaymentResult(False, message="card declined")))
+        self.assertEqual(res.status_code, 402)
+        body = res.json()
+        self.assertEqual((body['error'], body['message']), ("Payment failed", "card declined"))
+        self.assertEqual((body['order']['status'], body['order']['version']), ('pending_payment', 3))
+
+        # 되돌린 주문의 ETag로 다시 결제
+        retry = self.pay(RecordingGateway(), etag=res['ETag'])
+        self.assertEqual((retry.status_code, retry.json()['status']), (200, 'pending_acceptance'))
+
+    def test_gateway_error_rolls_back(self):
+        with self.assertLogs('orders.payments', 'ERROR'):
+            res = self.pay(RecordingGateway(error=ConnectionError("gateway timeout")))
+        self.assertEqual((res.status_code, res.json()['message']), (402, "gateway timeout"))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, Order.Status.PENDING_PAYMENT)
+
+    def test_reserved_order_rejects_other_actions(self):
+        # 게이트웨이 호출 중에는 잠금 없이 payment_processing 상태가 다른 요청을 막음
+        responses = {}
+
+        def during():
+            etag = self.client.get(self.url)['ETag']
+            responses['cancel'] = self.client.post(f'{self.url}cancellation/', HTTP_IF_MATCH=etag)
+            responses['pay'] = self.client.post(f'{self.url}payment/', HTTP_IF_MATCH=etag)
+
+        res = self.pay(RecordingGateway(during=during))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(responses['cancel'].status_code, 400)
+        self.assertEqual(responses['pay'].status_code, 400)
+
+    def test_fake_gateway_decline_rate(self):
+        self.assertTrue(FakeGateway().charge(1, {}).approved)
+        self.assertFalse(FakeGateway(decline_rate=1.0).charge(1, {}).approved)
+
+    def test_internal_transitions_are_not_exposed(self):
+        for name in ('payment_confirmation', 'payment_failure'):
+            self.assertTrue(TRANSITIONS[name].internal)
+            self.assertFalse(TRANSITIONS[name].batchable)
+        res = self.client.post(reverse('order-v2-batch-transitions'), {'transitions': [
+            {'order_id': self.order.id, 'action': 'payment_confirmation', 'if_match': '*'},
+        ]}, format='json')
+        self.assertEqual(res.status_code, 400)
@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase
+from django.urls import NoReverseMatch, reverse
+from orders.models import Order
+from orders.state_machine import TRANSITIONS, ACTIONS_BY_STATUS, TERMINAL_STATUSES, can_transition
+
+S = Order.Status
+
+
+class StateMachineTableTestCase(SimpleTestCase):
+    def test_bitmask_lookup(self):
+        self.assertTrue(can_transition('cancellation', S.PENDING_PAYMENT))
+        self.assertTrue(can_transition('cancellation', S.PENDING_ACCEPTANCE))
+        self.assertFalse(can_transition('cancellation', S.PREPARING))
+        self.assertFalse(can_transition('unknown', S.PENDING_PAYMENT))
+
+    def test_terminal_statuses(self):
+        self.assertEqual(TERMINAL_STATUSES, {S.CANCELLED, S.REJECTED, S.DELIVERED})
+        self.assertEqual(ACTIONS_BY_STATUS[S.PENDING_ACCEPTANCE], {'acceptance', 'rejection', 'cancellation'})
+
+    def test_table_is_frozen(self):
+        with self.assertRaises(TypeError):
+            TRANSITIONS['hack'] = None
+
+    def test_routes_generated_from_table(self):
+        for transition in TRANSITIONS.values():
+            name = f"order-v2-{transition.action.replace('_', '-')}"
+            if transition.internal:  # 2단계 전이의 확정/취소 단계는 엔드포인트 없음
+                with self.assertRaises(NoReverseMatch):
+                    reverse(name, args=[1])
+                continue
+            url = reverse(name, args=[1])
+            self.assertTrue(url.endswith(f"/{transition.url_path}/"))
@@ -1,9 +1,13 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from orders.models import Order
 
+# 결제 연동/지연 주입의 트랜잭션 검사에서 TestCase가 감싼 atomic 2단계(클래스 + 테스트)는 제외
+@override_settings(ORDER_LATENCY_OUTER_ATOMIC_DEPTH=2)
 class OrderV2ActionTestCase(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -90,3 +94,100 @@ class OrderV2ActionTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, Order.Status.DELIVERED)
+
+    def test_stale_etag_returns_412(self):
+        url = reverse('order-v2-acceptance', args=[self.order.id])
+        self.order.status = Order.Status.PENDING_ACCEPTANCE
+        self.order.save()
+        stale_etag = self.get_etag(self.order)
+        Order.objects.filter(pk=self.order.pk).update(version=self.order.version + 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, HTTP_IF_MATCH=stale_etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(response.data['current_version'], self.order.version + 1)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, Order.Status.PENDING_ACCEPTANCE)
+
+        # 현재 표현과 ETag가 응답에 포함 (조회 없이 같은 전이 문장에서 읽음) -> 바로 재시도 가능
+        self.assertEqual(len([q for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]), 1)
+        self.assertEqual(response['ETag'], self.get_etag(self.order))
+        self.assertEqual((response.data['order']['id'], response.data['order']['version']), (self.order.id, 2))
+        retry = self.client.post(url, HTTP_IF_MATCH=response['ETag'])
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+
+    def test_invalid_state_returns_400(self):
+        # PENDING_PAYMENT 상태에서는 배달 완료 불가
+        url = reverse('order-v2-delivery', args=[self.order.id])
+        response = self.client.post(url, HTTP_IF_MATCH=self.get_etag(self.order))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.version, 1)
+
+    def test_transition_is_single_round_trip(self):
+        # 조건부 UPDATE 한 번으로 검사 + 전이 + 버전 증가 (get_object() + save() 없음)
+        self.order.status = Order.Status.PENDING_ACCEPTANCE
+        self.order.save()
+        url = reverse('order-v2-acceptance', args=[self.order.id])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, HTTP_IF_MATCH=self.get_etag(self.order))
+        # 스냅샷 캐시 write-through용 트랜잭션 제어(SAVEPOINT)를 제외하면 SQL 문장은 1개
+        statements = [q['sql'] for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['version'], 2)
+        self.order.refresh_from_db()
+        self.assertEqual(response['ETag'], self.get_etag(self.order))
+
+    def test_missing_order_returns_404(self):
+        url = reverse('order-v2-pickup', args=[999999])
+        response = self.client.post(url, HTTP_IF_MATCH='"abc"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class OrderV2BatchTransitionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('order-v2-batch-transitions')
+
+    def get_etag(self, order):
+        import hashlib
+        raw_data = f"order-{order.id}-v{order.version}"
+        return f'"{hashlib.md5(raw_data.encode()).hexdigest()}"'
+
+    def test_batch_applies_per_item_results(self):
+        ok = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+        stale = Order.objects.create(status=Order.Status.PENDING_ACCEPTANCE)
+        stale_etag = self.get_etag(stale)
+        Order.objects.filter(pk=stale.pk).update(version=2)
+        wrong_state = Order.objects.create(status=Order.Status.DELIVERED)
+
+        payload = {"transitions": [
+            {"order_id": ok.id, "action": "acceptance", "if_match": self.get_etag(ok)},
+            {"order_id": stale.id, "action": "acceptance", "if_match": stale_etag},
+            {"order_id": wrong_state.id, "action": "pickup", "if_match": self.get_etag(wrong_state)},
+            {"order_id": 999999, "action": "pickup", "if_match": '"abc"'},
+        ]}
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.data['results']
+        self.assertEqual([r['status'] for r in results], [200, 412, 400, 404])
+        ok.refresh_from_db()
+        self.assertEqual(ok.status, Order.Status.PREPARING)
+        self.assertEqual(results[0]['etag'], self.get_etag(ok))
+        self.assertEqual(results[1]['current_version'], 2)
+        stale.refresh_from_db()
+        self.assertEqual((results[1]['etag'], results[1]['order']['version']), (self.get_etag(stale), 2))
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, Order.Status.PENDING_ACCEPTANCE)
+
+    def test_batch_rejects_duplicates_and_non_batchable_actions(self):
+        order = Order.objects.create(status=Order.Status.PENDING_PAYMENT)
+        item = {"order_id": order.id, "action": "cancellation", "if_match": self.get_etag(order)}
+        response = self.client.post(self.url, {"transitions": [item, item]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        item['action'] = 'payment'
+        response = self.client.post(self.url, {"transitions": [item]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,170 @@
+"""
+주문 상태 전이 엔진 (Compare-and-Swap)
+
+상태 검사 + 버전(ETag) 검사 + 버전 증가를 하나의 조건부 UPDATE로 처리합니다.
+get_object() -> 파이썬에서 검사 -> save() 로 나뉘어 있던 2번의 쿼리와
+그 사이의 갱신 분실(Lost Update) 구간을 없애기 위한 모듈입니다.
+"""
+import functools
+from dataclasses import dataclass
+
+from django.db import connection
+
+from .etags import get_strategy
+from .models import Order, OrderEvent, OrderStatusTransition
+
+# 전이 결과 코드
+OK = 'ok'
+NOT_FOUND = 'not_found'
+PRECONDITION_FAILED = 'precondition_failed'
+INVALID_STATE = 'invalid_state'
+
+
+@dataclass
+class TransitionResult:
+    outcome: str
+    order: Order = None  # 성공 시 갱신된 주문
+    current_version: int = None  # 실패 시 DB에 있던 버전
+    current_status: str = None  # 실패 시 DB에 있던 상태
+    current: Order = None  # 실패 시 DB에 있던 주문 (412 응답에 현재 표현을 담아 재시도에 GET이 필요 없게 함)
+
+    @property
+    def ok(self):
+        return self.outcome == OK
+
+
+def _order_columns():
+    fields = Order._meta.concrete_fields
+    return [f.column for f in fields], [f.attname for f in fields]
+
+
+# ETag 전략(orders/etags.py)에 SQL 식이 없으면 태그에서 꺼낸 version을 비교합니다.
+_VERSION_SQL = "o.version::text"
+
+
+@functools.lru_cache(maxsize=None)
+def _build_sql(match_sql):
+    table = Order._meta.db_table
+    outbox = OrderEvent._meta.db_table
+    history = OrderStatusTransition._meta.db_table
+    # 상태 문자열 -> 이력용 smallint 코드 (orders.models.OrderStatusTransition.CODES). 문장에 상수로 넣음
+    to_code = ' '.join(f"WHEN '{status}' THEN {code}" for status, code in OrderStatusTransition.CODES.items())
+    columns, _ = _order_columns()
+    returning = ', '.join(f'o.{c}' for c in columns)
+    prev_cols = ', '.join(f'prev.{c}' for c in columns)
+    moved_cols = ', '.join(f'moved.{c}' for c in columns)
+    # req   : 요청 목록 (주문 id, If-Match 비교값 목록, 도착 상태, 허용 출발 상태, 행위). 배열 파라미터라 SQL 문장은 항상 동일.
+    #         If-Match 비교값은 ','로 이어 붙인 목록이며 '*'는 존재하는 모든 주문과 일치합니다.
+    # prev  : 대상 행을 id 순서로 잠그고 현재 행을 읽음 (실패 시 412/400 구분과 412 응답 본문용, 추가 조회 없음).
+    #         여러 주문을 한 번에 갱신할 때 항상 같은 순서로 잠가서 교착 상태를 피합니다.
+    # moved : 조건부 UPDATE. 조건은 반드시 갱신 대상 행(o)에 걸어야
+    #         동시 갱신 시 PostgreSQL이 최신 행 기준으로 WHERE를 재평가합니다.
+    # outbox: 갱신된 행마다 이벤트 아웃박스(OrderEvent) 행을 추가. 같은 문장이므로 같은 트랜잭션에서 커밋/롤백됩니다.
+    #         데이터 변경 CTE는 최종 SELECT에서 참조하지 않아도 항상 실행됩니다.
+    # history: 상태 변경 이력(OrderStatusTransition) 행 추가. 여러 주문 전이도 같은 INSERT 하나로 기록됩니다.
+    return f"""
+        WITH req AS (
+            SELECT *
+              FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::text[], %s::text[])
+                   WITH ORDINALITY AS r(id, etags, target, sources, action, pos)
+        ), prev AS (
+            SELECT {returning}
+              FROM {table} AS o
+             WHERE o.id IN (SELECT id FROM req)
+             ORDER BY o.id
+               FOR UPDATE
+        ), moved AS (
+            UPDATE {table} AS o
+               SET status = req.target, version = o.version + 1
+              FROM req JOIN prev ON prev.id = req.id
+             WHERE o.id = req.id
+               AND (req.etags = '*' OR {match_sql} = ANY(string_to_array(req.etags, ',')))
+               AND o.status = ANY(string_to_array(req.sources, ','))
+         RETURNING {returning}
+        ), outbox AS (
+            INSERT INTO {outbox} (order_id, action, from_status, to_status, version, created_at)
+            SELECT moved.id, req.action, prev.status, moved.status, moved.version, now()
+              FROM moved
+              JOIN req ON req.id = moved.id
+              JOIN prev ON prev.id = moved.id
+             ORDER BY req.pos
+        ), history AS (
+            INSERT INTO {history} (order_id, version, from_code, to_code, created_at)
+            SELECT moved.id, moved.version,
+                   CASE prev.status {to_code} END, CASE moved.status {to_code} END, now()
+              FROM moved
+              JOIN prev ON prev.id = moved.id
+        )
+        SELECT prev.status, prev.version, {prev_cols}, {moved_cols}
+          FROM req
+          LEFT JOIN prev ON prev.id = req.id
+          LEFT JOIN moved ON moved.id = req.id
+         ORDER BY req.pos
+    """
+
+
+def _db_values(strategy, pk, tags):
+    if '*' in tags:
+        return '*'
+    values = (strategy.db_value(tag, pk) for tag in tags)
+    return ','.join(value for value in values if value is not None)
+
+
+def transition_orders(items, strategy=None):
+    """
+    여러 주문에 전이를 한 문장(= 한 트랜잭션, DB 왕복 1회)으로 적용합니다.
+    성공한 전이마다 이벤트 아웃박스(OrderEvent)와 상태 이력(OrderStatusTransition) 행도 같은 문장에서 기록합니다.
+    items: (pk, tags, transition) 목록. pk는 목록 안에서 중복되면 안 됩니다.
+    tags는 클라이언트 If-Match 헤더를 etags.parse_etags()로 나눈 목록입니다.
+    strategy는 ETag 전략(orders/etags.py). 없으면 settings의 기본 전략을 사용합니다.
+    반환값은 items와 같은 순서의 TransitionResult 목록입니다.
+    """
+    if not items:
+        return []
+    strategy = strategy or get_strategy()
+    _, attnames = _order_columns()
+    params = [
+        [pk for pk, _, _ in items],
+        [_db_values(strategy, pk, tags) for pk, tags, _ in items],
+        [t.target for _, _, t in items],
+        [','.join(t.sources) for _, _, t in items],
+        [t.action for _, _, t in items],
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(_build_sql(strategy.sql or _VERSION_SQL), params)
+        rows = cursor.fetchall()
+
+    results = []
+    width = len(attnames)
+    for (pk, tags, transition), row in zip(items, rows):
+        current_status, current_version = row[:2]
+        current, moved = row[2:2 + width], row[2 + width:]
+        if current_version is None:
+            results.append(TransitionResult(NOT_FOUND))
+            continue
+        if moved[0] is not None:
+            results.append(TransitionResult(OK, order=Order.from_db(connection.alias, attnames, moved)))
+            continue
+
+        if not strategy.matches(tags, strategy.make(pk, current_version)):
+            outcome = PRECONDITION_FAILED
+        elif not transition.allows(current_status):
+            outcome = INVALID_STATE
+        else:
+            # 잠근 시점 기준으로는 조건이 맞았지만 갱신되지 않음 -> 버전 충돌로 취급
+            outcome = PRECONDITION_FAILED
+        results.append(TransitionResult(
+            outcome,
+            current_version=current_version,
+            current_status=current_status,
+            current=Order.from_db(connection.alias, attnames, current),
+        ))
+    return results
+
+
+def transition_order(pk, tags, transition, strategy=None):
+    """
+    pk 주문에 transition(state_machine.Transition)을 원자적으로 적용합니다.
+    DB 왕복은 성공/실패와 관계없이 1회입니다.
+    """
+    return transition_orders([(pk, tags, transition)], strategy)[0]
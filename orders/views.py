@@ -1,8 +1,8 @@
-import time #race condition 재현을 위한 3초지연 위해 사용.
 import logging # 실제 사용x
 import threading
 from rest_framework import viewsets
 from rest_framework.response import Response
+from .latency import get_injector, request_latency
 from .models import Order
 from .serializers import OrderV1Serializer
 
@@ -24,9 +24,11 @@ class OrderV1ViewSet(viewsets.ModelViewSet):
         if new_status:
             # === [문제 지점] Race Condition 시뮬레이션 ===
             # DB에서 데이터를 읽은 후, 저장하기 직전에 시간이 걸린다고 가정합니다.
-            # 이 3초 동안 다른 누군가가 상태를 바꿔버리면 덮어쓰기 문제가 발생합니다.
-            print(f"[Thread {thread_id}] 처리중... (3초 대기)")
-            time.sleep(3) 
+            # 이 대기 동안 다른 누군가가 상태를 바꿔버리면 덮어쓰기 문제가 발생합니다.
+            # 대기 시간은 settings.ORDER_LATENCY_PROFILES['v1_update'] 또는 X-Simulated-Latency 헤더 (기본 없음)
+            with request_latency(request):
+                delay = get_injector().inject('v1_update')
+            print(f"[Thread {thread_id}] 처리중... ({delay:.1f}초 대기)")
 
             # DB를 다시 확인하지 않고 메모리에 있는 객체 그대로 저장
             order.status = new_status
@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quickeats.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# 주문 상태 SSE(/api/v2/orders/{id}/events/)는 Django 요청 처리 밖에서 직접 서비스 (orders/api/v2/streams.py)
+from orders.api.v2.streams import EventStreamApplication  # noqa: E402  (Django 초기화 후 import)
+
+application = EventStreamApplication(django_application)
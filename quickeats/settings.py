@@ -131,3 +131,109 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Idempotency-Key 설정 (orders/idempotency.py)
+# 최근 완료된 응답을 프로세스 메모리에 보관하는 개수 (0이면 사용 안 함)
+IDEMPOTENCY_LRU_SIZE = 1024
+# 같은 키의 요청이 처리중일 때 결과를 기다리는 최대 시간(초). 넘으면 409 응답
+IDEMPOTENCY_WAIT_TIMEOUT = 10.0
+# 다른 프로세스가 처리중인 키를 다시 확인하는 간격(초)
+IDEMPOTENCY_POLL_INTERVAL = 0.05
+# 키 보관 기간(초). 지난 키는 없는 키로 취급하며 prune_idempotency_keys 명령으로 삭제
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+# 처리중(in_progress) 선점의 유효 시간(초). 처리하던 워커가 죽어 남은 선점은 이 시간이 지나면 재시도가 넘겨받음
+# (가장 느린 결제 처리 시간보다 길게)
+IDEMPOTENCY_IN_PROGRESS_TIMEOUT = 60
+# 만료 키 백그라운드 정리 주기(초). None이면 사용 안 함 (관리 명령/cron 사용)
+IDEMPOTENCY_PRUNE_INTERVAL = None
+# 정리 시 한 번에 삭제하는 최대 행 수 (긴 락 방지)
+IDEMPOTENCY_PRUNE_BATCH_SIZE = 1000
+
+# 주문 ETag 생성/비교 전략 (orders/etags.py)
+# MD5ETag(기본) / WeakETag(W/"id-version", 해시 없음) / KeyedETag(keyed blake2b) / CachedETag(인스턴스 캐시)
+ORDER_ETAG_STRATEGY = 'orders.etags.MD5ETag'
+
+# 캐시 (orders/cache.py 주문 스냅샷 캐시가 사용)
+# 프로세스 로컬 locmem. 주문 스냅샷 캐시는 여러 워커가 공유하는 백엔드에서만 켜짐
+# 예) {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379'}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'quickeats',
+        'OPTIONS': {'MAX_ENTRIES': 100_000},
+    }
+}
+# 주문 스냅샷 캐시에 사용할 CACHES 별칭 (None이면 캐시 사용 안 함). 공유 백엔드(Redis, Memcached 등)를 지정
+ORDER_CACHE_ALIAS = None
+# 프로세스 로컬 백엔드(locmem 등)도 허용할지 여부. 워커가 하나일 때만 True로 (아니면 다른 워커가 옛 스냅샷을 응답)
+ORDER_CACHE_ALLOW_LOCAL = False
+# 스냅샷 보관 시간(초)
+ORDER_CACHE_TIMEOUT = 300
+# 변경 후 남기는 묘비 보관 시간(초). 이보다 빠른 조회만 옛 스냅샷 재기록이 막히므로 가장 느린 조회보다 길게
+ORDER_CACHE_TOMBSTONE_TIMEOUT = 10
+
+# 주문 상태 SSE 스트림 (orders/events.py, orders/api/v2/streams.py)
+# 구독자별 이벤트 큐 크기. 가득 차면 해당 연결을 끊고 Last-Event-ID 재접속으로 이어받게 함
+ORDER_EVENTS_QUEUE_SIZE = 16
+# 재접속 시 다시 보낼 수 있도록 주문별로 보관하는 최근 이벤트 수
+ORDER_EVENTS_HISTORY_SIZE = 32
+# 이벤트가 없을 때 keep-alive 주석을 보내는 간격(초)
+ORDER_EVENTS_HEARTBEAT = 15.0
+
+# 주문 이벤트 아웃박스 (orders/outbox.py, dispatch_order_events 명령)
+# 싱크 목록: 'log:<파일 경로>' / 'http://...' / 'callback:<점 경로>' (at-least-once 전달, 소비자가 이벤트 id로 중복 제거)
+ORDER_OUTBOX_SINKS = ['log:' + str(BASE_DIR / 'order_events.jsonl')]
+# 한 트랜잭션에서 잠그고 보내는 최대 이벤트 수
+ORDER_OUTBOX_BATCH_SIZE = 500
+# 보낼 이벤트가 없을 때 다시 확인하는 간격(초)
+ORDER_OUTBOX_POLL_INTERVAL = 1.0
+
+# V2 목록/상세/행위를 비동기 뷰로 처리 (orders/api/v2/async_views.py). ASGI(quickeats/asgi.py)로 배포할 때만 켬
+ORDER_V2_ASYNC_VIEWS = os.getenv('ORDER_V2_ASYNC_VIEWS', '') == '1'
+# 비동기 뷰에서 DB를 동시에 사용하는 요청 수 (요청마다 DB 연결을 쓰므로 DB max_connections보다 작게)
+ORDER_V2_ASYNC_DB_CONCURRENCY = int(os.getenv('ORDER_V2_ASYNC_DB_CONCURRENCY', '32'))
+
+# 외부 연동 지연 시뮬레이션 (orders/latency.py). 기본은 지연 없음
+# 행위별 프로필: 'off' / 'fixed:<초>' / 'uniform:<최소>:<최대>' / 'normal:<평균>:<표준편차>' / 'exponential:<평균>'
+# 예) 경쟁 상태 재현: {'v1_update': 'fixed:3', 'payment': 'fixed:0.5'}
+ORDER_LATENCY_PROFILES = {}
+# X-Simulated-Latency 요청 헤더로 요청마다 프로필 지정 허용 (운영에서는 끔)
+ORDER_LATENCY_ALLOW_HEADER = DEBUG
+# 한 번에 넣는 지연의 상한(초)
+ORDER_LATENCY_MAX = 10.0
+# 실행 환경이 요청 바깥에서 미리 여는 atomic 단계 수. 지연 주입/결제 연동의 "트랜잭션 안 호출" 검사에서 제외 (테스트 케이스는 2)
+ORDER_LATENCY_OUTER_ATOMIC_DEPTH = 0
+
+# 결제 게이트웨이 (orders/payments.py). 결제는 예약 -> 게이트웨이 호출(트랜잭션 밖) -> 확정/취소 2단계로 처리
+# 기본 FakeGateway는 외부 호출 없이 지연(ORDER_LATENCY_PROFILES['payment'])과 거절(decline_rate)만 흉내냄
+ORDER_PAYMENT_GATEWAY = 'orders.payments.FakeGateway'
+ORDER_PAYMENT_GATEWAY_OPTIONS = {}
+
+# 종료 주문 보관 (orders/archive.py, archive_orders 명령)
+# 생성 후 이 일수가 지난 배달 완료/취소/거절 주문을 ArchivedOrder로 옮김 (V2 상세 조회는 보관 테이블도 찾음)
+ORDER_ARCHIVE_AFTER_DAYS = 30
+# 한 트랜잭션에서 옮기는 최대 주문 수 (잠금 시간/WAL 크기 제한)
+ORDER_ARCHIVE_BATCH_SIZE = 1000
+
+# 라이더 자동 배차 (orders/dispatch.py). 픽업 대기가 되면 식당에서 가장 가까운 배차 가능 라이더를 배정
+ORDER_DISPATCH_ENABLED = True
+# 라이더 위치 격자 인덱스의 칸 크기(도). 0.01도 = 약 1.1km
+ORDER_DISPATCH_CELL_SIZE = 0.01
+# 확보를 시도할 최근접 후보 수 / 배정할 최대 거리(km)
+ORDER_DISPATCH_CANDIDATES = 5
+ORDER_DISPATCH_MAX_KM = 10.0
+# dispatch_riders 명령이 밀린 주문을 다시 확인하는 간격(초)
+ORDER_DISPATCH_POLL_INTERVAL = 5.0
+# 배차 격자 인덱스를 DB에서 새로 만드는 간격(초). 다른 프로세스가 풀어 준 라이더/옮긴 위치가 이 안에 반영됨
+ORDER_DISPATCH_RELOAD_INTERVAL = 30.0
+
+# 라이더 위치 수집 (orders/locations.py, POST /api/v2/riders/locations/)
+# 핑을 메모리에 모아 라이더당 마지막 핑만 남기고 이 간격(초)마다 한 문장으로 기록
+ORDER_LOCATION_FLUSH_INTERVAL = 1.0
+# 플러시 전에 모인 라이더 수가 이만큼이면 받은 요청에서 바로 기록
+ORDER_LOCATION_MAX_PENDING = 50_000
+
+# 주문 대량 생성/가져오기 (orders/imports.py, import_orders 명령, POST /api/v2/orders/bulk/)
+# 한 번에 적재(COPY/bulk_create)하는 행 수. 메모리 사용량이 이 값에 비례
+ORDER_IMPORT_CHUNK_SIZE = 5000